@@ -4,9 +4,18 @@ LiteAgent is a lightweight, extensible framework for building AI agents.
 
 from .tools import liteagent_tool, BaseTool, FunctionTool, InstanceMethodTool, StaticMethodTool
 from .agent import LiteAgent
+from .agent_template import AgentTemplate
+from .tool_cache import CachePolicy, ToolCache
+from .tool_retrieval import ToolRetriever
+from .tool_results import ToolResultPolicy
+from .tool_executors import ToolTimeoutError, configure_tool_executors, shutdown_tool_executors, warm_process_pool
+from .blob_store import BlobStore, get_blob_store, set_blob_store
 from .observer import AgentObserver, ConsoleObserver
 from .models import create_model_interface, UnifiedModelInterface
-from .memory import ConversationMemory
+from .memory import ConversationMemory, ConversationSummary
+from .persistent_memory import PersistentConversationMemory, SQLiteMessageStore
+from .tokenization import Tokenizer, HeuristicTokenizer, get_tokenizer, register_tokenizer
+from .summarization import ConversationSummarizer
 from .utils import setup_logging, check_api_keys
 from .capabilities import get_model_capabilities, ModelCapabilities
 from .mcp_adapter import run_as_mcp, LiteAgentMCPServer, MCPAgentObserver
@@ -5,28 +5,40 @@ This module contains the updated LiteAgent class that uses the new provider syst
 instead of LiteLLM.
 """
 
+import copy
 import json
-import time
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Union
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .tools import get_function_definitions, BaseTool, FunctionTool, InstanceMethodTool, StaticMethodTool
+from .tools import (get_function_definitions, BaseTool, FunctionTool, InstanceMethodTool,
+                    StaticMethodTool)
 from .models import create_model_interface, UnifiedModelInterface
-from .memory import ConversationMemory
+from .memory import ConversationMemory, ConversationSummary
 from .capabilities import get_model_capabilities
-from .providers import ProviderResponse, ToolCall
+from .providers import ProviderResponse, ToolCall, ToolManifest
 from .utils import logger
 from .observer import (AgentObserver, AgentEvent, AgentInitializedEvent, UserMessageEvent, 
-                      ModelRequestEvent, ModelResponseEvent, FunctionCallEvent, 
-                      FunctionResultEvent, AgentResponseEvent, generate_context_id)
-from .tool_calling import ToolCallTracker
+                      ModelRequestEvent, ModelResponseEvent, AgentResponseEvent, ConversationSummarizedEvent,
+                      generate_context_id, resolve_event_handler)
+from .rate_limiter import get_rate_limiter
+from .tool_cache import ToolCache
+from .tool_retrieval import ToolRetriever
+from .tool_results import ToolResultPolicy, ToolResultSpiller
+from .tokenization import get_tokenizer
+from .summarization import ConversationSummarizer
+from .tool_dispatch import ToolDispatchMixin
 
 
-class LiteAgent:
+class LiteAgent(ToolDispatchMixin):
     """
     A lightweight agent that uses official provider clients for LLM interactions.
     """
     
+    # Tool manifests kept for distinct per-turn tool picks before the cache is reset
+    MAX_TOOL_SUBSETS = 64
+    
     DEFAULT_SYSTEM_PROMPT = """You are a helpful AI assistant. 
 Use the provided tools when needed to answer the user's question.
 IMPORTANT: After calling a tool and receiving its result, you MUST provide a complete 
@@ -37,7 +49,8 @@ to provide a final text response to the user."""
 
     def __init__(self, model, name, system_prompt=None, tools=None, debug=False, 
                  api_key=None, provider=None, parent_context_id=None, context_id=None, observers=None, 
-                 description=None, **kwargs):
+                 description=None, parallel_tool_calls=False, max_tool_workers=8, context_window_share=0.8,
+                 summarizer=None, tool_retriever=None, tool_result_policy=None, **kwargs):
         """
         Initialize the LiteAgent.
         
@@ -53,6 +66,21 @@ to provide a final text response to the user."""
             context_id (str, optional): Context ID for this agent. If None, a new ID will be generated.
             observers (list, optional): List of observers to notify of agent events.
             description (str, optional): A clear description of what this agent does and its capabilities.
+            parallel_tool_calls (bool, optional): Execute multiple tool calls from one model response
+                concurrently on a bounded thread pool. Defaults to False.
+            max_tool_workers (int, optional): Maximum number of threads used for parallel tool calls.
+                Defaults to 8.
+            context_window_share (float, optional): Share of the model's context window the conversation
+                history may use. Older turns beyond it are not sent (the system prompt and pinned messages
+                always are). None sends the full history. Defaults to 0.8.
+            summarizer (ConversationSummarizer, optional): Summarizes older turns in the background once
+                the conversation grows past its token threshold. Defaults to None (no summarization).
+            tool_retriever (ToolRetriever, optional): Sends only the tools most relevant to each user
+                message instead of every registered tool. Defaults to None (send all tools).
+            tool_result_policy (ToolResultPolicy, int or dict, optional): Keeps tool results longer
+                than a number of characters out of the conversation, replacing them with a preview
+                and a handle for the read_result_slice tool, which is registered automatically.
+                Defaults to None (keep results whole).
             **kwargs: Additional provider-specific configuration
         """
         self.model = model
@@ -63,6 +91,18 @@ to provide a final text response to the user."""
         self.parent_context_id = parent_context_id
         self.context_id = context_id or generate_context_id()
         self.agent_id = str(uuid.uuid4())
+        self.parallel_tool_calls = parallel_tool_calls
+        self.max_tool_workers = max_tool_workers
+        self.summarizer: Optional[ConversationSummarizer] = summarizer
+        self.tool_retriever: Optional[ToolRetriever] = tool_retriever
+        self.tool_result_policy = ToolResultPolicy.from_option(tool_result_policy)
+        self._result_spiller = (ToolResultSpiller(self.tool_result_policy)
+                                if self.tool_result_policy is not None else None)
+        # Result caches of tools with a cache policy: agent scope by tool name,
+        # conversation scope by memory and then tool name
+        self._tool_caches: Dict[str, ToolCache] = {}
+        self._conversation_tool_caches = weakref.WeakKeyDictionary()
+        self.rate_limiter = None
         
         # Get model capabilities
         self.capabilities = get_model_capabilities(model)
@@ -73,21 +113,34 @@ to provide a final text response to the user."""
         # Initialize the model interface
         self.model_interface = create_model_interface(model, api_key, provider=provider, **kwargs)
         
-        # Initialize memory
-        self.memory = ConversationMemory(system_prompt=self.system_prompt)
+        # Initialize memory, windowed to a share of the model's context window
+        context_window = self.model_interface.get_context_window() if context_window_share else None
+        self.context_token_budget = int(context_window * context_window_share) if context_window else None
+        provider = self.model_interface.provider
+        self.tokenizer = get_tokenizer(provider.provider_name, provider.model_name)
+        self.memory = self._create_memory()
         
         # Initialize observers
         self.observers = observers or []
+        self._dispatch_observers = ()
+        self._dispatch_table = {}
         
         # Register tools
         self.tools = {}
         self.tool_instances = {}
+        self._tool_manifest = ToolManifest()
+        # Retriever state: index of the registered tools, names picked for the current
+        # turn (None sends every tool) and manifests built for those picks
+        self._tool_index = None
+        self._turn_tools: Optional[frozenset] = None
+        self._tool_subsets: Dict[frozenset, ToolManifest] = {}
+        builtin_tools = [self._result_spiller.as_tool()] if self._result_spiller is not None else []
         if tools is not None:
-            self._register_tools(tools)
+            self._register_tools(list(tools) + builtin_tools)
         else:
-            # Get all registered tools
+            # Get all registered tools; their schemas are memoized, so this stays cheap
             from .tools import TOOLS
-            self._register_tools(TOOLS)
+            self._register_tools([entry["tool"] for entry in TOOLS.values()] + builtin_tools)
         
         # Set or generate the agent's description
         if description:
@@ -100,15 +153,11 @@ to provide a final text response to the user."""
                 self.description += f"It has access to the following tools: {', '.join(tool_names)}."
         
         # Emit initialization event
-        self._emit_event(AgentInitializedEvent(
-            agent_id=self.agent_id,
-            agent_name=self.name,
-            context_id=self.context_id,
-            parent_context_id=self.parent_context_id,
-            model=self.model,
-            system_prompt=self.system_prompt,
-            tools=list(self.tools.keys())
-        ))
+        self._emit(AgentInitializedEvent,
+                   parent_context_id=self.parent_context_id,
+                   model=self.model,
+                   system_prompt=self.system_prompt,
+                   tools=list(self.tools.keys()))
         
         self._log(f"Initialized agent {self.name} with model {self.model} using {self.model_interface.provider.provider_name} provider")
         
@@ -156,8 +205,66 @@ to provide a final text response to the user."""
                 self.tools[name] = tool
                 # We can't create a tool instance for this, so it will fail if called
         
+        self._rebuild_tool_manifest()
         self._log(f"Registered {len(self.tools)} tools: {list(self.tools.keys())}")
         
+    def _rebuild_tool_manifest(self) -> None:
+        """Snapshot the registered tools into a new manifest version."""
+        self._tool_manifest = ToolManifest(
+            [tool_def if 'function' in tool_def else {'type': 'function', 'function': tool_def}
+             for tool_def in self.tools.values()],
+            version=self._tool_manifest.version + 1
+        )
+        self._tool_subsets = {}
+        if self.tool_retriever is not None:
+            self._tool_index = self.tool_retriever.build_index(self._tool_manifest)
+        
+    def _event_handlers(self, event_cls: type) -> tuple:
+        """
+        Get the observer handlers subscribed to an event class.
+        
+        Handlers are resolved once per event class and cached until the
+        observer list changes.
+        
+        Args:
+            event_cls: The event class
+            
+        Returns:
+            Tuple of bound handler methods (empty if no observer subscribes)
+        """
+        if not self.observers:
+            return ()
+            
+        observers = tuple(self.observers)
+        if observers != self._dispatch_observers:
+            self._dispatch_observers = observers
+            self._dispatch_table = {}
+            
+        handlers = self._dispatch_table.get(event_cls)
+        if handlers is None:
+            handlers = tuple(
+                handler for handler in (resolve_event_handler(observer, event_cls) for observer in observers)
+                if handler is not None
+            )
+            self._dispatch_table[event_cls] = handlers
+        return handlers
+        
+    def _emit(self, event_cls: type, **fields) -> None:
+        """
+        Build and emit an event only if some observer subscribes to its class.
+        
+        Args:
+            event_cls: The event class
+            **fields: Event-specific constructor arguments
+        """
+        handlers = self._event_handlers(event_cls)
+        if not handlers:
+            return
+            
+        event = event_cls(agent_id=self.agent_id, agent_name=self.name, context_id=self.context_id, **fields)
+        for handler in handlers:
+            handler(event)
+        
     def _emit_event(self, event: AgentEvent) -> None:
         """
         Emit an event to all observers.
@@ -165,25 +272,8 @@ to provide a final text response to the user."""
         Args:
             event: The event to emit
         """
-        for observer in self.observers:
-            # Call the specific event handler method based on event type
-            if isinstance(event, UserMessageEvent):
-                observer.on_user_message(event)
-            elif isinstance(event, ModelRequestEvent):
-                observer.on_model_request(event)
-            elif isinstance(event, ModelResponseEvent):
-                observer.on_model_response(event)
-            elif isinstance(event, FunctionCallEvent):
-                observer.on_function_call(event)
-            elif isinstance(event, FunctionResultEvent):
-                observer.on_function_result(event)
-            elif isinstance(event, AgentResponseEvent):
-                observer.on_agent_response(event)
-            elif isinstance(event, AgentInitializedEvent):
-                observer.on_agent_initialized(event)
-            else:
-                # Fallback to generic event handler
-                observer.on_event(event)
+        for handler in self._event_handlers(type(event)):
+            handler(event)
                 
     def add_observer(self, observer: AgentObserver) -> None:
         """
@@ -216,38 +306,306 @@ to provide a final text response to the user."""
         Returns:
             str: The agent's response
         """
+        self._begin_turn(message, images)
+        
+        # Generate response with tool calling
+        response = self._generate_response_with_tools(enable_caching=enable_caching)
+        
+        return self._complete_turn(response)
+    
+    async def achat(self, message: str, images: Optional[List[str]] = None, enable_caching: bool = False) -> str:
+        """
+        Chat with the agent without blocking the event loop.
+        
+        Model calls go through the provider's async client; tool calls are executed
+        in the loop's default executor. Memory and observer events behave exactly
+        as in chat().
+        
+        Args:
+            message: The user's message
+            images: Optional list of image paths or URLs for multimodal models
+            enable_caching: Enable prompt caching for supported models (Anthropic)
+            
+        Returns:
+            str: The agent's response
+        """
+        self._begin_turn(message, images)
+        
+        response = await self._agenerate_response_with_tools(enable_caching=enable_caching)
+        
+        return self._complete_turn(response)
+    
+    def stream_chat(self, message: str, images: Optional[List[str]] = None, enable_caching: bool = False) -> Iterator[str]:
+        """
+        Chat with the agent, yielding text deltas as the model produces them.
+        
+        Tool calls are assembled from the stream and executed between model calls just
+        like in chat(). Memory and observer events are updated once the turn completes.
+        
+        Args:
+            message: The user's message
+            images: Optional list of image paths or URLs for multimodal models
+            enable_caching: Enable prompt caching for supported models (Anthropic)
+            
+        Yields:
+            str: Text deltas of the agent's response
+        """
+        self._begin_turn(message, images)
+        
+        max_tool_iterations = 10
+        iteration = 0
+        final_text = None
+        
+        while iteration < max_tool_iterations:
+            iteration += 1
+            
+            messages, tools = self._prepare_model_request()
+            
+            try:
+                response = None
+                streamed = False
+                estimated_tokens = self._wait_for_rate_limit(messages)
+                for chunk in self.model_interface.stream_response(messages, tools, enable_caching=enable_caching):
+                    if chunk.delta:
+                        streamed = True
+                        yield chunk.delta
+                    if chunk.response is not None:
+                        response = chunk.response
+                self._record_rate_limit_usage(response, estimated_tokens)
+                
+                content = self._handle_model_response(response)
+                if content is not None:
+                    final_text = content
+                    if not streamed:
+                        yield content
+                    break
+                if self._widen_turn_tools(response.tool_calls):
+                    continue
+                
+                # Process tool calls
+                self._process_tool_calls(response.tool_calls, response)
+                
+            except Exception as e:
+                self._log(f"Error generating response: {e}")
+                final_text = f"I encountered an error: {str(e)}"
+                yield final_text
+                break
+        
+        if final_text is None:
+            final_text = "I reached the maximum number of tool iterations. Please try rephrasing your question."
+            yield final_text
+        
+        self._complete_turn(final_text)
+    
+    async def astream_chat(self, message: str, images: Optional[List[str]] = None, enable_caching: bool = False) -> AsyncIterator[str]:
+        """
+        Async counterpart of stream_chat.
+        
+        Args:
+            message: The user's message
+            images: Optional list of image paths or URLs for multimodal models
+            enable_caching: Enable prompt caching for supported models (Anthropic)
+            
+        Yields:
+            str: Text deltas of the agent's response
+        """
+        self._begin_turn(message, images)
+        
+        max_tool_iterations = 10
+        iteration = 0
+        final_text = None
+        
+        while iteration < max_tool_iterations:
+            iteration += 1
+            
+            messages, tools = self._prepare_model_request()
+            
+            try:
+                response = None
+                streamed = False
+                estimated_tokens = await self._await_rate_limit(messages)
+                async for chunk in self.model_interface.astream_response(messages, tools, enable_caching=enable_caching):
+                    if chunk.delta:
+                        streamed = True
+                        yield chunk.delta
+                    if chunk.response is not None:
+                        response = chunk.response
+                self._record_rate_limit_usage(response, estimated_tokens)
+                
+                content = self._handle_model_response(response)
+                if content is not None:
+                    final_text = content
+                    if not streamed:
+                        yield content
+                    break
+                if self._widen_turn_tools(response.tool_calls):
+                    continue
+                
+                await self._aprocess_tool_calls(response.tool_calls, response)
+                
+            except Exception as e:
+                self._log(f"Error generating response: {e}")
+                final_text = f"I encountered an error: {str(e)}"
+                yield final_text
+                break
+        
+        if final_text is None:
+            final_text = "I reached the maximum number of tool iterations. Please try rephrasing your question."
+            yield final_text
+        
+        self._complete_turn(final_text)
+    
+    def chat_many(self, prompts: Iterable[str], concurrency: int = 4,
+                  rate_limit: bool = True) -> Iterator[Tuple[int, str]]:
+        """
+        Run independent single-turn conversations concurrently.
+        
+        Each prompt gets a fresh conversation with its own memory and context ID.
+        The conversations share this agent's model interface (and provider client),
+        tool manifest and observers, and with rate_limit they also share the global
+        RateLimiter. This agent's own memory is left untouched.
+        
+        Prompts are consumed lazily, so very large inputs (such as a generator over a
+        file) are never fully loaded into memory.
+        
+        Args:
+            prompts: The user messages to answer
+            concurrency: Maximum number of conversations running at once
+            rate_limit: Throttle model calls through the global RateLimiter
+            
+        Yields:
+            Tuples of (prompt index, response) in completion order
+        """
+        concurrency = max(1, concurrency)
+        rate_limiter = get_rate_limiter() if rate_limit else None
+        prompt_iter = enumerate(prompts)
+        
+        def run(prompt: str) -> str:
+            conversation = self._new_conversation()
+            conversation.rate_limiter = rate_limiter
+            return conversation.chat(prompt)
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{self.name}-chat") as executor:
+            pending = {}
+            
+            def submit_next() -> bool:
+                for index, prompt in prompt_iter:
+                    pending[executor.submit(run, prompt)] = index
+                    return True
+                return False
+            
+            for _ in range(concurrency):
+                if not submit_next():
+                    break
+                    
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    submit_next()
+                    yield index, future.result()
+                    
+    def chat_many_jsonl(self, input_path: str, output_path: str, concurrency: int = 4,
+                        prompt_key: str = "prompt", response_key: str = "response",
+                        rate_limit: bool = True) -> int:
+        """
+        Run chat_many over a JSONL file, writing one JSON line per result.
+        
+        Each input line is either a JSON object holding the prompt under prompt_key,
+        or a JSON string. Output lines contain the input object (or {prompt_key: prompt})
+        plus "index" and the response under response_key, in completion order.
+        
+        Args:
+            input_path: Path of the JSONL file to read
+            output_path: Path of the JSONL file to write
+            concurrency: Maximum number of conversations running at once
+            prompt_key: Key holding the prompt in each input object
+            response_key: Key to store the response under in each output object
+            rate_limit: Throttle model calls through the global RateLimiter
+            
+        Returns:
+            Number of records written
+        """
+        in_flight: Dict[int, Dict[str, Any]] = {}
+        
+        def read_prompts() -> Iterator[str]:
+            index = 0
+            with open(input_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        record = {prompt_key: record}
+                    in_flight[index] = record
+                    index += 1
+                    yield str(record[prompt_key])
+        
+        written = 0
+        with open(output_path, 'w') as out:
+            for index, response in self.chat_many(read_prompts(), concurrency=concurrency, rate_limit=rate_limit):
+                record = in_flight.pop(index)
+                out.write(json.dumps({"index": index, **record, response_key: response}) + '\n')
+                written += 1
+        return written
+    
+    def _new_conversation(self) -> 'LiteAgent':
+        """
+        Create a lightweight copy of this agent with its own, empty conversation.
+        
+        The copy shares the model interface, tools and observers with this agent.
+        """
+        conversation = copy.copy(self)
+        conversation.memory = self._create_memory()
+        conversation.parent_context_id = self.context_id
+        conversation.context_id = generate_context_id()
+        return conversation
+    
+    def _create_memory(self) -> ConversationMemory:
+        """Create an empty conversation memory using the agent's context budget."""
+        memory = ConversationMemory(system_prompt=self.system_prompt, tokenizer=self.tokenizer)
+        memory.token_budget = self.context_token_budget
+        return memory
+    
+    def _begin_turn(self, message: str, images: Optional[List[str]] = None) -> None:
+        """Record the user's message in memory and notify observers."""
         self._log(f"User: {message}")
         
         # Emit user message event
-        self._emit_event(UserMessageEvent(
-            agent_id=self.agent_id,
-            agent_name=self.name,
-            context_id=self.context_id,
-            message=message
-        ))
+        self._emit(UserMessageEvent, message=message)
+        
+        if self._tool_index is not None:
+            self._turn_tools = frozenset(self.tool_retriever.select(self._tool_index, message))
         
         # Add user message to memory (with images if provided)
         if images and self._supports_image_input():
             self.memory.add_user_message_with_images(message, images)
         else:
             self.memory.add_user_message(message)
-        
-        # Generate response with tool calling
-        response = self._generate_response_with_tools(enable_caching=enable_caching)
-        
+    
+    def _complete_turn(self, response: str) -> str:
+        """Record the agent's final response in memory and notify observers."""
         # Add final response to memory
         self.memory.add_assistant_message(response)
         
         # Emit agent response event
-        self._emit_event(AgentResponseEvent(
-            agent_id=self.agent_id,
-            agent_name=self.name,
-            context_id=self.context_id,
-            response=response
-        ))
+        self._emit(AgentResponseEvent, response=response)
         
         self._log(f"Agent: {response}")
+        
+        # Compact older turns off the request path, once the conversation is long enough
+        if self.summarizer is not None:
+            self.summarizer.maybe_summarize(self.memory, on_summary=self._on_summary)
         return response
+        
+    def _on_summary(self, summary: ConversationSummary) -> None:
+        """Notify observers that older turns were replaced by a summary (runs on the summarizer's thread)."""
+        self._log(f"Summarized {summary.covered} messages into {summary.token_count} tokens")
+        self._emit(ConversationSummarizedEvent,
+                   summary=summary.content,
+                   summarized_messages=summary.covered,
+                   summary_tokens=summary.token_count,
+                   summarized_tokens=summary.covered_tokens)
     
     def _supports_image_input(self) -> bool:
         """Check if the current model supports image input."""
@@ -270,185 +628,227 @@ to provide a final text response to the user."""
         while iteration < max_tool_iterations:
             iteration += 1
             
-            # Get current messages
-            messages = self.memory.get_messages()
-            
-            # Prepare tools if model supports them
-            tools = None
-            if self.model_interface.supports_tool_calling() and self.tools:
-                tools = self._prepare_tools()
-            
-            # Emit model request event
-            self._emit_event(ModelRequestEvent(
-                agent_id=self.agent_id,
-                agent_name=self.name,
-                context_id=self.context_id,
-                messages=messages,
-                tools=tools
-            ))
+            messages, tools = self._prepare_model_request()
             
             try:
                 # Generate response
+                estimated_tokens = self._wait_for_rate_limit(messages)
                 response = self.model_interface.generate_response(messages, tools, enable_caching=enable_caching)
+                self._record_rate_limit_usage(response, estimated_tokens)
                 
-                # Emit model response event
-                self._emit_event(ModelResponseEvent(
-                    agent_id=self.agent_id,
-                    agent_name=self.name,
-                    context_id=self.context_id,
-                    response=response
-                ))
-                
-                # Extract tool calls
-                tool_calls = response.tool_calls if isinstance(response, ProviderResponse) else []
-                
-                if not tool_calls:
-                    # No tool calls, return the content
-                    content = response.content if isinstance(response, ProviderResponse) else str(response)
-                    return content or "I apologize, but I couldn't generate a response."
+                content = self._handle_model_response(response)
+                if content is not None:
+                    return content
+                if self._widen_turn_tools(response.tool_calls):
+                    continue
                 
                 # Process tool calls
-                self._process_tool_calls(tool_calls, response)
+                self._process_tool_calls(response.tool_calls, response)
                 
             except Exception as e:
                 self._log(f"Error generating response: {e}")
                 return f"I encountered an error: {str(e)}"
         
         return "I reached the maximum number of tool iterations. Please try rephrasing your question."
-        
-    def _prepare_tools(self) -> List[Dict]:
+    
+    async def _agenerate_response_with_tools(self, enable_caching: bool = False) -> str:
         """
-        Prepare tools for the model.
+        Async counterpart of _generate_response_with_tools.
         
-        Returns:
-            List of tool definitions
-        """
-        tools = []
-        for tool_name, tool_def in self.tools.items():
-            if 'function' in tool_def:
-                # Already in tools format
-                tools.append(tool_def)
-            else:
-                # Convert to tools format
-                tools.append({
-                    'type': 'function',
-                    'function': tool_def
-                })
-        return tools
+        Args:
+            enable_caching: Enable prompt caching for supported models
         
-    def _process_tool_calls(self, tool_calls: List[ToolCall], response: ProviderResponse) -> None:
+        Returns:
+            str: The final response
         """
-        Process tool calls from the model response.
+        max_tool_iterations = 10
+        iteration = 0
         
-        Args:
-            tool_calls: List of tool calls to process
-            response: The model response containing the tool calls
-        """
-        # Add assistant message with tool calls to memory
-        if response.content:
-            # If there's content along with tool calls, add it
-            self.memory.add_assistant_message(response.content)
-            
-        # Check for tool calling loops before processing any tools
-        for tool_call in tool_calls:
-            if self.memory.is_function_call_loop(tool_call.name, tool_call.arguments):
-                logger.warning(f"Detected repeated function call: {tool_call.name} with args {tool_call.arguments}")
-                # Return immediately to break the cycle
-                loop_message = f"I notice I'm repeatedly trying to call the same tool. Let me provide a response based on the information I already have rather than continuing to search."
-                return loop_message
-        
-        # Add tool calls to memory
-        for tool_call in tool_calls:
-            self._emit_event(FunctionCallEvent(
-                agent_id=self.agent_id,
-                agent_name=self.name,
-                context_id=self.context_id,
-                function_name=tool_call.name,
-                function_args=tool_call.arguments
-            ))
+        while iteration < max_tool_iterations:
+            iteration += 1
             
-            # Add tool call to memory
-            self.memory.add_tool_call(tool_call.name, tool_call.arguments, tool_call.id)
+            messages, tools = self._prepare_model_request()
             
-            # Execute the tool
             try:
-                self._log(f"Executing tool: {tool_call.name} with args: {tool_call.arguments}")
-                result = self._execute_tool(tool_call.name, tool_call.arguments)
-                self._log(f"Tool {tool_call.name} result: {str(result)[:200]}...")
+                estimated_tokens = await self._await_rate_limit(messages)
+                response = await self.model_interface.agenerate_response(messages, tools, enable_caching=enable_caching)
+                self._record_rate_limit_usage(response, estimated_tokens)
                 
-                # Emit function result event
-                self._emit_event(FunctionResultEvent(
-                    agent_id=self.agent_id,
-                    agent_name=self.name,
-                    context_id=self.context_id,
-                    function_name=tool_call.name,
-                    result=result
-                ))
+                content = self._handle_model_response(response)
+                if content is not None:
+                    return content
+                if self._widen_turn_tools(response.tool_calls):
+                    continue
                 
-                # Add result to memory
-                self.memory.add_tool_result(tool_call.name, str(result), tool_call.id)
+                await self._aprocess_tool_calls(response.tool_calls, response)
                 
             except Exception as e:
-                error_msg = f"Error executing {tool_call.name}: {str(e)}"
-                self._log(error_msg)
-                
-                # Add error result to memory
-                self.memory.add_tool_result(tool_call.name, error_msg, tool_call.id, is_error=True)
-                
-    def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+                self._log(f"Error generating response: {e}")
+                return f"I encountered an error: {str(e)}"
+        
+        return "I reached the maximum number of tool iterations. Please try rephrasing your question."
+    
+    def _wait_for_rate_limit(self, messages: List[Dict]) -> int:
         """
-        Execute a tool function.
+        Wait on the rate limiter (if one is attached) before a model call.
         
         Args:
-            tool_name: Name of the tool to execute
-            arguments: Arguments to pass to the tool
+            messages: The messages about to be sent
             
         Returns:
-            The result of the tool execution
+            Estimated prompt tokens for the request
         """
-        if tool_name not in self.tool_instances:
-            raise ValueError(f"Tool {tool_name} not found")
+        if self.rate_limiter is None:
+            return 0
             
-        tool_instance = self.tool_instances[tool_name]
-        
-        start_time = time.time()
-        result = None
-        error = None
-        
-        try:
-            if hasattr(tool_instance, 'execute'):
-                # For tool objects
-                result = tool_instance.execute(**arguments)
-            elif callable(tool_instance):
-                # For function objects
-                result = tool_instance(**arguments)
-            else:
-                raise ValueError(f"Tool {tool_name} is not executable")
+        estimated_tokens = self._estimate_request_tokens(messages)
+        wait_time = self.rate_limiter.wait_if_needed(
+            **self._rate_limit_target(),
+            estimated_tokens=estimated_tokens
+        )
+        if wait_time > 0:
+            self._log(f"Waited {wait_time:.1f}s for rate limits")
+        return estimated_tokens
+        
+    async def _await_rate_limit(self, messages: List[Dict]) -> int:
+        """Async counterpart of _wait_for_rate_limit, waiting without blocking the event loop."""
+        if self.rate_limiter is None:
+            return 0
             
-            # Record successful tool call
-            execution_time = time.time() - start_time
-            ToolCallTracker.get_instance().record_call(
-                name=tool_name,
-                arguments=arguments,
-                result=result,
-                execution_time=execution_time
-            )
+        estimated_tokens = self._estimate_request_tokens(messages)
+        wait_time = await self.rate_limiter.await_if_needed(
+            **self._rate_limit_target(),
+            estimated_tokens=estimated_tokens
+        )
+        if wait_time > 0:
+            self._log(f"Waited {wait_time:.1f}s for rate limits")
+        return estimated_tokens
+        
+    def _rate_limit_target(self) -> Dict[str, Any]:
+        """
+        Identify the limits that this agent's model calls count against.
+        
+        Returns:
+            Keyword arguments (provider, model and tier) for the rate limiter
+        """
+        provider = self.model_interface.provider
+        return {"provider": provider.provider_name, "model": provider.model_name, "tier": None}
+        
+    def _estimate_request_tokens(self, messages: List[Dict]) -> int:
+        """
+        Estimate the prompt tokens of a request from memory's cached counts.
+        
+        Args:
+            messages: The messages about to be sent
+            
+        Returns:
+            Estimated tokens for the messages and the tool definitions
+        """
+        return self.memory.count_tokens(messages) + self._prepare_tools().token_count(self.memory.tokenizer)
+        
+    def _record_rate_limit_usage(self, response: ProviderResponse, estimated_tokens: int) -> None:
+        """Record a model call's token usage with the rate limiter (if one is attached)."""
+        if self.rate_limiter is None:
+            return
             
-            return result
+        usage = getattr(response, 'usage', None) or {}
+        self.rate_limiter.consume_tokens(
+            **self._rate_limit_target(),
+            actual_tokens=usage.get('total_tokens', estimated_tokens)
+        )
+    
+    def _prepare_model_request(self):
+        """
+        Collect the messages and tools for the next model call and emit the request event.
+        
+        Returns:
+            Tuple of (messages, tools)
+        """
+        # Get current messages
+        messages = self.memory.get_messages()
+        
+        # Prepare tools if model supports them
+        tools = None
+        if self.model_interface.supports_tool_calling() and self.tools:
+            tools = self._prepare_tools() or None
+        
+        # Emit model request event
+        self._emit(ModelRequestEvent, messages=messages, tools=tools)
+        
+        return messages, tools
+    
+    def _handle_model_response(self, response: ProviderResponse) -> Optional[str]:
+        """
+        Emit the model response event and extract the final content.
+        
+        Args:
+            response: The model response
             
-        except Exception as e:
-            # Record failed tool call
-            execution_time = time.time() - start_time
-            error_msg = str(e)
-            ToolCallTracker.get_instance().record_call(
-                name=tool_name,
-                arguments=arguments,
-                result=None,
-                execution_time=execution_time,
-                error=error_msg
+        Returns:
+            The final text response, or None if the response contains tool calls
+            that still need to be processed
+        """
+        # Emit model response event
+        self._emit(ModelResponseEvent, response=response)
+        
+        # Extract tool calls
+        tool_calls = response.tool_calls if isinstance(response, ProviderResponse) else []
+        
+        if not tool_calls:
+            # No tool calls, return the content
+            content = response.content if isinstance(response, ProviderResponse) else str(response)
+            return content or "I apologize, but I couldn't generate a response."
+        
+        return None
+        
+    def _prepare_tools(self) -> ToolManifest:
+        """
+        Prepare tools for the model.
+        
+        The manifest is rebuilt only when tools are added or removed, so providers
+        can reuse the payload they compiled from it on every request. With a tool
+        retriever, only the tools picked for the current turn are included; the
+        manifest for each set of picks is built once and reused.
+        
+        Returns:
+            The current tool manifest
+        """
+        manifest = self._tool_manifest
+        names = self._turn_tools
+        if names is None or self._tool_index is None or len(names) >= len(manifest):
+            return manifest
+        
+        subset = self._tool_subsets.get(names)
+        if subset is None:
+            if len(self._tool_subsets) >= self.MAX_TOOL_SUBSETS:
+                self._tool_subsets.clear()
+            # Registration order, so requests with the same picks are identical
+            subset = self._tool_subsets[names] = ToolManifest(
+                [tool_def for tool_def in manifest if tool_def['function'].get('name') in names],
+                version=manifest.version
             )
-            raise  # Re-raise the original exception
+        return subset
     
+    def _widen_turn_tools(self, tool_calls: List[ToolCall]) -> bool:
+        """
+        Add registered tools the model called from outside the current turn's picks.
+        
+        Args:
+            tool_calls: Tool calls from the model response
+            
+        Returns:
+            True if tools were added and the request should be retried with them
+        """
+        if self._turn_tools is None or self._tool_index is None:
+            return False
+        missing = {tool_call.name for tool_call in tool_calls
+                   if tool_call.name not in self._turn_tools and tool_call.name in self.tools}
+        if not missing:
+            return False
+        self._log(f"Model called unselected tools {sorted(missing)}; retrying with them included")
+        self._turn_tools = self._turn_tools | missing
+        return True
+        
     def _log(self, message: str) -> None:
         """
         Log a message if debug mode is enabled.
@@ -461,6 +861,7 @@ to provide a final text response to the user."""
         
     def reset_memory(self) -> None:
         """Reset the agent's conversation memory."""
+        self._conversation_tool_caches.pop(self.memory, None)
         self.memory.reset()
         self._log("Memory reset")
         
@@ -492,6 +893,7 @@ to provide a final text response to the user."""
             del self.tools[tool_name]
         if tool_name in self.tool_instances:
             del self.tool_instances[tool_name]
+        self._rebuild_tool_manifest()
         self._log(f"Removed tool: {tool_name}")
 
 
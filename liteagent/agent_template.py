@@ -0,0 +1,94 @@
+"""
+Agent templates for cheap per-request agent creation.
+
+Constructing a LiteAgent looks up model capabilities, creates a provider client
+and builds tool schemas. An AgentTemplate does that work once and then stamps
+out agents that share it, differing only in memory, identity and observers.
+"""
+
+import copy
+import uuid
+import weakref
+from typing import List, Optional
+
+from .agent import LiteAgent
+from .observer import AgentInitializedEvent, AgentObserver, generate_context_id
+
+
+class AgentTemplate:
+    """
+    Factory for LiteAgent instances that share one configuration.
+
+    Agents created from a template share the model interface (and its provider
+    client), the capability record and the compiled tool manifest. Each agent
+    has its own memory, agent and context IDs and observer list. Adding or
+    removing tools on one agent does not affect the template or other agents.
+
+    Example:
+        template = AgentTemplate(model="gpt-4o-mini", name="support", tools=[lookup_order])
+
+        def handle_request(message):
+            agent = template.create()
+            return agent.chat(message)
+    """
+
+    def __init__(self, model, name, system_prompt=None, tools=None, observers=None, **kwargs):
+        """
+        Initialize the template, building the shared agent configuration.
+
+        Args:
+            model (str): The LLM model to use
+            name (str): Default name of the created agents
+            system_prompt (str, optional): System prompt to use
+            tools (list, optional): List of tool functions to use. If None, uses all globally registered tools.
+            observers (list, optional): Observers attached to every created agent
+            **kwargs: Any other LiteAgent constructor arguments (provider, api_key, debug, ...)
+        """
+        self.observers = list(observers or [])
+        # The prototype is never used for chatting; its observers are attached per agent instead
+        self._prototype = LiteAgent(model=model, name=name, system_prompt=system_prompt,
+                                    tools=tools, **kwargs)
+
+    @property
+    def model_interface(self):
+        """The model interface shared by all created agents."""
+        return self._prototype.model_interface
+
+    def create(self, name: Optional[str] = None, context_id: Optional[str] = None,
+               parent_context_id: Optional[str] = None,
+               observers: Optional[List[AgentObserver]] = None) -> LiteAgent:
+        """
+        Create a new agent from the template.
+
+        Args:
+            name: Agent name (defaults to the template's name)
+            context_id: Context ID for the agent. If None, a new ID will be generated.
+            parent_context_id: Parent context ID if the agent was created by another agent
+            observers: Observers for this agent (defaults to the template's observers)
+
+        Returns:
+            LiteAgent: A new agent with empty memory
+        """
+        prototype = self._prototype
+        agent = copy.copy(prototype)
+        agent.name = name or prototype.name
+        agent.agent_id = str(uuid.uuid4())
+        agent.context_id = context_id or generate_context_id()
+        agent.parent_context_id = parent_context_id
+        agent.memory = prototype._create_memory()
+
+        # Per-agent copies of mutable state; the tool manifest itself is shared until tools change
+        agent.tools = dict(prototype.tools)
+        agent.tool_instances = dict(prototype.tool_instances)
+        agent.observers = list(self.observers if observers is None else observers)
+        agent._dispatch_observers = ()
+        agent._dispatch_table = {}
+        agent._tool_caches = {}
+        agent._conversation_tool_caches = weakref.WeakKeyDictionary()
+
+        agent._emit(AgentInitializedEvent,
+                    parent_context_id=agent.parent_context_id,
+                    model=agent.model,
+                    system_prompt=agent.system_prompt,
+                    tools=list(agent.tools.keys()))
+        return agent
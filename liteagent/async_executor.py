@@ -136,6 +136,26 @@ class AgentStatusCondition(WaitCondition):
         return True
 
 
+def _prefers_achat(agent_instance) -> bool:
+    """
+    Check whether an agent should be called through achat.
+    
+    A subclass that overrides only chat (like ForkedAgent) would lose its
+    behaviour if the inherited achat were used, so achat must be defined at
+    least as far down the class hierarchy as chat.
+    """
+    if not asyncio.iscoroutinefunction(getattr(agent_instance, 'achat', None)):
+        return False
+    classes = type(agent_instance).__mro__
+    
+    def depth(name: str) -> int:
+        if name in getattr(agent_instance, '__dict__', {}):
+            return -1
+        return next((i for i, cls in enumerate(classes) if name in vars(cls)), len(classes))
+    
+    return depth('achat') <= depth('chat')
+
+
 class AsyncCoordinator:
     """
     Asynchronous coordination system for multi-agent execution.
@@ -492,8 +512,12 @@ class AsyncCoordinator:
         """Call the agent with the task input."""
         # This is a simplified version - in practice, you'd need to
         # properly format the input based on the agent's expected interface
-        if hasattr(agent_instance, 'chat'):
-            return agent_instance.chat(str(task.input_data))
+        if _prefers_achat(agent_instance):
+            return await agent_instance.achat(str(task.input_data))
+        elif hasattr(agent_instance, 'chat'):
+            # Blocking chat runs on the executor so it doesn't stall other workers
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, agent_instance.chat, str(task.input_data))
         elif hasattr(agent_instance, 'execute'):
             return await agent_instance.execute(task.input_data)
         else:
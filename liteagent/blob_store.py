@@ -0,0 +1,262 @@
+"""
+Content-addressed blob store for LiteAgent.
+
+Images attached to messages are stored once, keyed by the SHA-256 of their
+bytes, and messages only hold a small reference. The base64 data URL a model
+needs is produced when a request is sent, optionally downscaled to the
+model's image size limit, and cached.
+
+In-memory stores can be bounded with ``max_bytes``; the least recently used
+blobs are evicted first. Stores that must outlive the process, such as those of
+persistent conversation memories, keep their blobs in a directory.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .utils import logger
+
+# Size limit of the global in-memory store
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Media types by file extension; anything else is sent as JPEG
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+def media_type_for(path: str) -> str:
+    """Guess an image's media type from its file extension."""
+    return MEDIA_TYPES.get(os.path.splitext(path)[1].lower(), "image/jpeg")
+
+
+def downscale_image(data: bytes, media_type: str, max_dimension: int) -> Tuple[bytes, str]:
+    """
+    Shrink an image so that its longest side is at most max_dimension pixels.
+
+    Requires the optional Pillow package; without it the image is returned unchanged.
+
+    Args:
+        data: Encoded image bytes
+        media_type: Media type of the image
+        max_dimension: Maximum width and height in pixels
+
+    Returns:
+        Tuple of (image bytes, media type)
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.debug("Pillow is not installed; sending images at their original size")
+        return data, media_type
+
+    image = Image.open(io.BytesIO(data))
+    if max(image.size) <= max_dimension:
+        return data, media_type
+    image.thumbnail((max_dimension, max_dimension))
+    output = io.BytesIO()
+    if media_type == "image/jpeg":
+        image.convert("RGB").save(output, format="JPEG", quality=85)
+    else:
+        image.save(output, format="PNG")
+        media_type = "image/png"
+    return output.getvalue(), media_type
+
+
+class BlobStore:
+    """
+    Store of binary blobs keyed by their SHA-256 digest.
+
+    Identical content is stored once, however many messages or agents add it.
+    Blobs are kept in memory, or in a directory when ``root`` is given.
+    """
+
+    def __init__(self, root: Optional[str] = None, encoded_cache_size: int = 32,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory to keep blobs in. If None, blobs are kept in memory.
+            encoded_cache_size: Number of encoded data URLs kept for reuse
+            max_bytes: Total size of the blobs an in-memory store keeps before it
+                evicts the least recently used ones. None for no limit.
+        """
+        if max_bytes is not None and root is not None:
+            raise ValueError("max_bytes only applies to in-memory stores")
+        self.root = root
+        self.encoded_cache_size = encoded_cache_size
+        self.max_bytes = max_bytes
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._encoded: "OrderedDict[Tuple[str, str, Optional[int]], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        if root is not None:
+            os.makedirs(root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest)
+
+    def put(self, data: bytes) -> str:
+        """
+        Add a blob.
+
+        Args:
+            data: The blob's bytes
+
+        Returns:
+            The blob's digest
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if self.root is None:
+            with self._lock:
+                if digest in self._blobs:
+                    self._blobs.move_to_end(digest)
+                    return digest
+                self._blobs[digest] = data
+                self._size += len(data)
+                # The newest blob is kept even if it alone exceeds the limit
+                while self.max_bytes is not None and self._size > self.max_bytes and len(self._blobs) > 1:
+                    self._forget(next(iter(self._blobs)))
+        elif digest not in self:
+            temporary = f"{self._path(digest)}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as blob_file:
+                blob_file.write(data)
+            os.replace(temporary, self._path(digest))
+        return digest
+
+    def put_file(self, path: str) -> str:
+        """
+        Add the contents of a file.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            The blob's digest
+        """
+        with open(path, "rb") as blob_file:
+            return self.put(blob_file.read())
+
+    def get(self, digest: str) -> bytes:
+        """
+        Get a blob's bytes.
+
+        Args:
+            digest: The blob's digest
+
+        Returns:
+            The blob's bytes
+
+        Raises:
+            KeyError: If the store has no blob with this digest
+        """
+        if self.root is None:
+            with self._lock:
+                data = self._blobs[digest]
+                self._blobs.move_to_end(digest)
+            return data
+        try:
+            with open(self._path(digest), "rb") as blob_file:
+                return blob_file.read()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def delete(self, digest: str) -> None:
+        """
+        Remove a blob, if the store has it.
+
+        Args:
+            digest: The blob's digest
+        """
+        with self._lock:
+            if self.root is None:
+                if digest in self._blobs:
+                    self._forget(digest)
+                return
+            self._drop_encoded(digest)
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, digest: str) -> None:
+        """Drop an in-memory blob and its encodings; the lock must be held."""
+        self._size -= len(self._blobs.pop(digest))
+        self._drop_encoded(digest)
+
+    def _drop_encoded(self, digest: str) -> None:
+        for key in [key for key in self._encoded if key[0] == digest]:
+            del self._encoded[key]
+
+    def __contains__(self, digest: str) -> bool:
+        if self.root is None:
+            return digest in self._blobs
+        return os.path.exists(self._path(digest))
+
+    def __len__(self) -> int:
+        if self.root is None:
+            return len(self._blobs)
+        return sum(1 for name in os.listdir(self.root) if not name.endswith(".tmp"))
+
+    def data_url(self, digest: str, media_type: str, max_dimension: Optional[int] = None) -> str:
+        """
+        Get a blob as a base64 data URL, encoding it only once.
+
+        Args:
+            digest: The blob's digest
+            media_type: Media type of the blob
+            max_dimension: If set, images larger than this are downscaled first
+
+        Returns:
+            The data URL
+        """
+        key = (digest, media_type, max_dimension)
+        with self._lock:
+            url = self._encoded.get(key)
+            if url is not None:
+                self._encoded.move_to_end(key)
+                return url
+
+        data = self.get(digest)
+        if max_dimension is not None:
+            data, media_type = downscale_image(data, media_type, max_dimension)
+        url = f"data:{media_type};base64,{base64.b64encode(data).decode()}"
+
+        with self._lock:
+            self._encoded[key] = url
+            while len(self._encoded) > self.encoded_cache_size:
+                self._encoded.popitem(last=False)
+        return url
+
+
+# Global blob store instance
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the global blob store instance."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(max_bytes=DEFAULT_MAX_BYTES)
+    return _blob_store
+
+
+def set_blob_store(store: BlobStore) -> None:
+    """
+    Replace the global blob store, e.g. with one that keeps blobs on disk.
+
+    Args:
+        store: The new global store
+    """
+    global _blob_store
+    _blob_store = store
@@ -6,13 +6,13 @@ to create multiple specialized agents from a shared context without re-sending
 the full context for each agent.
 """
 
-import copy
 import uuid
 import time
 import asyncio
-from typing import Any, Dict, List, Optional, Union, Set
+from typing import Any, Dict, List, Optional, Sequence, Union, Set
 from .agent import LiteAgent
 from .memory import ConversationMemory
+from .messages import SharedMessageList, snapshot_messages
 from .models import create_model_interface
 from .utils import logger
 from .observer import generate_context_id, AgentEvent
@@ -54,11 +54,18 @@ class ForkedMemory(ConversationMemory):
             parent_memory: The parent agent's memory to fork from
             prefill_messages: Optional prefill messages for role definition
         """
-        # Create a deep copy of parent messages to avoid mutations
-        self.messages = copy.deepcopy(parent_memory.messages)
+        # Share the parent's messages rather than copying them; the fork only
+        # stores what it adds, and copies the prefix if it ever changes it
+        self.tokenizer = parent_memory.tokenizer
+        self._fork_prefix = snapshot_messages(parent_memory.messages, self.tokenizer)
+        self.messages = SharedMessageList(self._fork_prefix, self.tokenizer)
+        self.summary = parent_memory.summary
+        self.token_budget = parent_memory.token_budget
+        self.blob_store = parent_memory.blob_store
         self.system_prompt = parent_memory.system_prompt
         self.function_calls = {}
         self.last_function_call = None
+        self._conversion_cache = {}
         
         # Mark the fork point for cache optimization
         self._fork_point = len(self.messages)
@@ -69,7 +76,7 @@ class ForkedMemory(ConversationMemory):
             for msg in prefill_messages:
                 self.messages.append(msg)
                 
-    def get_messages_for_api(self, include_cached: bool = True) -> List[Dict]:
+    def get_messages_for_api(self, include_cached: bool = True) -> Sequence[Dict]:
         """
         Get messages formatted for API calls with cache optimization.
         
@@ -83,7 +90,19 @@ class ForkedMemory(ConversationMemory):
             return self.messages
         else:
             # Return only messages after fork point for incremental updates
-            return self.messages[self._fork_point:]
+            return self.get_post_fork_messages()
+            
+    def get_fork_point_messages(self) -> Sequence[Dict]:
+        """Get a read-only view of the messages up to the fork point, for caching."""
+        return self._fork_prefix
+        
+    def get_post_fork_messages(self) -> Sequence[Dict]:
+        """Get a read-only view of the messages after the fork point."""
+        messages = self.messages
+        if isinstance(messages, SharedMessageList) and messages.prefix is self._fork_prefix:
+            return messages.snapshot_suffix()
+        # The prefix has been changed or the messages replaced
+        return messages[self._fork_point:]
             
     def get_cache_key(self) -> str:
         """Generate a cache key for the forked memory state."""
@@ -92,7 +111,7 @@ class ForkedMemory(ConversationMemory):
         import json
         
         # Hash the messages up to fork point
-        fork_content = json.dumps(self.messages[:self._fork_point], sort_keys=True)
+        fork_content = json.dumps([dict(message) for message in self._fork_prefix], sort_keys=True)
         return hashlib.sha256(fork_content.encode()).hexdigest()
 
 
@@ -553,7 +572,7 @@ class ForkedAgent(LiteAgent):
         # Estimate cached tokens from memory if available
         cached_tokens = 0
         if isinstance(self.memory, ForkedMemory):
-            cached_messages = self.memory.messages[:self.memory._fork_point]
+            cached_messages = self.memory.get_fork_point_messages()
             cached_chars = sum(len(msg.get('content', '')) for msg in cached_messages 
                              if isinstance(msg.get('content'), str))
             cached_tokens = cached_chars // 4
@@ -390,7 +390,7 @@ class ForkedAgentV2:
     def _generate_response_with_rate_limiting(self, messages: List[Dict[str, Any]], **kwargs) -> ProviderResponse:
         """Generate response with intelligent rate limiting."""
         # Estimate tokens for rate limiting
-        estimated_tokens = sum(len(msg.get('content', '')) for msg in messages) // 4
+        estimated_tokens = self.memory.count_tokens(messages)
         
         # Wait if needed
         if self.rate_limiter:
@@ -6,22 +6,269 @@ for the agent.
 """
 
 import json
-from typing import Dict, List, Optional, Any, Union
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple, Union
+
+from .blob_store import BlobStore, get_blob_store, media_type_for
+from .messages import Message, MessageList, SharedMessageList, message_key
+from .tokenization import DEFAULT_TOKENIZER, Tokenizer
+from .utils import logger
+
+
+# Content part type referencing an image in the blob store
+IMAGE_REF_TYPE = "image_ref"
+
+# Heading under which a conversation summary is added to the system prompt
+SUMMARY_HEADING = "Summary of the earlier conversation:"
+
+
+class MessageHistory(list):
+    """
+    List of messages returned by ConversationMemory.get_messages.
+    
+    Behaves as a plain list of message dicts, and remembers which stored messages
+    it was built from so that providers can reuse conversions of messages they
+    have already seen instead of reconverting the whole history on every request.
+    """
+    
+    def __init__(self, messages: List[Dict], sources: List[Dict], indices: Sequence[int],
+                 cache: Dict[str, Dict[int, Tuple[Dict, Any]]], total: int,
+                 token_count: Optional[int] = None, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize the message history.
+        
+        Args:
+            messages: Filtered copies of the stored messages
+            sources: The stored message dicts the copies were made from
+            indices: Index of each message within the memory
+            cache: The memory's conversion cache
+            total: Number of messages stored in the memory
+            token_count: Token count of the messages, as counted by the memory
+            blob_store: Store holding the images the messages reference, if not the global one
+        """
+        super().__init__(messages)
+        self._snapshot = tuple(messages)
+        self._sources = sources
+        self._indices = indices
+        self._cache = cache
+        self._total = total
+        self._token_count = token_count
+        self.blob_store = blob_store
+        
+    def is_unmodified(self) -> bool:
+        """Check whether the history still holds exactly the messages it was created with."""
+        return len(self) == len(self._snapshot) and all(
+            message is original for message, original in zip(self, self._snapshot))
+        
+    @property
+    def token_count(self) -> Optional[int]:
+        """Token count recorded by the memory, or None if unknown or the history was modified."""
+        if self._token_count is None or not self.is_unmodified():
+            return None
+        return self._token_count
+        
+    def map(self, convert_message: Callable[[Dict], Dict]) -> "MessageHistory":
+        """
+        Build a history of transformed messages that keeps this history's cache links.
+        
+        The transformation must depend only on the message, so that cached
+        conversions of the stored message remain valid.
+        
+        Args:
+            convert_message: Callable returning the transformed message
+            
+        Returns:
+            A new MessageHistory
+        """
+        return MessageHistory([convert_message(message) for message in self], self._sources,
+                              self._indices, self._cache, self._total, self.token_count, self.blob_store)
+        
+    def converted(self, key: str, convert_message: Callable[[Dict], Any]) -> List[Any]:
+        """
+        Convert each message, reusing earlier conversions of the same stored message.
+        
+        Args:
+            key: Cache key for the target format, usually the provider name
+            convert_message: Callable converting one message dict
+            
+        Returns:
+            List of converted messages, one per message. Cached conversions are shared
+            between calls and must not be modified. Messages referencing images
+            are converted anew each time.
+        """
+        if len(self) != len(self._snapshot):
+            # Modified after it was returned; don't trust the cache
+            return [convert_message(message) for message in self]
+            
+        cache = self._cache.setdefault(key, {})
+        converted = []
+        for offset, message in enumerate(self):
+            index = self._indices[offset]
+            source = self._sources[offset]
+            entry = cache.get(index)
+            if entry is not None and entry[0] is source and message is self._snapshot[offset]:
+                converted.append(entry[1])
+                continue
+                
+            result = convert_message(message)
+            # Conversions of messages with images would pin their base64 data in RAM
+            if message is self._snapshot[offset] and not _has_image_ref(source):
+                cache[index] = (source, result)
+            converted.append(result)
+            
+        # Drop entries for messages that no longer exist
+        if len(cache) > self._total:
+            for index in [i for i in cache if i >= self._total]:
+                del cache[index]
+                
+        return converted
+
+
+def _has_image_ref(message: Dict[str, Any]) -> bool:
+    content = message.get("content")
+    return isinstance(content, list) and any(item.get("type") == IMAGE_REF_TYPE for item in content)
+
+
+def resolve_image_refs(messages: List[Dict[str, Any]], max_dimension: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Replace image references with base64 data URLs from the blob store.
+    
+    Images are read from the store of the memory the messages came from, or the
+    global store. An image missing from it (e.g. evicted) is replaced by a note.
+    
+    Args:
+        messages: Messages to send, possibly containing image references
+        max_dimension: If set, larger images are downscaled to fit it
+        
+    Returns:
+        The messages unchanged if they contain no references, otherwise copies with
+        the references replaced by "image_url" parts
+    """
+    if not any(_has_image_ref(message) for message in messages):
+        return messages
+        
+    store = getattr(messages, "blob_store", None)
+    if store is None:
+        store = get_blob_store()
+    
+    def resolve(message):
+        if not _has_image_ref(message):
+            return message
+        content = []
+        for item in message["content"]:
+            if item.get("type") == IMAGE_REF_TYPE:
+                ref = item[IMAGE_REF_TYPE]
+                try:
+                    url = store.data_url(ref["digest"], ref["media_type"], max_dimension)
+                except KeyError:
+                    logger.warning(f"Image {ref['digest']} is no longer in the blob store")
+                    item = {"type": "text", "text": "[Image no longer available]"}
+                else:
+                    item = {"type": "image_url", "image_url": {"url": url}}
+            content.append(item)
+        return {**message, "content": content}
+        
+    if isinstance(messages, MessageHistory):
+        return messages.map(resolve)
+    return [resolve(message) for message in messages]
+
+
+@dataclass(frozen=True)
+class ConversationSummary:
+    """Summary sent in place of the oldest stored messages of a conversation."""
+    
+    # The summary text
+    content: str
+    # Number of leading stored messages the summary stands in for
+    covered: int
+    # message_key of the last message it covers, used to detect a history that was rewritten since
+    last_key: str
+    # Tokens of the covered messages that are no longer sent, and of the summary text
+    covered_tokens: int
+    token_count: int
+
 
 class ConversationMemory:
     """Class to manage conversation history."""
     
-    def __init__(self, system_prompt: str):
+    # Token budget for the messages returned by get_messages (None sends everything)
+    token_budget: Optional[int] = None
+    # Tokenizer used to count stored messages
+    tokenizer: Tokenizer = DEFAULT_TOKENIZER
+    # Running summary of the oldest messages (see apply_summary)
+    summary: Optional[ConversationSummary] = None
+    # (summary, message) last confirmed by get_summary, to skip re-keying the same message
+    _summary_checked: Optional[tuple] = None
+    # Store holding the images of this memory; None for the global store
+    blob_store: Optional[BlobStore] = None
+    
+    def __init__(self, system_prompt: str, tokenizer: Optional[Tokenizer] = None):
         """
         Initialize conversation memory.
         
         Args:
             system_prompt: The system prompt to use
+            tokenizer: Tokenizer used to count messages (defaults to a character heuristic)
         """
+        if tokenizer is not None:
+            self.tokenizer = tokenizer
         self.system_prompt = system_prompt
         self.messages = [{"role": "system", "content": system_prompt}]
         self.function_calls = {}  # Track function calls to detect loops
         self.last_function_call = None
+        # Provider-format conversions keyed by provider and message index
+        self._conversion_cache: Dict[str, Dict[int, Tuple[Dict, Any]]] = {}
+    
+    @property
+    def messages(self) -> Union[MessageList, SharedMessageList]:
+        """
+        The stored messages, with their token counts.
+        
+        Messages are read-only Message records: assign a new message to an index,
+        or use replace_message, instead of editing one in place.
+        """
+        return self._messages
+    
+    @messages.setter
+    def messages(self, messages: List[Dict]) -> None:
+        if not (isinstance(messages, (MessageList, SharedMessageList))
+                and messages.tokenizer is self.tokenizer):
+            messages = MessageList(messages, self.tokenizer)
+        self._messages = messages
+    
+    @property
+    def token_count(self) -> int:
+        """Total tokens of all stored messages, kept up to date as messages are added."""
+        return self._messages.token_count
+    
+    def set_tokenizer(self, tokenizer: Tokenizer) -> None:
+        """
+        Change the tokenizer and recount the stored messages.
+        
+        Args:
+            tokenizer: The new tokenizer
+        """
+        self.tokenizer = tokenizer
+        self.messages = list(self._messages)
+    
+    def count_tokens(self, messages: Optional[List[Dict]] = None) -> int:
+        """
+        Count the tokens of a list of messages.
+        
+        Args:
+            messages: Messages to count. Defaults to all stored messages. Histories
+                returned by get_messages reuse the stored counts.
+            
+        Returns:
+            Number of tokens
+        """
+        if messages is None:
+            return self.token_count
+        if isinstance(messages, MessageHistory) and messages._cache is self._conversion_cache:
+            token_count = messages.token_count
+            if token_count is not None:
+                return token_count
+        return sum(self.tokenizer.count_message(message) for message in messages)
     
     def add_user_message(self, content: str) -> None:
         """
@@ -36,13 +283,15 @@ class ConversationMemory:
         """
         Add a user message with images to the conversation.
         
+        Local image files are added to the memory's blob store and the message keeps
+        only a reference to them; they are encoded when a request is sent (see
+        resolve_image_refs).
+        
         Args:
             content: The message content
             images: List of image paths or URLs
         """
-        import base64
         import os
-        from typing import Union
         
         # Prepare message content for multimodal format
         message_content = []
@@ -62,36 +311,25 @@ class ConversationMemory:
                     "type": "image_url",
                     "image_url": {"url": image}
                 })
-            else:
-                # Local image file - convert to base64
-                if os.path.exists(image):
-                    with open(image, "rb") as image_file:
-                        image_data = base64.b64encode(image_file.read()).decode()
-                        # Determine image format
-                        extension = os.path.splitext(image)[1].lower()
-                        if extension in ['.jpg', '.jpeg']:
-                            format_type = 'jpeg'
-                        elif extension == '.png':
-                            format_type = 'png'
-                        elif extension == '.gif':
-                            format_type = 'gif'
-                        elif extension == '.webp':
-                            format_type = 'webp'
-                        else:
-                            format_type = 'jpeg'  # Default
-                        
-                        message_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/{format_type};base64,{image_data}"
-                            }
-                        })
+            elif os.path.exists(image):
+                # Local image file - store once and reference it by digest
+                message_content.append({
+                    "type": IMAGE_REF_TYPE,
+                    IMAGE_REF_TYPE: {
+                        "digest": self._image_store().put_file(image),
+                        "media_type": media_type_for(image)
+                    }
+                })
         
         self.messages.append({
             "role": "user", 
             "content": message_content
         })
     
+    def _image_store(self) -> BlobStore:
+        # Not `or`: an empty store is falsy
+        return self.blob_store if self.blob_store is not None else get_blob_store()
+    
     def _is_url(self, string: str) -> bool:
         """Check if a string is a URL."""
         return string.startswith(('http://', 'https://'))
@@ -262,38 +500,232 @@ class ConversationMemory:
         """
         self.messages.append({"role": "system", "content": content})
     
-    def get_messages(self, count: Optional[int] = None) -> List[Dict]:
+    def get_messages(self, count: Optional[int] = None) -> MessageHistory:
         """
         Get messages in the conversation, optionally limited to the last 'count' messages.
         
+        Without a count, a memory with a token_budget returns only the messages that
+        fit the budget (see get_window_indices), and a memory with a summary sends
+        it, as part of the system prompt, in place of the messages it covers.
+        
         Args:
             count: Optional number of recent messages to return
             
         Returns:
             List of message dictionaries
         """
-        # Filter out internal fields that shouldn't be sent to the model
-        filtered_messages = []
-        messages_to_process = self.messages
-        
-        # If count is specified, limit to the last 'count' messages
+        total = len(self.messages)
+        summary = self.get_summary() if count is None else None
         if count is not None:
-            messages_to_process = self.messages[-count:]
-        
-        for message in messages_to_process:
-            filtered_message = message.copy()
+            indices = range(total - len(self.messages[-count:]), total)
+        elif summary is not None:
+            budget = float("inf") if self.token_budget is None else self.token_budget - summary.token_count
+            indices = self.get_window_indices(budget, start=summary.covered)
+        elif self.token_budget is not None:
+            indices = self.get_window_indices(self.token_budget)
+        else:
+            indices = range(total)
+        token_counts = self.messages.token_counts
+        if len(indices) == total:
+            token_count = self.token_count
+        else:
+            token_count = sum(token_counts[i] for i in indices)
             
-            # Remove fields that aren't part of the standard message format
-            if "args" in filtered_message:
-                del filtered_message["args"]
-            if "function_call_id" in filtered_message:
-                del filtered_message["function_call_id"]
-            if "is_error" in filtered_message:
-                del filtered_message["is_error"]
+        sources = list(self.messages) if len(indices) == total else [self.messages[i] for i in indices]
+        if summary is not None:
+            indices = list(indices)
+            token_count += summary.token_count
+            if indices and indices[0] == 0 and sources[0].get("role") == "system":
+                sources[0] = self._summary_message(summary, sources[0])
+            else:
+                # No system prompt to extend; send the summary as one (index -1 is never stored)
+                indices.insert(0, -1)
+                sources.insert(0, self._summary_message(summary, None))
                 
-            filtered_messages.append(filtered_message)
+        # Build the provider dicts, without internal fields, from the stored records
+        filtered_messages = [message.to_message() for message in sources]
+        return MessageHistory(filtered_messages, sources, indices, self._conversion_cache, total,
+                              token_count, self.blob_store)
+    
+    def get_window_indices(self, token_budget: float, start: int = 0) -> List[int]:
+        """
+        Select the messages to send when the history must fit a token budget.
+        
+        The leading system prompt and pinned messages are always kept. The rest of
+        the budget is filled with the most recent whole turns (a user message and
+        everything up to the next one), newest first, stopping at the first turn
+        that doesn't fit; the latest turn is always kept. A tool call is never
+        separated from its results.
+        
+        Args:
+            token_budget: Maximum tokens for the selected messages
+            start: Index of the first message turns may be taken from (earlier
+                messages are covered by a summary)
+            
+        Returns:
+            Sorted indices of the selected messages
+        """
+        messages = self.messages
+        if start == 0 and messages.token_count <= token_budget:
+            return list(range(len(messages)))
+        tokens = messages.token_counts
+        roles = messages.roles
+            
+        head = 1 if roles and roles[0] == "system" else 0
+        selected = set(range(head))
+        
+        # Pinned messages, together with the tool calls/results they belong to
+        for index in messages.pinned_indices():
+            if index >= head:
+                selected.update(self._tool_group(index, roles))
+        remaining = token_budget - sum(tokens[i] for i in selected)
+        
+        # Most recent turns, newest first
+        first = max(head, start)
+        turn_starts = [i for i in range(first, len(messages)) if roles[i] == "user"]
+        if not turn_starts or turn_starts[0] != first:
+            turn_starts.insert(0, first)
+        turn_ends = turn_starts[1:] + [len(messages)]
+        for position, (turn_start, turn_end) in enumerate(reversed(list(zip(turn_starts, turn_ends)))):
+            cost = sum(tokens[i] for i in range(turn_start, turn_end) if i not in selected)
+            if cost > remaining and position > 0:
+                break
+            selected.update(range(turn_start, turn_end))
+            remaining -= cost
+            
+        return sorted(selected)
+    
+    def _tool_group(self, index: int, roles: List[Optional[str]]) -> range:
+        """Get the span of the tool call message and results that a message belongs to."""
+        start = index
+        while start > 0 and roles[start] == "tool":
+            start -= 1
+        end = start + 1
+        if self.messages[start].get("tool_calls"):
+            while end < len(roles) and roles[end] == "tool":
+                end += 1
+        else:
+            end = max(end, index + 1)
+        return range(start, end)
+    
+    @property
+    def active_token_count(self) -> int:
+        """Tokens of the stored messages not covered by the summary, plus the summary's own."""
+        summary = self.get_summary()
+        if summary is None:
+            return self.token_count
+        return self.token_count - summary.covered_tokens + summary.token_count
+    
+    def get_summary(self) -> Optional[ConversationSummary]:
+        """
+        Get the summary, if it still matches the stored messages.
+        
+        Returns:
+            The summary, or None if there is none or the messages it covers have changed
+        """
+        summary = self.summary
+        if summary is None:
+            return None
+        messages = self.messages
+        if summary.covered > len(messages):
+            return None
+        message = messages[summary.covered - 1]
+        checked = self._summary_checked
+        if checked is None or checked[0] is not summary or checked[1] is not message:
+            if message_key(message) != summary.last_key:
+                return None
+            self._summary_checked = (summary, message)
+        return summary
+    
+    def apply_summary(self, content: str, covered: int, last_message: Optional[Dict] = None) -> bool:
+        """
+        Send a summary in place of the oldest messages from now on.
+        
+        The messages stay stored; get_messages just stops sending the ones the
+        summary covers (pinned messages are still sent). The summary replaces any
+        earlier one in a single step, so it is safe to apply from another thread
+        while the conversation goes on.
+        
+        Args:
+            content: The summary text
+            covered: Number of leading stored messages the summary stands in for
+            last_message: The last covered message as it was when the summary was
+                made; if given and no longer stored at that position, the summary
+                is discarded
             
-        return filtered_messages
+        Returns:
+            Whether the summary was applied
+        """
+        messages = self.messages
+        if not 0 < covered <= len(messages):
+            return False
+        current = messages[covered - 1]
+        if last_message is not None and current is not last_message and message_key(current) != message_key(last_message):
+            return False
+        self.summary = self._make_summary(content, covered, message_key(current))
+        return True
+    
+    def _make_summary(self, content: str, covered: int, last_key: str) -> ConversationSummary:
+        """Build a summary of the first covered stored messages, counting its tokens."""
+        messages = self.messages
+        # The leading system prompt is still sent
+        head = 1 if messages[0].get("role") == "system" else 0
+        return ConversationSummary(
+            content=content,
+            covered=covered,
+            last_key=last_key,
+            covered_tokens=sum(messages.token_counts[head:covered]),
+            token_count=self.tokenizer.count_text(f"{SUMMARY_HEADING}\n{content}")
+        )
+    
+    def _summary_message(self, summary: ConversationSummary, system_message: Optional[Dict]) -> Dict:
+        """Get the system message carrying a summary, built once per summary and system prompt."""
+        cached = getattr(self, "_summary_cache", None)
+        if cached is not None and cached[0] is summary and cached[1] is system_message:
+            return cached[2]
+        text = f"{SUMMARY_HEADING}\n{summary.content}"
+        if system_message is None:
+            message = Message({"role": "system", "content": text})
+        else:
+            message = Message({**system_message, "content": f"{system_message['content']}\n\n{text}"})
+        self._summary_cache = (summary, system_message, message)
+        return message
+    
+    def replace_message(self, index: int, **fields: Any) -> None:
+        """
+        Change fields of a stored message.
+        
+        Stored messages are read-only records, so the message is replaced by a
+        new one with the given fields updated; token counts, disk-backed lists
+        and cached conversions follow the replacement.
+        
+        Args:
+            index: Index of the message to change
+            **fields: Fields to set, e.g. content="..."
+        """
+        self.messages[index] = {**self.messages[index], **fields}
+    
+    def pin_message(self, index: int = -1) -> None:
+        """
+        Pin a message so it is always sent, however long the conversation gets.
+        
+        Args:
+            index: Index of the message to pin (defaults to the latest message)
+        """
+        message = self.messages[index]
+        # Replace rather than edit in place so cached conversions stay consistent
+        self.messages[index] = {**message, "pinned": True}
+    
+    def unpin_message(self, index: int) -> None:
+        """
+        Remove the pin from a message.
+        
+        Args:
+            index: Index of the message to unpin
+        """
+        message = self.messages[index]
+        if message.get("pinned"):
+            self.messages[index] = {k: v for k, v in message.items() if k != "pinned"}
     
     def has_function_been_called(self, function_name: str, args: Dict[str, Any]) -> bool:
         """
@@ -320,6 +752,8 @@ class ConversationMemory:
         self.messages = [{"role": "system", "content": self.system_prompt}]
         self.function_calls = {}
         self.last_function_call = None
+        self._conversion_cache = {}
+        self.summary = None
     
     def update_system_prompt(self, system_prompt: str) -> None:
         """
@@ -331,7 +765,8 @@ class ConversationMemory:
         self.system_prompt = system_prompt
         # Update the first message if it's a system message
         if self.messages and self.messages[0]["role"] == "system":
-            self.messages[0]["content"] = system_prompt
+            # Replace rather than edit in place so cached conversions are invalidated
+            self.messages[0] = {**self.messages[0], "content": system_prompt}
         else:
             # Insert at the beginning if there's no system message
             self.messages.insert(0, {"role": "system", "content": system_prompt})
@@ -0,0 +1,533 @@
+"""
+Stored conversation messages.
+
+Messages are kept as compact Message records in a MessageList, which tracks
+their token counts, roles and pins as they are added. Forked memories share
+their parent's history through read-only MessageSnapshots and append their own
+messages to a SharedMessageList.
+"""
+
+import copy
+import hashlib
+import json
+import sys
+import weakref
+from collections.abc import Mapping, MutableSequence
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .tokenization import DEFAULT_TOKENIZER, Tokenizer
+
+
+# Internal fields stored on messages that are never sent to the model
+INTERNAL_FIELDS = ("args", "function_call_id", "is_error", "pinned")
+
+class _MessageShape:
+    """Key layout shared by all stored messages with the same keys in the same order."""
+    
+    __slots__ = ("keys", "positions", "role_position", "public_keys", "select_public")
+    
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.role_position = self.positions.get("role")
+        public = [position for position, key in enumerate(keys) if key not in INTERNAL_FIELDS]
+        self.public_keys = tuple(keys[position] for position in public)
+        # None when every field is public, so the values can be zipped as they are
+        self.select_public = None
+        if len(public) != len(keys):
+            getter = itemgetter(*public) if public else (lambda values: ())
+            self.select_public = getter if len(public) != 1 else (lambda values: (getter(values),))
+
+
+# Shapes by key tuple; conversations use only a handful
+_shapes: Dict[Tuple[str, ...], _MessageShape] = {}
+
+
+class Message(Mapping):
+    """
+    Compact, read-only record of a stored message.
+    
+    Reads like the message dict it was made from, but keeps only a shared key
+    layout and a tuple of values, with the role interned, which takes about a
+    third less memory than a dict. Messages are replaced rather than edited, so a
+    record never changes. to_message() builds the dict sent to providers.
+    """
+    
+    __slots__ = ("_shape", "_values")
+    
+    def __init__(self, message: Mapping):
+        """
+        Initialize the record.
+        
+        Args:
+            message: The message dict
+        """
+        keys = tuple(message)
+        shape = _shapes.get(keys)
+        if shape is None:
+            keys = tuple(sys.intern(key) for key in keys)
+            shape = _shapes.setdefault(keys, _MessageShape(keys))
+        values = [message[key] for key in keys]
+        if shape.role_position is not None and type(values[shape.role_position]) is str:
+            values[shape.role_position] = sys.intern(values[shape.role_position])
+        self._shape = shape
+        self._values = tuple(values)
+        
+    @property
+    def role(self) -> Optional[str]:
+        """The message's role."""
+        position = self._shape.role_position
+        return None if position is None else self._values[position]
+        
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.positions[key]]
+        
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._shape.positions.get(key)
+        return default if position is None else self._values[position]
+        
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError("Message records are read-only; assign a new message to its index "
+                        "or use ConversationMemory.replace_message()")
+        
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.positions
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+        
+    def __len__(self) -> int:
+        return len(self._values)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the message as a new dict, including internal fields."""
+        return dict(zip(self._shape.keys, self._values))
+    
+    copy = to_dict
+    
+    def to_message(self) -> Dict[str, Any]:
+        """Get the message as a new dict without internal fields, as sent to providers."""
+        shape = self._shape
+        if shape.select_public is None:
+            return dict(zip(shape.keys, self._values))
+        return dict(zip(shape.public_keys, shape.select_public(self._values)))
+        
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if isinstance(other, Message) and other._shape is self._shape:
+            return self._values == other._values
+        return self.to_dict() == dict(other)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+        
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(),))
+
+
+def as_message(message: Mapping) -> Message:
+    """Get a message as a Message record, converting it if needed."""
+    return message if type(message) is Message else Message(message)
+
+
+def message_key(message: Mapping) -> str:
+    """
+    Get a stable key of a message's content.
+    
+    Equal messages get the same key, including copies reloaded from disk, so it
+    can check that a stored message is unchanged without holding on to it.
+    """
+    content = json.dumps(as_message(message).to_message(), sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _first_index(key: Union[int, slice], length: int) -> int:
+    """Get the lowest index a subscript refers to."""
+    if isinstance(key, slice):
+        start, stop, step = key.indices(length)
+        return start if step > 0 else stop + 1
+    return key + length if key < 0 else key
+
+
+class MessageList(list):
+    """
+    List of stored messages that keeps a token count for each message.
+    
+    Each message is counted once, when it is added or replaced, so the running
+    total is available without rescanning the history.
+    """
+    
+    def __init__(self, messages: Iterable[Dict] = (), tokenizer: Optional[Tokenizer] = None,
+                 token_counts: Optional[List[int]] = None):
+        """
+        Initialize the message list.
+        
+        Args:
+            messages: Initial messages
+            tokenizer: Tokenizer used to count messages (defaults to the heuristic tokenizer)
+            token_counts: Known counts for the initial messages, to avoid recounting
+        """
+        super().__init__(map(as_message, messages))
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        if token_counts is None:
+            token_counts = [self.tokenizer.count_message(message) for message in self]
+        self._counts = list(token_counts)
+        self.token_count = sum(self._counts)
+        # Snapshots still reading their messages from this list
+        self._snapshots: List[weakref.ref] = []
+        
+    @property
+    def token_counts(self) -> List[int]:
+        """Token count of each message (must not be modified)."""
+        return self._counts
+        
+    @property
+    def roles(self) -> List[Optional[str]]:
+        """Role of each message."""
+        return [message.role for message in self]
+        
+    def pinned_indices(self) -> List[int]:
+        """Indices of the pinned messages."""
+        return [index for index, message in enumerate(self) if message.get("pinned")]
+        
+    def snapshot(self, base: Optional["MessageSnapshot"] = None) -> "MessageSnapshot":
+        """
+        Take a read-only snapshot of the current messages without copying them.
+        
+        Args:
+            base: Snapshot of messages that come before this list's messages
+            
+        Returns:
+            The snapshot
+        """
+        snapshot = MessageSnapshot(self, len(self), base)
+        self._snapshots = [ref for ref in self._snapshots if ref() is not None]
+        self._snapshots.append(weakref.ref(snapshot))
+        return snapshot
+        
+    def _before_change(self, index: int = 0) -> None:
+        """Make snapshots covering messages from index onwards copy them before they change."""
+        if not self._snapshots:
+            return
+        index = max(index, 0)
+        remaining = []
+        for ref in self._snapshots:
+            snapshot = ref()
+            if snapshot is None:
+                continue
+            if snapshot._length > index:
+                snapshot._detach()
+            else:
+                remaining.append(ref)
+        self._snapshots = remaining
+        
+    def _recount(self) -> None:
+        self._counts = [self.tokenizer.count_message(message) for message in self]
+        self.token_count = sum(self._counts)
+        
+    def append(self, message: Dict) -> None:
+        message = as_message(message)
+        count = self.tokenizer.count_message(message)
+        super().append(message)
+        self._counts.append(count)
+        self.token_count += count
+        
+    def extend(self, messages: Iterable[Dict]) -> None:
+        for message in messages:
+            self.append(message)
+            
+    def __iadd__(self, messages: Iterable[Dict]) -> "MessageList":
+        self.extend(messages)
+        return self
+        
+    def insert(self, index: int, message: Dict) -> None:
+        self._before_change(min(_first_index(index, len(self)), len(self)))
+        message = as_message(message)
+        count = self.tokenizer.count_message(message)
+        super().insert(index, message)
+        self._counts.insert(index, count)
+        self.token_count += count
+        
+    def __setitem__(self, key, value) -> None:
+        self._before_change(_first_index(key, len(self)))
+        value = [as_message(message) for message in value] if isinstance(key, slice) else as_message(value)
+        super().__setitem__(key, value)
+        if isinstance(key, slice):
+            self._recount()
+        else:
+            count = self.tokenizer.count_message(value)
+            self.token_count += count - self._counts[key]
+            self._counts[key] = count
+            
+    def __delitem__(self, key) -> None:
+        self._before_change(_first_index(key, len(self)))
+        super().__delitem__(key)
+        if isinstance(key, slice):
+            del self._counts[key]
+            self.token_count = sum(self._counts)
+        else:
+            self.token_count -= self._counts.pop(key)
+            
+    def pop(self, index: int = -1) -> Dict:
+        self._before_change(_first_index(index, len(self)))
+        message = super().pop(index)
+        self.token_count -= self._counts.pop(index)
+        return message
+        
+    def remove(self, message: Dict) -> None:
+        del self[self.index(message)]
+        
+    def clear(self) -> None:
+        self._before_change()
+        super().clear()
+        self._counts = []
+        self.token_count = 0
+        
+    def reverse(self) -> None:
+        self._before_change()
+        super().reverse()
+        self._counts.reverse()
+        
+    def sort(self, *args, **kwargs) -> None:
+        self._before_change()
+        super().sort(*args, **kwargs)
+        self._recount()
+        
+    def __imul__(self, n: int) -> "MessageList":
+        self._before_change()
+        super().__imul__(n)
+        self._recount()
+        return self
+        
+    def __copy__(self) -> "MessageList":
+        return self.__class__(self, self.tokenizer, self._counts)
+        
+    def __deepcopy__(self, memo: Dict) -> "MessageList":
+        return self.__class__(copy.deepcopy(list(self), memo), self.tokenizer, self._counts)
+        
+    def __reduce__(self):
+        return (self.__class__, (list(self), self.tokenizer, self._counts))
+
+
+class MessageSnapshot(Sequence):
+    """
+    Read-only view of the messages a list held when the snapshot was taken.
+    
+    Taking a snapshot copies nothing: the snapshot reads from the list it was
+    taken of, which only ever grows at its end in a normal conversation. If that
+    list is changed anywhere the snapshot covers, the snapshot first copies the
+    messages it needs (copy-on-write). A snapshot can sit on top of an earlier
+    snapshot, so forks of forks share every level of their history.
+    """
+    
+    def __init__(self, source: MessageList, length: int, base: Optional["MessageSnapshot"] = None):
+        """
+        Initialize the snapshot.
+        
+        Args:
+            source: List holding the snapshot's messages
+            length: Number of leading messages of source in the snapshot
+            base: Snapshot of the messages that come before them
+        """
+        self._source: Optional[MessageList] = source
+        self._length = length
+        self._messages: Optional[List[Dict]] = None
+        self._counts: Optional[List[int]] = None
+        self._base = base
+        self._offset = len(base) if base is not None else 0
+        own_tokens = source.token_count if length == len(source) else sum(source.token_counts[:length])
+        self.token_count = own_tokens + (base.token_count if base is not None else 0)
+        
+    def _detach(self) -> None:
+        """Copy the messages still read from the source list."""
+        self._messages = self._source[:self._length]
+        self._counts = self._source.token_counts[:self._length]
+        self._source = None
+        
+    def _own_messages(self) -> List[Dict]:
+        return self._messages if self._source is None else self._source
+        
+    @property
+    def token_counts(self) -> List[int]:
+        """Token count of each message."""
+        counts = self._counts if self._source is None else self._source.token_counts[:self._length]
+        if self._base is None:
+            return list(counts)
+        return self._base.token_counts + counts
+        
+    def __len__(self) -> int:
+        return self._offset + self._length
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot index out of range")
+        if index < self._offset:
+            return self._base[index]
+        return self._own_messages()[index - self._offset]
+        
+    def __iter__(self) -> Iterator[Dict]:
+        if self._base is not None:
+            yield from self._base
+        messages = self._own_messages()
+        for index in range(self._length):
+            yield messages[index]
+            
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Sequence)) and not isinstance(other, (str, bytes)):
+            return list(self) == list(other)
+        return NotImplemented
+        
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class SharedMessageList(MutableSequence):
+    """
+    Message list that shares its leading messages with the list it was forked from.
+    
+    The shared prefix is a MessageSnapshot, so creating the list takes the same
+    time and memory however long the original history is; only messages added
+    afterwards are stored here. Changing a message inside the prefix first
+    copies the prefix into this list.
+    """
+    
+    def __init__(self, prefix: MessageSnapshot, tokenizer: Optional[Tokenizer] = None):
+        """
+        Initialize the list.
+        
+        Args:
+            prefix: Snapshot of the shared leading messages
+            tokenizer: Tokenizer used to count new messages (defaults to the heuristic tokenizer)
+        """
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self._prefix = prefix
+        self._suffix = MessageList((), self.tokenizer)
+        
+    @property
+    def prefix(self) -> MessageSnapshot:
+        """The shared leading messages."""
+        return self._prefix
+        
+    def snapshot_suffix(self) -> MessageSnapshot:
+        """Take a snapshot of the messages stored after the shared prefix."""
+        return self._suffix.snapshot()
+        
+    def snapshot(self) -> MessageSnapshot:
+        """Take a read-only snapshot of the current messages without copying them."""
+        return self._suffix.snapshot(self._prefix)
+        
+    @property
+    def token_count(self) -> int:
+        """Total tokens of all messages."""
+        return self._prefix.token_count + self._suffix.token_count
+        
+    @property
+    def token_counts(self) -> List[int]:
+        """Token count of each message."""
+        return self._prefix.token_counts + self._suffix.token_counts
+        
+    @property
+    def roles(self) -> List[Optional[str]]:
+        """Role of each message."""
+        return [message.role for message in self]
+        
+    def pinned_indices(self) -> List[int]:
+        """Indices of the pinned messages."""
+        return [index for index, message in enumerate(self) if message.get("pinned")]
+        
+    def _unshare(self) -> None:
+        """Copy the shared prefix so that it can be changed."""
+        self._suffix = MessageList(list(self), self.tokenizer, self.token_counts)
+        self._prefix = MessageList((), self.tokenizer).snapshot()
+        
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return index
+        
+    def __len__(self) -> int:
+        return len(self._prefix) + len(self._suffix)
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._index(index)
+        if index < len(self._prefix):
+            return self._prefix[index]
+        return self._suffix[index - len(self._prefix)]
+        
+    def __iter__(self) -> Iterator[Dict]:
+        yield from self._prefix
+        yield from self._suffix
+        
+    def append(self, message: Dict) -> None:
+        self._suffix.append(message)
+        
+    def __setitem__(self, index, message) -> None:
+        if isinstance(index, slice) or self._index(index) < len(self._prefix):
+            self._unshare()
+            self._suffix[index] = message
+        else:
+            self._suffix[self._index(index) - len(self._prefix)] = message
+            
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice) or self._index(index) < len(self._prefix):
+            self._unshare()
+            del self._suffix[index]
+        else:
+            del self._suffix[self._index(index) - len(self._prefix)]
+            
+    def insert(self, index: int, message: Dict) -> None:
+        index = min(max(_first_index(index, len(self)), 0), len(self))
+        if index < len(self._prefix):
+            self._unshare()
+            self._suffix.insert(index, message)
+        else:
+            self._suffix.insert(index - len(self._prefix), message)
+            
+    def clear(self) -> None:
+        self._prefix = MessageList((), self.tokenizer).snapshot()
+        self._suffix.clear()
+        
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Sequence)) and not isinstance(other, (str, bytes)):
+            return list(self) == list(other)
+        return NotImplemented
+        
+    def __copy__(self) -> MessageList:
+        return MessageList(list(self), self.tokenizer, self.token_counts)
+        
+    def __deepcopy__(self, memo: Dict) -> MessageList:
+        return MessageList(copy.deepcopy(list(self), memo), self.tokenizer, self.token_counts)
+        
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+def snapshot_messages(messages: Sequence[Dict], tokenizer: Optional[Tokenizer] = None) -> MessageSnapshot:
+    """
+    Take a snapshot of stored messages, sharing them where the list allows it.
+    
+    Lists that can't share their messages (such as disk-backed ones) are copied
+    into memory first.
+    
+    Args:
+        messages: The stored messages
+        tokenizer: Tokenizer the messages were counted with
+        
+    Returns:
+        The snapshot
+    """
+    if not isinstance(messages, (MessageList, SharedMessageList)):
+        messages = MessageList(list(messages), tokenizer, getattr(messages, "token_counts", None))
+    return messages.snapshot()
@@ -6,11 +6,12 @@ official client libraries instead of LiteLLM.
 """
 
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from abc import ABC, abstractmethod
 
-from .providers import create_provider, ProviderInterface, ProviderResponse, ToolCall
+from .providers import create_provider, ProviderInterface, ProviderResponse, ToolCall, StreamChunk, ToolManifest
 from .capabilities import get_model_capabilities, ModelCapabilities
+from .memory import resolve_image_refs
 from .utils import logger
 
 
@@ -105,6 +106,12 @@ class ModelInterface(ABC):
             return self.capabilities.supports_parallel_tools
         return self.provider.supports_parallel_tools()
         
+    def supports_streaming(self) -> bool:
+        """Check if the model supports streaming responses."""
+        if self.capabilities:
+            return self.capabilities.supports_streaming
+        return True
+        
     def get_context_window(self) -> Optional[int]:
         """Get the context window size for this model."""
         if self.capabilities:
@@ -146,12 +153,98 @@ class UnifiedModelInterface(ModelInterface):
         # Merge enable_caching with other kwargs
         provider_kwargs = kwargs.copy()
         provider_kwargs['enable_caching'] = enable_caching
+        messages = self._prepare_messages(messages)
             
         # Generate response using the provider
         response = self.provider.generate_response(messages, tools, **provider_kwargs)
         
         return response
     
+    async def agenerate_response(self, messages: List[Dict], functions: Optional[List[Dict]] = None, enable_caching: bool = False, **kwargs) -> ProviderResponse:
+        """
+        Generate a response from the model using the provider's async client.
+        
+        Args:
+            messages: List of message dictionaries
+            functions: Optional list of function definitions
+            enable_caching: Whether to enable caching (for supported models)
+            **kwargs: Additional parameters to pass to the provider
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        tools = None
+        if functions:
+            tools = self._convert_functions_to_tools(functions)
+            
+        provider_kwargs = kwargs.copy()
+        provider_kwargs['enable_caching'] = enable_caching
+        messages = self._prepare_messages(messages)
+        
+        return await self.provider.agenerate_response(messages, tools, **provider_kwargs)
+    
+    def stream_response(self, messages: List[Dict], functions: Optional[List[Dict]] = None, enable_caching: bool = False, **kwargs) -> Iterator[StreamChunk]:
+        """
+        Stream a response from the model.
+        
+        Models that don't support streaming fall back to a single complete response.
+        
+        Args:
+            messages: List of message dictionaries
+            functions: Optional list of function definitions
+            enable_caching: Whether to enable caching (for supported models)
+            **kwargs: Additional parameters to pass to the provider
+            
+        Yields:
+            StreamChunk: Text deltas, then the final ProviderResponse
+        """
+        tools = None
+        if functions:
+            tools = self._convert_functions_to_tools(functions)
+            
+        provider_kwargs = kwargs.copy()
+        provider_kwargs['enable_caching'] = enable_caching
+        messages = self._prepare_messages(messages)
+        
+        if self.supports_streaming():
+            yield from self.provider.stream_response(messages, tools, **provider_kwargs)
+        else:
+            response = self.provider.generate_response(messages, tools, **provider_kwargs)
+            yield from ProviderInterface._chunks_from_response(response)
+    
+    async def astream_response(self, messages: List[Dict], functions: Optional[List[Dict]] = None, enable_caching: bool = False, **kwargs) -> AsyncIterator[StreamChunk]:
+        """
+        Async counterpart of stream_response.
+        
+        Args:
+            messages: List of message dictionaries
+            functions: Optional list of function definitions
+            enable_caching: Whether to enable caching (for supported models)
+            **kwargs: Additional parameters to pass to the provider
+            
+        Yields:
+            StreamChunk: Text deltas, then the final ProviderResponse
+        """
+        tools = None
+        if functions:
+            tools = self._convert_functions_to_tools(functions)
+            
+        provider_kwargs = kwargs.copy()
+        provider_kwargs['enable_caching'] = enable_caching
+        messages = self._prepare_messages(messages)
+        
+        if self.supports_streaming():
+            async for chunk in self.provider.astream_response(messages, tools, **provider_kwargs):
+                yield chunk
+        else:
+            response = await self.provider.agenerate_response(messages, tools, **provider_kwargs)
+            for chunk in ProviderInterface._chunks_from_response(response):
+                yield chunk
+    
+    def _prepare_messages(self, messages: List[Dict]) -> List[Dict]:
+        """Encode referenced images for sending, within the provider's size limit."""
+        return resolve_image_refs(messages, getattr(self.provider, 'max_image_dimension', None))
+    
     def supports_caching(self) -> bool:
         """Check if the model supports caching."""
         if self.capabilities:
@@ -168,6 +261,10 @@ class UnifiedModelInterface(ModelInterface):
         Returns:
             List of tool definitions
         """
+        if isinstance(functions, ToolManifest):
+            # Already normalized; providers reuse its compiled payloads
+            return functions
+            
         tools = []
         for func in functions:
             if 'function' in func:
@@ -6,7 +6,7 @@ agent operations and tool usage.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union, TextIO, Set
+from typing import Any, Callable, Dict, List, Optional, Union, TextIO, Set
 import uuid
 import time
 import json
@@ -16,9 +16,20 @@ from collections import defaultdict
 
 # ---- Event Classes ----
 
+def _summarize(value: Any, limit: int = 100) -> str:
+    """Summarize a value as a string of at most `limit` characters plus an ellipsis."""
+    if value is None:
+        return ""
+    text = str(value)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
 class AgentEvent:
     """Base class for all agent events."""
     
+    __slots__ = ('agent_id', 'agent_name', 'context_id', 'parent_context_id', 'timestamp',
+                 'event_type', 'event_data', '__weakref__')
+    
     def __init__(self, 
                  agent_id: str, 
                  agent_name: str, 
@@ -74,6 +85,8 @@ class AgentEvent:
 class AgentInitializedEvent(AgentEvent):
     """Event fired when an agent is initialized."""
     
+    __slots__ = ('model_name', 'system_prompt', 'tools')
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str, 
                  model: Optional[str] = None, system_prompt: Optional[str] = None, tools: Optional[List[str]] = None,
                  parent_context_id: Optional[str] = None, model_name: Optional[str] = None, **kwargs):
@@ -108,6 +121,8 @@ class AgentInitializedEvent(AgentEvent):
 class UserMessageEvent(AgentEvent):
     """Event fired when a user sends a message to an agent."""
     
+    __slots__ = ('message',)
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  message: Optional[str] = None, parent_context_id: Optional[str] = None, **kwargs):
         """Initialize a user message event."""
@@ -126,6 +141,8 @@ class UserMessageEvent(AgentEvent):
 class ModelRequestEvent(AgentEvent):
     """Event fired when a request is sent to a model."""
     
+    __slots__ = ('messages', 'model', 'functions')
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  messages: Optional[List[Dict[str, Any]]] = None, model: Optional[str] = None,
                  parent_context_id: Optional[str] = None, functions: Optional[List[Dict]] = None, **kwargs):
@@ -156,6 +173,8 @@ class ModelRequestEvent(AgentEvent):
 class ModelResponseEvent(AgentEvent):
     """Event fired when a response is received from a model."""
     
+    __slots__ = ('response', 'model', '_event_data')
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  response: Optional[Any] = None, model: Optional[str] = None, 
                  parent_context_id: Optional[str] = None, **kwargs):
@@ -170,14 +189,22 @@ class ModelResponseEvent(AgentEvent):
             agent_name=agent_name,
             context_id=context_id,
             parent_context_id=parent_context_id,
-            event_data={
-                "model": model,
-                "response_summary": str(response)[:100] + "..." if response and len(str(response)) > 100 else str(response or "")
-            }
+            event_data={"model": model}
         )
         self.response = response
         self.model = model
         
+    @property
+    def event_data(self) -> Dict[str, Any]:
+        """Event data, with the response summary computed on first access."""
+        if "response_summary" not in self._event_data:
+            self._event_data["response_summary"] = _summarize(self.response)
+        return self._event_data
+        
+    @event_data.setter
+    def event_data(self, value: Dict[str, Any]) -> None:
+        self._event_data = value
+        
     # Override to_dict for backward compatibility
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary representation."""
@@ -210,6 +237,8 @@ class ModelResponseEvent(AgentEvent):
 class FunctionCallEvent(AgentEvent):
     """Event fired when a function is called."""
     
+    __slots__ = ('function_name', 'function_args', 'function_call_id')
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  function_name: Optional[str] = None, function_args: Optional[Dict[str, Any]] = None, 
                  function_call_id: Optional[str] = None,
@@ -238,21 +267,25 @@ class FunctionCallEvent(AgentEvent):
 class FunctionResultEvent(AgentEvent):
     """Event fired when a function call returns a result."""
     
+    __slots__ = ('function_name', 'result', 'function_call_id', 'error', 'error_type', 'function_args',
+                 '_event_data')
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  function_name: Optional[str] = None, result: Optional[Any] = None, 
                  function_call_id: Optional[str] = None, function_args: Optional[Dict[str, Any]] = None,
-                 error: Optional[str] = None, parent_context_id: Optional[str] = None, **kwargs):
+                 error: Optional[str] = None, parent_context_id: Optional[str] = None,
+                 error_type: Optional[str] = None, **kwargs):
         """Initialize a function result event."""
         function_name = function_name or kwargs.get('function_name', '')
         result = result or kwargs.get('result')
         function_call_id = function_call_id or kwargs.get('function_call_id', str(uuid.uuid4()))
         error = error or kwargs.get('error')
         
-        # Don't include full result in event_data to avoid serialization issues
+        # Don't include full result in event_data to avoid serialization issues;
+        # the result summary is added on first access
         event_data = {
             "function_name": function_name,
-            "function_call_id": function_call_id,
-            "result_summary": str(result)[:100] + "..." if result is not None and len(str(result)) > 100 else str(result or "")
+            "function_call_id": function_call_id
         }
         
         # For backward compatibility
@@ -261,6 +294,9 @@ class FunctionResultEvent(AgentEvent):
         
         if error:
             event_data["error"] = error
+        if error_type:
+            # Class of the error, such as "ToolTimeoutError"
+            event_data["error_type"] = error_type
             
         super().__init__(
             agent_id=agent_id,
@@ -273,8 +309,20 @@ class FunctionResultEvent(AgentEvent):
         self.result = result
         self.function_call_id = function_call_id
         self.error = error
+        self.error_type = error_type
         self.function_args = function_args or kwargs.get('function_args', {})  # For backward compatibility
         
+    @property
+    def event_data(self) -> Dict[str, Any]:
+        """Event data, with the result summary computed on first access."""
+        if "result_summary" not in self._event_data:
+            self._event_data["result_summary"] = _summarize(self.result if self.result is not None else "")
+        return self._event_data
+        
+    @event_data.setter
+    def event_data(self, value: Dict[str, Any]) -> None:
+        self._event_data = value
+        
     # Override to_dict for backward compatibility
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary representation."""
@@ -305,6 +353,8 @@ class FunctionResultEvent(AgentEvent):
 class AgentResponseEvent(AgentEvent):
     """Event fired when an agent generates a response."""
     
+    __slots__ = ('response',)
+    
     def __init__(self, agent_id: str, agent_name: str, context_id: str,
                  response: Optional[str] = None, parent_context_id: Optional[str] = None, **kwargs):
         """Initialize an agent response event."""
@@ -320,6 +370,32 @@ class AgentResponseEvent(AgentEvent):
         self.response = response
 
 
+class ConversationSummarizedEvent(AgentEvent):
+    """Event fired when older turns of a conversation have been replaced by a summary."""
+    
+    __slots__ = ('summary', 'summarized_messages')
+    
+    def __init__(self, agent_id: str, agent_name: str, context_id: str,
+                 summary: Optional[str] = None, summarized_messages: int = 0,
+                 summary_tokens: int = 0, summarized_tokens: int = 0,
+                 parent_context_id: Optional[str] = None, **kwargs):
+        """Initialize a conversation summarized event."""
+        super().__init__(
+            agent_id=agent_id,
+            agent_name=agent_name,
+            context_id=context_id,
+            parent_context_id=parent_context_id,
+            event_data={
+                "summary": summary or "",
+                "summarized_messages": summarized_messages,
+                "summary_tokens": summary_tokens,
+                "summarized_tokens": summarized_tokens
+            }
+        )
+        self.summary = summary or ""
+        self.summarized_messages = summarized_messages
+
+
 # ---- Observer Interface ----
 
 class AgentObserver(ABC):
@@ -327,8 +403,14 @@ class AgentObserver(ABC):
     Observer interface for LiteAgent events.
     
     Implement this interface to receive events from LiteAgent instances.
+    
+    Set `subscribed_events` to a tuple of event classes to receive only those
+    events; agents skip building events that no observer subscribes to.
     """
     
+    # Event classes this observer handles (None means all events)
+    subscribed_events: Optional[tuple] = None
+    
     @abstractmethod
     def on_event(self, event: AgentEvent) -> None:
         """
@@ -368,6 +450,40 @@ class AgentObserver(ABC):
         self.on_event(event)
 
 
+# Handler method called for each event type (subclasses resolve through their MRO)
+EVENT_HANDLERS = {
+    AgentInitializedEvent: 'on_agent_initialized',
+    UserMessageEvent: 'on_user_message',
+    ModelRequestEvent: 'on_model_request',
+    ModelResponseEvent: 'on_model_response',
+    FunctionCallEvent: 'on_function_call',
+    FunctionResultEvent: 'on_function_result',
+    AgentResponseEvent: 'on_agent_response',
+}
+
+
+def resolve_event_handler(observer: AgentObserver, event_cls: type) -> Optional[Callable[[AgentEvent], None]]:
+    """
+    Find the observer method that handles events of the given class.
+    
+    Args:
+        observer: The observer receiving events
+        event_cls: The event class
+        
+    Returns:
+        The bound handler method, or None if the observer doesn't subscribe to the event
+    """
+    subscribed = getattr(observer, 'subscribed_events', None)
+    if isinstance(subscribed, (tuple, list, set, frozenset)) and not issubclass(event_cls, tuple(subscribed)):
+        return None
+        
+    for cls in event_cls.__mro__:
+        method_name = EVENT_HANDLERS.get(cls)
+        if method_name:
+            return getattr(observer, method_name)
+    return observer.on_event
+
+
 # ---- Unified Observer Implementation ----
 
 class UnifiedObserver(AgentObserver):
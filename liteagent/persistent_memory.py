@@ -0,0 +1,464 @@
+"""
+Disk-backed conversation memory for LiteAgent.
+
+PersistentConversationMemory stores every message in SQLite as it is added and
+keeps only a small window of recently used messages in RAM, along with
+per-message metadata (role, token count, pin) needed for context windowing.
+Older messages are loaded on demand. Sessions survive restarts and can be
+resumed by ID without replaying the conversation. Images attached to messages
+are kept in a BlobStore directory next to the database, so resumed sessions can
+still send them.
+"""
+
+import copy
+import json
+import sqlite3
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .blob_store import BlobStore
+from .memory import ConversationMemory, ConversationSummary
+from .messages import Message, MessageList, as_message
+from .tokenization import DEFAULT_TOKENIZER, Tokenizer
+
+
+class SQLiteMessageStore:
+    """
+    SQLite database holding the messages of many conversation sessions.
+
+    One store (and connection) can be shared by any number of memories; access
+    is serialized with a lock, so it can be used from several threads.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a message store.
+
+        Args:
+            path: Path of the SQLite database file (":memory:" for a temporary store)
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, tokenizer TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "session_id TEXT NOT NULL, idx INTEGER NOT NULL, role TEXT, "
+                "tokens INTEGER NOT NULL, pinned INTEGER NOT NULL, data TEXT NOT NULL, "
+                "PRIMARY KEY (session_id, idx))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "session_id TEXT PRIMARY KEY, content TEXT NOT NULL, "
+                "covered INTEGER NOT NULL, last_key TEXT NOT NULL)"
+            )
+
+    def sessions(self) -> List[str]:
+        """Get the IDs of all stored sessions."""
+        with self._lock:
+            rows = self._connection.execute("SELECT session_id FROM sessions ORDER BY session_id").fetchall()
+        return [row[0] for row in rows]
+
+    def delete_session(self, session_id: str) -> None:
+        """
+        Delete a session and all its messages.
+
+        Args:
+            session_id: ID of the session
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            connection.execute("DELETE FROM summaries WHERE session_id = ?", (session_id,))
+            connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def load_summary(self, session_id: str) -> Optional[tuple]:
+        """
+        Get the stored summary of a session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The summary's (content, covered, last_key), or None if it has none
+        """
+        rows = self._execute("SELECT content, covered, last_key FROM summaries WHERE session_id = ?", (session_id,))
+        return rows[0] if rows else None
+
+    def save_summary(self, session_id: str, summary: Optional[ConversationSummary]) -> None:
+        """
+        Store the summary of a session, replacing any previous one.
+
+        Args:
+            session_id: ID of the session
+            summary: The summary, or None to delete it
+        """
+        if summary is None:
+            self._execute("DELETE FROM summaries WHERE session_id = ?", (session_id,))
+        else:
+            self._execute("INSERT OR REPLACE INTO summaries (session_id, content, covered, last_key) "
+                          "VALUES (?, ?, ?, ?)", (session_id, summary.content, summary.covered, summary.last_key))
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements atomically, holding the store's lock."""
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _execute(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, tuple(params)).fetchall()
+
+
+def _encode(message: Message) -> str:
+    return json.dumps(message.to_dict(), default=str)
+
+
+def _decode(data: str) -> Message:
+    return Message(json.loads(data))
+
+
+class SQLiteMessageList(MutableSequence):
+    """
+    Message sequence of one session stored in a SQLiteMessageStore.
+
+    Supports the list operations ConversationMemory uses. Appends and single
+    message replacements write one row; other structural changes rewrite the
+    session. Up to ``resident_messages`` recently used messages are kept in RAM.
+    """
+
+    def __init__(self, store: SQLiteMessageStore, session_id: str, tokenizer: Optional[Tokenizer] = None,
+                 resident_messages: int = 64):
+        """
+        Open the messages of a session.
+
+        Args:
+            store: The message store
+            session_id: ID of the session (created if it does not exist)
+            tokenizer: Tokenizer used to count messages
+            resident_messages: Number of recently used messages kept in RAM
+        """
+        self.store = store
+        self.session_id = session_id
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self.resident_messages = resident_messages
+        self._resident: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # Guards _resident: summarizers read the messages from a background thread
+        self._resident_lock = threading.Lock()
+
+        rows = store._execute("SELECT tokenizer FROM sessions WHERE session_id = ?", (session_id,))
+        if not rows:
+            store._execute("INSERT INTO sessions (session_id, tokenizer) VALUES (?, ?)",
+                           (session_id, self.tokenizer.name))
+        self._load_metadata()
+        if rows and rows[0][0] != self.tokenizer.name:
+            self.set_tokenizer(self.tokenizer)
+
+    def _load_metadata(self) -> None:
+        rows = self.store._execute(
+            "SELECT role, tokens, pinned FROM messages WHERE session_id = ? ORDER BY idx", (self.session_id,))
+        self._roles = [sys.intern(role) if role is not None else None for role, _, _ in rows]
+        self._counts = [tokens for _, tokens, _ in rows]
+        self._pinned = {index for index, (_, _, pinned) in enumerate(rows) if pinned}
+        self.token_count = sum(self._counts)
+
+    @property
+    def token_counts(self) -> List[int]:
+        """Token count of each message (must not be modified)."""
+        return self._counts
+
+    @property
+    def roles(self) -> List[Optional[str]]:
+        """Role of each message."""
+        return self._roles
+
+    def pinned_indices(self) -> List[int]:
+        """Indices of the pinned messages."""
+        return sorted(self._pinned)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return index
+
+    def _remember(self, index: int, message: Dict[str, Any]) -> None:
+        with self._resident_lock:
+            self._resident[index] = message
+            self._resident.move_to_end(index)
+            while len(self._resident) > self.resident_messages:
+                self._resident.popitem(last=False)
+
+    def _read_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Read messages start to stop - 1 in one query, leaving the resident set as it is."""
+        rows = self.store._execute(
+            "SELECT idx, data FROM messages WHERE session_id = ? AND idx >= ? AND idx < ? ORDER BY idx",
+            (self.session_id, start, stop))
+        # Resident messages keep their identity
+        with self._resident_lock:
+            resident = [self._resident.get(index) for index, _ in rows]
+        return [message if message is not None else _decode(data)
+                for message, (_, data) in zip(resident, rows)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return [self[i] for i in range(start, stop, step)]
+            return self._read_range(start, stop)[::step] if start < stop else []
+        index = self._index(index)
+        with self._resident_lock:
+            message = self._resident.get(index)
+        if message is None:
+            rows = self.store._execute("SELECT data FROM messages WHERE session_id = ? AND idx = ?",
+                                       (self.session_id, index))
+            message = _decode(rows[0][0])
+        self._remember(index, message)
+        return message
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # One query for the whole session
+        return iter(self._read_range(0, len(self)))
+
+    def __reversed__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def _write(self, index: int, message: Dict[str, Any], count: int) -> None:
+        self.store._execute(
+            "INSERT OR REPLACE INTO messages (session_id, idx, role, tokens, pinned, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.session_id, index, message.get("role"), count, int(bool(message.get("pinned"))),
+             _encode(message)))
+
+    def _set_metadata(self, index: int, message: Dict[str, Any], count: int) -> None:
+        role = message.get("role")
+        self._roles[index] = sys.intern(role) if role is not None else None
+        self.token_count += count - self._counts[index]
+        self._counts[index] = count
+        if message.get("pinned"):
+            self._pinned.add(index)
+        else:
+            self._pinned.discard(index)
+
+    def append(self, message: Dict[str, Any]) -> None:
+        message = as_message(message)
+        count = self.tokenizer.count_message(message)
+        index = len(self)
+        self._write(index, message, count)
+        self._roles.append(None)
+        self._counts.append(0)
+        self._set_metadata(index, message, count)
+        self._remember(index, message)
+
+    def __setitem__(self, index, message) -> None:
+        if isinstance(index, slice):
+            messages = list(self)
+            messages[index] = message
+            self.replace(messages)
+            return
+        index = self._index(index)
+        message = as_message(message)
+        count = self.tokenizer.count_message(message)
+        self._write(index, message, count)
+        self._set_metadata(index, message, count)
+        self._remember(index, message)
+
+    def __delitem__(self, index) -> None:
+        if not isinstance(index, slice) and self._index(index) == len(self) - 1:
+            # Removing the last message only needs one row deleted
+            index = len(self) - 1
+            self.store._execute("DELETE FROM messages WHERE session_id = ? AND idx = ?",
+                                (self.session_id, index))
+            self.token_count -= self._counts.pop()
+            self._roles.pop()
+            self._pinned.discard(index)
+            with self._resident_lock:
+                self._resident.pop(index, None)
+            return
+        messages = list(self)
+        del messages[index]
+        self.replace(messages)
+
+    def insert(self, index: int, message: Dict[str, Any]) -> None:
+        messages = list(self)
+        messages.insert(index, message)
+        self.replace(messages)
+
+    def clear(self) -> None:
+        self.replace([])
+
+    def replace(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replace all messages of the session.
+
+        Args:
+            messages: The new messages
+        """
+        messages = [as_message(message) for message in messages]
+        counts = [self.tokenizer.count_message(message) for message in messages]
+        rows = [(self.session_id, index, message.get("role"), count, int(bool(message.get("pinned"))),
+                 _encode(message))
+                for index, (message, count) in enumerate(zip(messages, counts))]
+        with self.store.transaction() as connection:
+            connection.execute("DELETE FROM messages WHERE session_id = ?", (self.session_id,))
+            connection.executemany(
+                "INSERT INTO messages (session_id, idx, role, tokens, pinned, data) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+            connection.execute("UPDATE sessions SET tokenizer = ? WHERE session_id = ?",
+                               (self.tokenizer.name, self.session_id))
+        self._load_metadata()
+        with self._resident_lock:
+            self._resident.clear()
+        for index in range(max(0, len(messages) - self.resident_messages), len(messages)):
+            self._remember(index, messages[index])
+
+    def set_tokenizer(self, tokenizer: Tokenizer) -> None:
+        """
+        Change the tokenizer and recount the stored messages.
+
+        Args:
+            tokenizer: The new tokenizer
+        """
+        self.tokenizer = tokenizer
+        self.replace(list(self))
+
+    def release(self) -> None:
+        """Drop all messages held in RAM; they are reloaded from disk when needed."""
+        with self._resident_lock:
+            self._resident.clear()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, SQLiteMessageList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __copy__(self) -> MessageList:
+        return MessageList(list(self), self.tokenizer, self._counts)
+
+    def __deepcopy__(self, memo: Dict) -> MessageList:
+        # Copies (e.g. for forks) are ordinary in-memory message lists
+        return MessageList(copy.deepcopy(list(self), memo), self.tokenizer, self._counts)
+
+    def __repr__(self) -> str:
+        return f"SQLiteMessageList(session_id={self.session_id!r}, messages={len(self)})"
+
+
+class PersistentConversationMemory(ConversationMemory):
+    """
+    Conversation memory stored in SQLite, with lazily loaded history.
+
+    A drop-in replacement for ConversationMemory. Only recently used messages and
+    per-message metadata are kept in RAM; older messages are read from disk when
+    a request needs them.
+
+    Example:
+        store = SQLiteMessageStore("sessions.db")
+        agent.memory = PersistentConversationMemory(agent.system_prompt, store, session_id="user-42")
+    """
+
+    def __init__(self, system_prompt: str, store: Union[SQLiteMessageStore, str],
+                 session_id: Optional[str] = None, tokenizer: Optional[Tokenizer] = None,
+                 resident_messages: int = 64, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize the memory, resuming the session if it already has messages.
+
+        Args:
+            system_prompt: The system prompt to use for a new session
+            store: A SQLiteMessageStore, or the path of its database file
+            session_id: ID of the session to open or create. A new ID is generated if None.
+            tokenizer: Tokenizer used to count messages (defaults to a character heuristic)
+            resident_messages: Number of recently used messages kept in RAM
+            blob_store: Store for the session's images. Must keep them on disk unless
+                the database is temporary; defaults to a "<database>.blobs" directory.
+
+        Raises:
+            ValueError: If blob_store keeps images in memory for an on-disk database
+        """
+        if tokenizer is not None:
+            self.tokenizer = tokenizer
+        if isinstance(store, str):
+            store = SQLiteMessageStore(store)
+        self.store = store
+        if store.path != ":memory:":
+            if blob_store is None:
+                blob_store = BlobStore(root=f"{store.path}.blobs")
+            elif blob_store.root is None:
+                raise ValueError("Persistent memories need a BlobStore that keeps images on disk")
+        self.blob_store = blob_store
+        self.session_id = session_id or uuid.uuid4().hex
+        self.system_prompt = system_prompt
+        self.function_calls = {}
+        self.last_function_call = None
+        self._conversion_cache = {}
+        self._messages = SQLiteMessageList(store, self.session_id, self.tokenizer, resident_messages)
+        if not len(self._messages):
+            self._messages.append({"role": "system", "content": system_prompt})
+        self._summary = None
+        stored = store.load_summary(self.session_id)
+        if stored is not None and 0 < stored[1] <= len(self._messages):
+            # Token counts depend on the tokenizer, so they are recomputed rather than stored
+            self._summary = self._make_summary(*stored)
+
+    @property
+    def summary(self) -> Optional[ConversationSummary]:
+        """Running summary of the oldest messages, stored with the session."""
+        return self._summary
+
+    @summary.setter
+    def summary(self, summary: Optional[ConversationSummary]) -> None:
+        self.store.save_summary(self.session_id, summary)
+        self._summary = summary
+
+    @property
+    def messages(self) -> SQLiteMessageList:
+        """The stored messages, loaded from disk on demand."""
+        return self._messages
+
+    @messages.setter
+    def messages(self, messages: List[Dict]) -> None:
+        self._messages.replace(messages)
+
+    def set_tokenizer(self, tokenizer: Tokenizer) -> None:
+        """
+        Change the tokenizer and recount the stored messages.
+
+        Args:
+            tokenizer: The new tokenizer
+        """
+        self.tokenizer = tokenizer
+        self._messages.set_tokenizer(tokenizer)
+        if self._summary is not None and self._summary.covered <= len(self._messages):
+            summary = self._summary
+            self._summary = self._make_summary(summary.content, summary.covered, summary.last_key)
+
+    def release(self) -> None:
+        """Free the RAM held by an idle session; messages are reloaded on the next request."""
+        self._messages.release()
+        self._conversion_cache = {}
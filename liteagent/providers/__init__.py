@@ -4,7 +4,7 @@ Provider system for LiteAgent.
 This module provides a unified interface for different LLM providers using their official client libraries.
 """
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator, ToolManifest
 from .factory import ProviderFactory, create_provider
 
 # Provider classes are imported lazily via the factory to avoid dependency issues
@@ -13,6 +13,9 @@ __all__ = [
     'ProviderInterface',
     'ProviderResponse', 
     'ToolCall',
+    'StreamChunk',
+    'StreamAccumulator',
+    'ToolManifest',
     'ProviderFactory',
     'create_provider',
 ]
\ No newline at end of file
@@ -6,21 +6,26 @@ This provider uses the official Anthropic Python client library.
 
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 try:
-    from anthropic import Anthropic
+    from anthropic import Anthropic, AsyncAnthropic
     from anthropic.types import Message, ContentBlock, TextBlock, ToolUseBlock
 except ImportError:
     raise ImportError("Anthropic library not installed. Install with: pip install anthropic")
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator
+from ..memory import MessageHistory
 from ..utils import logger
 
 
 class AnthropicProvider(ProviderInterface):
     """Anthropic provider using the official Anthropic client library."""
     
+    tool_wire_format = "anthropic"
+    # Anthropic resizes anything larger server-side
+    max_image_dimension = 1568
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
         """
         Initialize Anthropic provider.
@@ -49,6 +54,18 @@ class AnthropicProvider(ProviderInterface):
             timeout=self.timeout,
             default_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
         )
+        self._async_client = None
+        
+    def _get_async_client(self) -> AsyncAnthropic:
+        """Get the AsyncAnthropic client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncAnthropic(
+                api_key=self.api_key or os.getenv('ANTHROPIC_API_KEY'),
+                max_retries=self.max_retries,
+                timeout=self.timeout,
+                default_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
+            )
+        return self._async_client
         
     def generate_response(
         self, 
@@ -70,6 +87,56 @@ class AnthropicProvider(ProviderInterface):
         start_time = time.time()
         self._log_request(messages, tools)
         
+        request_params = self._prepare_request(messages, tools, **kwargs)
+            
+        # Make the API call
+        response: Message = self.client.messages.create(**request_params)
+        
+        # Convert to standardized format
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+            
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response using the AsyncAnthropic client.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        response: Message = await self._get_async_client().messages.create(**request_params)
+        
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    def _prepare_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the messages API request parameters."""
         # DEBUG: Log incoming messages
         logger.info(f"[{self.provider_name}] DEBUG: Incoming messages count: {len(messages)}")
         if messages:
@@ -115,7 +182,7 @@ class AnthropicProvider(ProviderInterface):
             
         # Add tools if provided and model supports them
         if tools and self.supports_tool_calling():
-            request_params['tools'] = self._convert_tools(tools)
+            request_params['tools'] = self._compile_tools(tools)
         
         # Add caching support if enabled and model supports it
         if kwargs.get('enable_caching', False) and self.supports_caching():
@@ -132,139 +199,247 @@ class AnthropicProvider(ProviderInterface):
                 ]
             
             # Mark long messages for caching
-            for message in request_params['messages']:
-                if isinstance(message.get('content'), str) and len(message['content']) > 1000:
-                    message['content'] = [
-                        {
-                            "type": "text", 
-                            "text": message['content'],
-                            "cache_control": {"type": "ephemeral"}
-                        }
-                    ]
-                elif isinstance(message.get('content'), list):
-                    # For multimodal content, mark text parts for caching if long enough
-                    for content_item in message['content']:
-                        if (content_item.get('type') == 'text' and 
-                            len(content_item.get('text', '')) > 1000):
-                            content_item['cache_control'] = {"type": "ephemeral"}
+            request_params['messages'] = [self._mark_for_caching(message) for message in request_params['messages']]
             
-        # Make the API call
-        response: Message = self.client.messages.create(**request_params)
+        return request_params
         
-        # Convert to standardized format
-        provider_response = self._convert_response(response)
+    def _mark_for_caching(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the message with long text parts marked for prompt caching.
         
-        elapsed_time = time.time() - start_time
-        self._log_response(provider_response, elapsed_time)
+        Converted messages may be shared with the conversion cache, so marked
+        messages are copied rather than modified in place.
+        """
+        content = message.get('content')
+        if isinstance(content, str) and len(content) > 1000:
+            return {
+                **message,
+                'content': [
+                    {
+                        "type": "text", 
+                        "text": content,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ]
+            }
+        elif isinstance(content, list):
+            # For multimodal content, mark text parts for caching if long enough
+            marked = [
+                {**item, 'cache_control': {"type": "ephemeral"}}
+                if item.get('type') == 'text' and len(item.get('text', '')) > 1000 else item
+                for item in content
+            ]
+            return {**message, 'content': marked}
+        return message
         
-        return provider_response
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response using Anthropic's messages API.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
             
-    def _convert_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Convert messages to Anthropic format."""
-        anthropic_messages = []
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        for event in self.client.messages.create(stream=True, **request_params):
+            delta = self._accumulate_event(accumulator, event)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a response using the AsyncAnthropic client.
         
-        for msg in messages:
-            role = msg['role']
-            content = msg['content']
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
             
-            # Handle function/tool result messages for Anthropic  
-            if role in ['function', 'tool']:
-                # Convert tool result to Anthropic format
-                tool_call_id = msg.get('tool_call_id', msg.get('name', ''))
-                anthropic_messages.append({
-                    'role': 'user',
-                    'content': [
-                        {
-                            'type': 'tool_result',
-                            'tool_use_id': tool_call_id,
-                            'content': str(content)
-                        }
-                    ]
-                })
-                continue
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        async for event in await self._get_async_client().messages.create(stream=True, **request_params):
+            delta = self._accumulate_event(accumulator, event)
+            if delta:
+                yield StreamChunk(delta=delta)
                 
-            # Convert assistant messages with tool calls
-            if role == 'assistant' and 'tool_calls' in msg:
-                # Create content blocks for text and tool uses
-                content_blocks = []
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    def _accumulate_event(self, accumulator: StreamAccumulator, event) -> str:
+        """Merge one streamed message event into the accumulator and return its text delta."""
+        accumulator.raw_response = event
+        
+        if event.type == 'message_start':
+            accumulator.model = event.message.model
+            usage = event.message.usage
+            accumulator.usage = {
+                'prompt_tokens': usage.input_tokens,
+                'completion_tokens': usage.output_tokens,
+                'total_tokens': usage.input_tokens + usage.output_tokens,
+                'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0),
+                'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0),
+            }
+        elif event.type == 'content_block_start':
+            block = event.content_block
+            if block.type == 'tool_use':
+                accumulator.add_tool_call_delta(event.index, id=block.id, name=block.name)
+            elif block.type == 'text':
+                return accumulator.add_text(block.text)
+        elif event.type == 'content_block_delta':
+            if event.delta.type == 'text_delta':
+                return accumulator.add_text(event.delta.text)
+            elif event.delta.type == 'input_json_delta':
+                accumulator.add_tool_call_delta(event.index, arguments=event.delta.partial_json)
+        elif event.type == 'message_delta':
+            accumulator.finish_reason = event.delta.stop_reason
+            if event.usage and accumulator.usage:
+                accumulator.usage['completion_tokens'] = event.usage.output_tokens
+                accumulator.usage['total_tokens'] = accumulator.usage['prompt_tokens'] + event.usage.output_tokens
                 
-                if content:
-                    content_blocks.append({'type': 'text', 'text': content})
-                    
-                for tool_call in msg['tool_calls']:
-                    # Ensure arguments are a dictionary for Anthropic API
-                    arguments = tool_call['function']['arguments']
-                    if isinstance(arguments, str):
-                        try:
-                            import json
-                            arguments = json.loads(arguments)
-                        except json.JSONDecodeError as e:
-                            raise ValueError(f"Failed to parse tool arguments as JSON: {arguments}") from e
-                    elif not isinstance(arguments, dict):
-                        arguments = {}
-                        
-                    content_blocks.append({
-                        'type': 'tool_use',
-                        'id': tool_call['id'],
-                        'name': tool_call['function']['name'],
-                        'input': arguments
-                    })
+        return ""
+            
+    def _convert_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert messages to Anthropic format.
+        
+        Messages that came from ConversationMemory are converted once and reused on
+        later requests, so each turn only converts the new tail of the conversation.
+        """
+        if isinstance(messages, MessageHistory):
+            return messages.converted(self.provider_name, self._convert_message)
+        return [self._convert_message(msg) for msg in messages]
+        
+    def _convert_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single message to Anthropic format."""
+        role = msg['role']
+        content = msg['content']
+        
+        # Handle function/tool result messages for Anthropic  
+        if role in ['function', 'tool']:
+            # Convert tool result to Anthropic format
+            tool_call_id = msg.get('tool_call_id', msg.get('name', ''))
+            return {
+                'role': 'user',
+                'content': [
+                    {
+                        'type': 'tool_result',
+                        'tool_use_id': tool_call_id,
+                        'content': str(content)
+                    }
+                ]
+            }
+            
+        # Convert assistant messages with tool calls
+        if role == 'assistant' and 'tool_calls' in msg:
+            # Create content blocks for text and tool uses
+            content_blocks = []
+            
+            if content:
+                content_blocks.append({'type': 'text', 'text': content})
+                
+            for tool_call in msg['tool_calls']:
+                # Ensure arguments are a dictionary for Anthropic API
+                arguments = tool_call['function']['arguments']
+                if isinstance(arguments, str):
+                    try:
+                        import json
+                        arguments = json.loads(arguments)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Failed to parse tool arguments as JSON: {arguments}") from e
+                elif not isinstance(arguments, dict):
+                    arguments = {}
                     
-                anthropic_messages.append({
-                    'role': 'assistant',
-                    'content': content_blocks
+                content_blocks.append({
+                    'type': 'tool_use',
+                    'id': tool_call['id'],
+                    'name': tool_call['function']['name'],
+                    'input': arguments
                 })
-            else:
-                # Handle multimodal content (text + images)
-                if isinstance(content, list):
-                    # Already in multimodal format - convert for Anthropic
-                    anthropic_content = []
-                    for item in content:
-                        if item['type'] == 'text':
+                
+            return {
+                'role': 'assistant',
+                'content': content_blocks
+            }
+        else:
+            # Handle multimodal content (text + images)
+            if isinstance(content, list):
+                # Already in multimodal format - convert for Anthropic
+                anthropic_content = []
+                for item in content:
+                    if item['type'] == 'text':
+                        anthropic_content.append({
+                            'type': 'text',
+                            'text': item['text']
+                        })
+                    elif item['type'] == 'image_url':
+                        # Convert OpenAI image format to Anthropic format
+                        image_url = item['image_url']['url']
+                        if image_url.startswith('data:'):
+                            # Base64 encoded image
+                            # Extract media type and data
+                            parts = image_url.split(',', 1)
+                            if len(parts) == 2:
+                                header = parts[0]  # data:image/jpeg;base64
+                                data = parts[1]
+                                # Extract media type
+                                media_type = header.split(';')[0].replace('data:', '')
+                                anthropic_content.append({
+                                    'type': 'image',
+                                    'source': {
+                                        'type': 'base64',
+                                        'media_type': media_type,
+                                        'data': data
+                                    }
+                                })
+                        else:
+                            # External URL - Anthropic doesn't support external URLs directly
+                            # Add a text description instead
                             anthropic_content.append({
                                 'type': 'text',
-                                'text': item['text']
+                                'text': f'[Image URL provided: {image_url}]'
                             })
-                        elif item['type'] == 'image_url':
-                            # Convert OpenAI image format to Anthropic format
-                            image_url = item['image_url']['url']
-                            if image_url.startswith('data:'):
-                                # Base64 encoded image
-                                # Extract media type and data
-                                parts = image_url.split(',', 1)
-                                if len(parts) == 2:
-                                    header = parts[0]  # data:image/jpeg;base64
-                                    data = parts[1]
-                                    # Extract media type
-                                    media_type = header.split(';')[0].replace('data:', '')
-                                    anthropic_content.append({
-                                        'type': 'image',
-                                        'source': {
-                                            'type': 'base64',
-                                            'media_type': media_type,
-                                            'data': data
-                                        }
-                                    })
-                            else:
-                                # External URL - Anthropic doesn't support external URLs directly
-                                # Add a text description instead
-                                anthropic_content.append({
-                                    'type': 'text',
-                                    'text': f'[Image URL provided: {image_url}]'
-                                })
-                    
-                    anthropic_messages.append({
-                        'role': role,
-                        'content': anthropic_content
-                    })
-                else:
-                    # Simple text content
-                    anthropic_messages.append({
-                        'role': role,
-                        'content': content
-                    })
                 
-        return anthropic_messages
+                return {
+                    'role': role,
+                    'content': anthropic_content
+                }
+            else:
+                # Simple text content
+                return {
+                    'role': role,
+                    'content': content
+                }
         
     def _convert_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert tool definitions to Anthropic format."""
@@ -4,9 +4,12 @@ Base provider interface for LiteAgent.
 This module defines the abstract interface that all LLM providers must implement.
 """
 
+import asyncio
+import functools
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 import time
 
 from ..utils import logger
@@ -32,9 +35,163 @@ class ProviderResponse:
     finish_reason: Optional[str] = None
 
 
+@dataclass
+class StreamChunk:
+    """
+    One piece of a streamed response.
+    
+    Intermediate chunks carry a text delta. The last chunk of a stream carries the
+    complete ProviderResponse (content, assembled tool calls and usage).
+    """
+    delta: str = ""
+    response: Optional[ProviderResponse] = None
+
+
+class StreamAccumulator:
+    """Builds a ProviderResponse incrementally from streamed deltas."""
+    
+    def __init__(self, model: str, provider: str):
+        """
+        Initialize the accumulator.
+        
+        Args:
+            model: Model name reported in the final response
+            provider: Provider name reported in the final response
+        """
+        self.model = model
+        self.provider = provider
+        self.usage: Optional[Dict[str, Any]] = None
+        self.finish_reason: Optional[str] = None
+        self.raw_response: Any = None
+        self._content_parts: List[str] = []
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        
+    def add_text(self, text: Optional[str]) -> str:
+        """Append a text delta and return it (empty string for None)."""
+        if not text:
+            return ""
+        self._content_parts.append(text)
+        return text
+        
+    @property
+    def tool_call_count(self) -> int:
+        """Number of distinct tool calls seen so far."""
+        return len(self._tool_calls)
+        
+    def add_tool_call_delta(self, index: int, id: Optional[str] = None, name: Optional[str] = None,
+                            arguments: Any = None) -> None:
+        """
+        Merge a tool call delta into the call at the given index.
+        
+        Args:
+            index: Position of the tool call in the response
+            id: Tool call ID (usually only sent on the first delta)
+            name: Tool name (usually only sent on the first delta)
+            arguments: A JSON string fragment, or a complete arguments dict
+        """
+        call = self._tool_calls.setdefault(index, {'id': None, 'name': '', 'arguments': []})
+        if id:
+            call['id'] = id
+        if name:
+            call['name'] += name
+        if isinstance(arguments, dict):
+            call['arguments'] = arguments
+        elif arguments:
+            call['arguments'].append(arguments)
+            
+    def build(self) -> ProviderResponse:
+        """Build the final ProviderResponse from everything received so far."""
+        tool_calls = []
+        for index in sorted(self._tool_calls):
+            call = self._tool_calls[index]
+            arguments = call['arguments']
+            if isinstance(arguments, list):
+                arguments_str = ''.join(arguments)
+                try:
+                    arguments = json.loads(arguments_str) if arguments_str else {}
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Failed to parse tool arguments as JSON: {arguments_str}") from e
+            tool_calls.append(ToolCall(
+                id=call['id'] or f"{self.provider}_tool_{index}",
+                name=call['name'],
+                arguments=arguments
+            ))
+            
+        content = ''.join(self._content_parts)
+        return ProviderResponse(
+            content=content if content else None,
+            tool_calls=tool_calls,
+            usage=self.usage,
+            model=self.model,
+            provider=self.provider,
+            raw_response=self.raw_response,
+            finish_reason=self.finish_reason
+        )
+
+
+class ToolManifest(list):
+    """
+    Snapshot of an agent's tool definitions in OpenAI tools format.
+    
+    Behaves as a plain list of tool definitions, and additionally caches the
+    payload compiled for each provider wire format so that repeated requests
+    with the same tools skip conversion entirely. Agents build a new manifest
+    (with a higher version) whenever their tools change.
+    """
+    
+    def __init__(self, tools: List[Dict[str, Any]] = (), version: int = 0):
+        """
+        Initialize the manifest.
+        
+        Args:
+            tools: Tool definitions in OpenAI tools format
+            version: Version number, incremented each time the tool set changes
+        """
+        super().__init__(tools)
+        self.version = version
+        self._compiled: Dict[str, List[Dict[str, Any]]] = {}
+        self._token_counts: Dict[str, int] = {}
+    
+    def compiled(self, wire_format: str, converter) -> List[Dict[str, Any]]:
+        """
+        Get the tools converted to a provider wire format, converting only once.
+        
+        Args:
+            wire_format: Name of the wire format used as the cache key
+            converter: Callable converting a list of tool definitions to that format
+        
+        Returns:
+            The cached payload for the wire format
+        """
+        payload = self._compiled.get(wire_format)
+        if payload is None:
+            payload = self._compiled[wire_format] = converter(list(self))
+        return payload
+    
+    def token_count(self, tokenizer) -> int:
+        """
+        Get the tokens used by the tool definitions, counting only once per tokenizer.
+        
+        Args:
+            tokenizer: Tokenizer used to count the definitions
+        
+        Returns:
+            Number of tokens
+        """
+        count = self._token_counts.get(tokenizer.name)
+        if count is None:
+            count = self._token_counts[tokenizer.name] = tokenizer.count_tools(self)
+        return count
+
+
 class ProviderInterface(ABC):
     """Abstract base class for all LLM provider implementations."""
     
+    # Cache key for tool payloads compiled by _convert_tools
+    tool_wire_format = "openai"
+    # Longest image side (in pixels) worth sending; larger images are downscaled if Pillow is installed
+    max_image_dimension: Optional[int] = None
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
         """
         Initialize the provider interface.
@@ -80,6 +237,82 @@ class ProviderInterface(ABC):
         """
         pass
         
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response from the model without blocking the event loop.
+        
+        Providers with an async SDK client override this. The default implementation
+        runs the blocking generate_response in the loop's default executor.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional provider-specific parameters
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.generate_response, messages, tools, **kwargs)
+        )
+        
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response from the model.
+        
+        Yields text deltas as they arrive, followed by a final chunk holding the
+        complete ProviderResponse. Providers with a streaming API override this;
+        the default implementation yields a single non-streamed response.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional provider-specific parameters
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        yield from self._chunks_from_response(self.generate_response(messages, tools, **kwargs))
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Async counterpart of stream_response.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional provider-specific parameters
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        response = await self.agenerate_response(messages, tools, **kwargs)
+        for chunk in self._chunks_from_response(response):
+            yield chunk
+            
+    @staticmethod
+    def _chunks_from_response(response: ProviderResponse) -> Iterator[StreamChunk]:
+        """Present a complete response as a stream of chunks."""
+        if response.content:
+            yield StreamChunk(delta=response.content)
+        yield StreamChunk(response=response)
+        
     @abstractmethod
     def supports_tool_calling(self) -> bool:
         """Check if the model supports tool calling."""
@@ -100,6 +333,24 @@ class ProviderInterface(ABC):
         # Default implementation - providers can override  
         return None
         
+    def _convert_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert tool definitions to the provider's format (OpenAI format by default)."""
+        return tools
+        
+    def _compile_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get the tool payload to send, reusing the compiled payload of a ToolManifest.
+        
+        Args:
+            tools: A ToolManifest or a plain list of tool definitions
+            
+        Returns:
+            Tool definitions in the provider's format
+        """
+        if isinstance(tools, ToolManifest):
+            return tools.compiled(self.tool_wire_format, self._convert_tools)
+        return self._convert_tools(tools)
+        
     def _log_request(self, messages: List[Dict], tools: Optional[List[Dict]] = None) -> None:
         """Log the request details."""
         logger.info(f"[{self.provider_name}] Calling {self.model_name}")
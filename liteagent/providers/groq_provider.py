@@ -6,15 +6,15 @@ This provider uses the official Groq Python client library.
 
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 try:
-    from groq import Groq
+    from groq import Groq, AsyncGroq
     from groq.types.chat import ChatCompletion
 except ImportError:
     raise ImportError("Groq library not installed. Install with: pip install groq")
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator
 from ..utils import logger
 
 
@@ -48,6 +48,17 @@ class GroqProvider(ProviderInterface):
             max_retries=self.max_retries,
             timeout=self.timeout,
         )
+        self._async_client = None
+        
+    def _get_async_client(self) -> AsyncGroq:
+        """Get the AsyncGroq client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncGroq(
+                api_key=self.api_key or os.getenv('GROQ_API_KEY'),
+                max_retries=self.max_retries,
+                timeout=self.timeout,
+            )
+        return self._async_client
         
     def generate_response(
         self, 
@@ -69,6 +80,56 @@ class GroqProvider(ProviderInterface):
         start_time = time.time()
         self._log_request(messages, tools)
         
+        request_params = self._prepare_request(messages, tools, **kwargs)
+                
+        # Make the API call
+        response: ChatCompletion = self.client.chat.completions.create(**request_params)
+        
+        # Convert to standardized format
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response using the AsyncGroq client.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        response: ChatCompletion = await self._get_async_client().chat.completions.create(**request_params)
+        
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    def _prepare_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the chat completions request parameters."""
         # Filter out unsupported parameters for Groq
         supported_params = {
             'temperature', 'max_tokens', 'top_p', 'stream', 'stop',
@@ -91,23 +152,109 @@ class GroqProvider(ProviderInterface):
             if len(tools) > 128:
                 raise ValueError(f"Too many tools for Groq provider: {len(tools)}. Maximum allowed: 128")
                 
-            request_params['tools'] = tools
+            request_params['tools'] = self._compile_tools(tools)
             request_params['tool_choice'] = 'auto'
             
             # Enable parallel tool calls for supported models
             if self.supports_parallel_tools():
                 request_params['parallel_tool_calls'] = True
                 
-        # Make the API call
-        response: ChatCompletion = self.client.chat.completions.create(**request_params)
+        return request_params
         
-        # Convert to standardized format
-        provider_response = self._convert_response(response)
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response using Groq's chat completions API.
         
-        elapsed_time = time.time() - start_time
-        self._log_response(provider_response, elapsed_time)
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
         
-        return provider_response
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        request_params['stream'] = True
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        for chunk in self.client.chat.completions.create(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a response using the AsyncGroq client.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        request_params['stream'] = True
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        async for chunk in await self._get_async_client().chat.completions.create(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    def _accumulate_chunk(self, accumulator: StreamAccumulator, chunk) -> str:
+        """Merge one streamed chunk into the accumulator and return its text delta."""
+        accumulator.raw_response = chunk
+        if chunk.model:
+            accumulator.model = chunk.model
+            
+        # Groq reports usage for streams on the final chunk's x_groq field
+        usage = getattr(chunk, 'usage', None) or getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+        if usage:
+            accumulator.usage = {
+                'prompt_tokens': usage.prompt_tokens,
+                'completion_tokens': usage.completion_tokens,
+                'total_tokens': usage.total_tokens,
+            }
+        if not chunk.choices:
+            return ""
+            
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            accumulator.finish_reason = choice.finish_reason
+        for tc in choice.delta.tool_calls or []:
+            accumulator.add_tool_call_delta(
+                tc.index,
+                id=tc.id,
+                name=tc.function.name if tc.function else None,
+                arguments=tc.function.arguments if tc.function else None
+            )
+        return accumulator.add_text(choice.delta.content)
             
     def _convert_response(self, response: ChatCompletion) -> ProviderResponse:
         """Convert Groq response to standardized format."""
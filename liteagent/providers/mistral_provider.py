@@ -6,7 +6,7 @@ This provider uses the official Mistral Python client library.
 
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 try:
     from mistralai import Mistral
@@ -14,13 +14,15 @@ try:
 except ImportError:
     raise ImportError("Mistral library not installed. Install with: pip install mistralai")
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator
 from ..utils import logger
 
 
 class MistralProvider(ProviderInterface):
     """Mistral provider using the official Mistral client library."""
     
+    tool_wire_format = "mistral"
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
         """
         Initialize Mistral provider.
@@ -68,6 +70,56 @@ class MistralProvider(ProviderInterface):
         start_time = time.time()
         self._log_request(messages, tools)
         
+        request_params = self._prepare_request(messages, tools, **kwargs)
+            
+        # Make the API call
+        response: ChatCompletionResponse = self.client.chat.complete(**request_params)
+        
+        # Convert to standardized format
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+            
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response using the Mistral client's async chat API.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        response: ChatCompletionResponse = await self.client.chat.complete_async(**request_params)
+        
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    def _prepare_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the chat completion request parameters."""
         # Process messages for Mistral constraints (ordering, system message handling)
         from ..provider_roles import process_messages_for_provider
         processed_messages = process_messages_for_provider(messages, "mistral")
@@ -91,19 +143,102 @@ class MistralProvider(ProviderInterface):
             
         # Add tools if provided and model supports them
         if tools and self.supports_tool_calling():
-            request_params['tools'] = self._convert_tools(tools)
+            request_params['tools'] = self._compile_tools(tools)
             request_params['tool_choice'] = 'auto'
             
-        # Make the API call
-        response: ChatCompletionResponse = self.client.chat.complete(**request_params)
+        return request_params
         
-        # Convert to standardized format
-        provider_response = self._convert_response(response)
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response using Mistral's chat streaming API.
         
-        elapsed_time = time.time() - start_time
-        self._log_response(provider_response, elapsed_time)
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
         
-        return provider_response
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        for event in self.client.chat.stream(**request_params):
+            delta = self._accumulate_chunk(accumulator, event.data)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a response using the Mistral client's async streaming API.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        async for event in await self.client.chat.stream_async(**request_params):
+            delta = self._accumulate_chunk(accumulator, event.data)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    def _accumulate_chunk(self, accumulator: StreamAccumulator, chunk) -> str:
+        """Merge one streamed completion chunk into the accumulator and return its text delta."""
+        accumulator.raw_response = chunk
+        if chunk.model:
+            accumulator.model = chunk.model
+        if chunk.usage:
+            accumulator.usage = {
+                'prompt_tokens': chunk.usage.prompt_tokens,
+                'completion_tokens': chunk.usage.completion_tokens,
+                'total_tokens': chunk.usage.total_tokens,
+            }
+        if not chunk.choices:
+            return ""
+            
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            accumulator.finish_reason = choice.finish_reason
+        for position, tc in enumerate(choice.delta.tool_calls or []):
+            index = getattr(tc, 'index', None)
+            accumulator.add_tool_call_delta(
+                index if index is not None else position,
+                id=tc.id,
+                name=tc.function.name,
+                arguments=tc.function.arguments
+            )
+        content = choice.delta.content
+        return accumulator.add_text(content if isinstance(content, str) else None)
             
     def _convert_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert messages to Mistral format (function -> tool role)."""
@@ -7,20 +7,24 @@ This provider uses the official Ollama Python client library for local model inf
 import os
 import time
 import json
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 try:
-    from ollama import Client
+    from ollama import Client, AsyncClient
 except ImportError:
     raise ImportError("Ollama library not installed. Install with: pip install ollama")
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator
+from ..memory import MessageHistory
 from ..utils import logger
 
 
 class OllamaProvider(ProviderInterface):
     """Ollama provider using the official Ollama client library."""
     
+    tool_wire_format = "ollama"
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
         """
         Initialize Ollama provider.
@@ -44,6 +48,13 @@ class OllamaProvider(ProviderInterface):
     def _setup_client(self) -> None:
         """Setup the Ollama client."""
         self.client = Client(host=self.host)
+        self._async_client = None
+        
+    def _get_async_client(self) -> AsyncClient:
+        """Get the Ollama AsyncClient, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncClient(host=self.host)
+        return self._async_client
         
     def generate_response(
         self, 
@@ -65,6 +76,56 @@ class OllamaProvider(ProviderInterface):
         start_time = time.time()
         self._log_request(messages, tools)
         
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        
+        # Make the API call
+        response = self.client.chat(**request_params)
+        
+        # Convert to standardized format
+        provider_response = self._convert_response(response, tools)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+            
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response using the Ollama AsyncClient.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        response = await self._get_async_client().chat(**request_params)
+        
+        provider_response = self._convert_response(response, tools)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    def _prepare_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the chat request parameters."""
         # Prepare request parameters
         # Preprocess messages to convert tool call arguments from strings to dicts for Ollama
         processed_messages = self._preprocess_messages_for_ollama(messages)
@@ -89,21 +150,117 @@ class OllamaProvider(ProviderInterface):
             
         # Handle tools for Ollama using native tool calling
         if tools and self.supports_tool_calling():
-            request_params['tools'] = self._convert_tools(tools)
+            request_params['tools'] = self._compile_tools(tools)
                 
-        # Debug: Log the processed messages before API call
-        logger.debug(f"Ollama API call with processed messages: {json.dumps(processed_messages, indent=2)}")
+        # Debug: Log the processed messages before API call (only serialized when debug logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Ollama API call with processed messages: {json.dumps(processed_messages, indent=2)}")
         
-        # Make the API call
-        response = self.client.chat(**request_params)
+        return request_params
         
-        # Convert to standardized format
-        provider_response = self._convert_response(response, tools)
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response using Ollama's chat API.
         
-        elapsed_time = time.time() - start_time
-        self._log_response(provider_response, elapsed_time)
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
         
-        return provider_response
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        request_params['stream'] = True
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        for chunk in self.client.chat(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a response using the Ollama AsyncClient.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        request_params['stream'] = True
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        async for chunk in await self._get_async_client().chat(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    def _accumulate_chunk(self, accumulator: StreamAccumulator, chunk: Dict[str, Any]) -> str:
+        """Merge one streamed chat chunk into the accumulator and return its text delta."""
+        accumulator.raw_response = chunk
+        if chunk.get('model'):
+            accumulator.model = chunk.get('model')
+            
+        message = chunk.get('message', {})
+        
+        # Ollama sends complete tool calls rather than argument fragments
+        if 'tool_calls' in message and message['tool_calls']:
+            offset = accumulator.tool_call_count
+            for position, tc in enumerate(message['tool_calls']):
+                arguments = tc['function']['arguments']
+                if isinstance(arguments, str):
+                    try:
+                        arguments = json.loads(arguments)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Failed to parse tool call arguments: {arguments}")
+                        arguments = {}
+                accumulator.add_tool_call_delta(
+                    offset + position,
+                    id=tc.get('id'),
+                    name=tc['function']['name'],
+                    arguments=arguments
+                )
+                
+        if chunk.get('done'):
+            prompt_tokens = chunk.get('prompt_eval_count') or 0
+            completion_tokens = chunk.get('eval_count') or 0
+            accumulator.usage = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            }
+            accumulator.finish_reason = chunk.get('done_reason', 'stop')
+            
+        return accumulator.add_text(message.get('content'))
             
     def _supports_native_tools(self) -> bool:
         """Check if the model supports native tool calling."""
@@ -163,37 +320,43 @@ If you don't need to use any tools, respond normally without the JSON format.
         """
         Preprocess messages to ensure tool call arguments are dicts for Ollama client.
         The memory stores arguments as JSON strings, but Ollama expects dicts.
-        """
-        processed_messages = []
         
-        for message in messages:
-            # Deep copy the message to avoid modifying the original
-            processed_message = json.loads(json.dumps(message))
-            
-            # Check if this message has tool calls
-            if 'tool_calls' in processed_message and processed_message['tool_calls']:
-                for tool_call in processed_message['tool_calls']:
-                    # Convert arguments from string to dict if needed
-                    if 'function' in tool_call and 'arguments' in tool_call['function']:
-                        arguments = tool_call['function']['arguments']
-                        if isinstance(arguments, str):
-                            try:
-                                # Parse JSON string to dict
-                                parsed_args = json.loads(arguments)
-                                tool_call['function']['arguments'] = parsed_args
-                                logger.debug(f"Converted string arguments to dict: {arguments} -> {parsed_args}")
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Failed to parse tool call arguments '{arguments}': {e}")
-                                # Keep as empty dict if parsing fails
-                                tool_call['function']['arguments'] = {}
-                        elif not isinstance(arguments, dict):
-                            # Handle any other non-dict types
-                            logger.warning(f"Tool call arguments not string or dict: {type(arguments)} -> {arguments}")
-                            tool_call['function']['arguments'] = {}
-            
-            processed_messages.append(processed_message)
-        
-        return processed_messages
+        Messages that came from ConversationMemory are converted once and reused on
+        later requests, so each turn only converts the new tail of the conversation.
+        """
+        if isinstance(messages, MessageHistory):
+            return messages.converted(self.provider_name, self._convert_message)
+        return [self._convert_message(message) for message in messages]
+    
+    def _convert_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single message, copying only what changes so the original is left alone."""
+        processed_message = dict(message)
+        if processed_message.get('tool_calls'):
+            processed_message['tool_calls'] = [self._convert_tool_call(tool_call)
+                                               for tool_call in processed_message['tool_calls']]
+        return processed_message
+    
+    def _convert_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a tool call's arguments from a JSON string to a dict."""
+        if 'function' not in tool_call or 'arguments' not in tool_call['function']:
+            return tool_call
+        arguments = tool_call['function']['arguments']
+        if isinstance(arguments, str):
+            try:
+                # Parse JSON string to dict
+                parsed_args = json.loads(arguments)
+                logger.debug(f"Converted string arguments to dict: {arguments} -> {parsed_args}")
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse tool call arguments '{arguments}': {e}")
+                # Keep as empty dict if parsing fails
+                parsed_args = {}
+        elif isinstance(arguments, dict):
+            return tool_call
+        else:
+            # Handle any other non-dict types
+            logger.warning(f"Tool call arguments not string or dict: {type(arguments)} -> {arguments}")
+            parsed_args = {}
+        return {**tool_call, 'function': {**tool_call['function'], 'arguments': parsed_args}}
         
     def _extract_tool_calls_from_text(self, text: str) -> List[ToolCall]:
         """Extract tool calls from text response for non-native tool models."""
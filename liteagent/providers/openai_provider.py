@@ -7,22 +7,25 @@ OpenAI-compatible APIs like DeepSeek by setting a different base_url.
 
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     from openai.types.chat import ChatCompletion, ChatCompletionMessage
     from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
 except ImportError:
     raise ImportError("OpenAI library not installed. Install with: pip install openai")
 
-from .base import ProviderInterface, ProviderResponse, ToolCall
+from .base import ProviderInterface, ProviderResponse, ToolCall, StreamChunk, StreamAccumulator
 from ..utils import logger
 
 
 class OpenAIProvider(ProviderInterface):
     """OpenAI provider using the official OpenAI client library."""
     
+    # OpenAI resizes anything larger server-side
+    max_image_dimension = 2048
+    
     def __init__(self, model_name: str, api_key: Optional[str] = None, **kwargs):
         """
         Initialize OpenAI provider.
@@ -71,6 +74,14 @@ class OpenAIProvider(ProviderInterface):
             client_kwargs['project'] = self.project
             
         self.client = OpenAI(**client_kwargs)
+        self._client_kwargs = client_kwargs
+        self._async_client = None
+        
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the AsyncOpenAI client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(**self._client_kwargs)
+        return self._async_client
         
     def generate_response(
         self, 
@@ -92,6 +103,56 @@ class OpenAIProvider(ProviderInterface):
         start_time = time.time()
         self._log_request(messages, tools)
         
+        request_params = self._prepare_request(messages, tools, **kwargs)
+                
+        # Make the API call
+        response: ChatCompletion = self.client.chat.completions.create(**request_params)
+        
+        # Convert to standardized format
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    async def agenerate_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        """
+        Generate a response using the AsyncOpenAI client.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions  
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Returns:
+            ProviderResponse: Standardized response object
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        response: ChatCompletion = await self._get_async_client().chat.completions.create(**request_params)
+        
+        provider_response = self._convert_response(response)
+        
+        elapsed_time = time.time() - start_time
+        self._log_response(provider_response, elapsed_time)
+        
+        return provider_response
+        
+    def _prepare_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the chat completions request parameters."""
         # Filter out unsupported parameters for OpenAI
         supported_params = {
             'temperature', 'max_tokens', 'top_p', 'frequency_penalty', 
@@ -111,23 +172,112 @@ class OpenAIProvider(ProviderInterface):
         
         # Add tools if provided and model supports them
         if tools and self.supports_tool_calling():
-            request_params['tools'] = tools
+            request_params['tools'] = self._compile_tools(tools)
             request_params['tool_choice'] = 'auto'
             
             # Enable parallel tool calls for supported models
             if self.supports_parallel_tools():
                 request_params['parallel_tool_calls'] = True
                 
-        # Make the API call
-        response: ChatCompletion = self.client.chat.completions.create(**request_params)
+        return request_params
         
-        # Convert to standardized format
-        provider_response = self._convert_response(response)
+    def stream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[StreamChunk]:
+        """
+        Stream a response using OpenAI's chat completions API.
         
-        elapsed_time = time.time() - start_time
-        self._log_response(provider_response, elapsed_time)
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions  
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
         
-        return provider_response
+        request_params = self._prepare_stream_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        for chunk in self.client.chat.completions.create(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    async def astream_response(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a response using the AsyncOpenAI client.
+        
+        Args:
+            messages: List of message dictionaries
+            tools: Optional list of tool definitions  
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+            
+        Yields:
+            StreamChunk: Text deltas, then the final response
+        """
+        start_time = time.time()
+        self._log_request(messages, tools)
+        
+        request_params = self._prepare_stream_request(messages, tools, **kwargs)
+        accumulator = StreamAccumulator(self.model_name, self.provider_name)
+        
+        async for chunk in await self._get_async_client().chat.completions.create(**request_params):
+            delta = self._accumulate_chunk(accumulator, chunk)
+            if delta:
+                yield StreamChunk(delta=delta)
+                
+        provider_response = accumulator.build()
+        self._log_response(provider_response, time.time() - start_time)
+        yield StreamChunk(response=provider_response)
+        
+    def _prepare_stream_request(
+        self, 
+        messages: List[Dict[str, Any]], 
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build request parameters for a streamed completion that reports usage."""
+        request_params = self._prepare_request(messages, tools, **kwargs)
+        request_params['stream'] = True
+        request_params['stream_options'] = {'include_usage': True}
+        return request_params
+        
+    def _accumulate_chunk(self, accumulator: StreamAccumulator, chunk) -> str:
+        """Merge one streamed chunk into the accumulator and return its text delta."""
+        accumulator.raw_response = chunk
+        if chunk.model:
+            accumulator.model = chunk.model
+        if chunk.usage:
+            accumulator.usage = self._convert_usage(chunk.usage)
+        if not chunk.choices:
+            return ""
+            
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            accumulator.finish_reason = choice.finish_reason
+        for tc in choice.delta.tool_calls or []:
+            accumulator.add_tool_call_delta(
+                tc.index,
+                id=tc.id,
+                name=tc.function.name if tc.function else None,
+                arguments=tc.function.arguments if tc.function else None
+            )
+        return accumulator.add_text(choice.delta.content)
             
     def _convert_response(self, response: ChatCompletion) -> ProviderResponse:
         """Convert OpenAI response to standardized format."""
@@ -160,12 +310,7 @@ class OpenAIProvider(ProviderInterface):
         # Extract usage info
         usage = None
         if response.usage:
-            usage = {
-                'prompt_tokens': response.usage.prompt_tokens,
-                'completion_tokens': response.usage.completion_tokens,
-                'total_tokens': response.usage.total_tokens,
-                'cached_tokens': getattr(getattr(response.usage, 'prompt_tokens_details', None), 'cached_tokens', 0) if hasattr(response.usage, 'prompt_tokens_details') else 0,
-            }
+            usage = self._convert_usage(response.usage)
             
         return ProviderResponse(
             content=content,
@@ -177,6 +322,15 @@ class OpenAIProvider(ProviderInterface):
             finish_reason=response.choices[0].finish_reason
         )
         
+    def _convert_usage(self, usage) -> Dict[str, Any]:
+        """Convert OpenAI usage info to a dictionary."""
+        return {
+            'prompt_tokens': usage.prompt_tokens,
+            'completion_tokens': usage.completion_tokens,
+            'total_tokens': usage.total_tokens,
+            'cached_tokens': getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', 0) if hasattr(usage, 'prompt_tokens_details') else 0,
+        }
+        
     def supports_tool_calling(self) -> bool:
         """Check if the model supports tool calling."""
         from ..capabilities import get_model_capabilities
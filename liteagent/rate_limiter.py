@@ -5,6 +5,7 @@ This module provides intelligent rate limiting across different LLM providers
 with per-model, per-tier throttling to prevent API rate limit errors.
 """
 
+import asyncio
 import json
 import time
 import threading
@@ -281,14 +282,14 @@ class RateLimiter:
             actual_tokens: Actual tokens used in the request
         """
         with self._lock:
-            if tier is None:
-                tier = self.default_tiers.get(provider, list(self.limits[provider][model].keys())[0])
-                
             # Get buckets
             if (provider not in self.buckets or 
                 model not in self.buckets[provider]):
                 return
                 
+            if tier is None:
+                tier = self.default_tiers.get(provider, list(self.limits[provider][model].keys())[0])
+                
             rpm_bucket = self.buckets[provider][model].get(f"{tier}_rpm")
             tpm_bucket = self.buckets[provider][model].get(f"{tier}_tpm")
             
@@ -326,6 +327,29 @@ class RateLimiter:
             
         return 0
     
+    async def await_if_needed(self, provider: str, model: str, tier: Optional[str] = None,
+                              estimated_tokens: int = 1) -> float:
+        """
+        Async counterpart of wait_if_needed, sleeping without blocking the event loop.
+        
+        Args:
+            provider: Provider name
+            model: Model name
+            tier: Tier name
+            estimated_tokens: Estimated tokens for this request
+            
+        Returns:
+            float: Time waited in seconds
+        """
+        can_proceed, wait_time = self.can_proceed(provider, model, tier, estimated_tokens)
+        
+        if not can_proceed and wait_time > 0:
+            logger.info(f"🕐 Rate limit reached for {provider}/{model}. Waiting {wait_time:.1f}s...")
+            await asyncio.sleep(wait_time)
+            return wait_time
+            
+        return 0
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get current usage statistics."""
         with self._lock:
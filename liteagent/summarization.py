@@ -0,0 +1,203 @@
+"""
+Background summarization of long conversations for LiteAgent.
+
+Once a conversation grows past a token threshold, a ConversationSummarizer has
+a (usually cheaper) model compact its older turns into a running summary. The
+work runs on a background thread after a turn completes, and the finished
+summary is swapped into the memory in one step. The summarized messages stay
+stored, so persistent memories and observers still see the full conversation;
+only the requests sent to the model get shorter.
+"""
+
+import json
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from .memory import ConversationMemory, ConversationSummary
+from .models import ModelInterface, create_model_interface
+from .utils import logger
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You summarize conversations between a user and an AI assistant. Write a concise "
+    "summary that preserves the user's goals, facts and decisions established so far, "
+    "results of tool calls that are still relevant, and any open questions. Reply with "
+    "the summary only."
+)
+
+
+def format_transcript(messages: List[Dict[str, Any]]) -> str:
+    """
+    Render messages as a plain-text transcript for the summarizing model.
+
+    Args:
+        messages: Stored message dicts
+
+    Returns:
+        One line per message (tool calls and results included)
+    """
+    lines = []
+    for message in messages:
+        role = message.get("role", "unknown")
+        content = message.get("content")
+        if isinstance(content, list):
+            # Multimodal content; only the text parts are summarized
+            content = " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+        if content:
+            lines.append(f"{role}: {content}")
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            lines.append(f"{role} called {function.get('name')}({function.get('arguments', '')})")
+        if message.get("function_call"):
+            function_call = message["function_call"]
+            arguments = function_call.get("arguments", "")
+            if not isinstance(arguments, str):
+                arguments = json.dumps(arguments)
+            lines.append(f"{role} called {function_call.get('name')}({arguments})")
+    return "\n".join(lines)
+
+
+class ConversationSummarizer:
+    """
+    Compacts the older turns of long conversations into a running summary.
+
+    When the messages a memory would send exceed threshold_tokens, everything
+    before the most recent keep_recent_turns user turns is summarized, together
+    with the previous summary, on a background thread. Only one summary per
+    memory is in progress at a time.
+
+    Example:
+        summarizer = ConversationSummarizer("gpt-4o-mini", threshold_tokens=20000)
+        agent = LiteAgent(model="gpt-4o", name="support", summarizer=summarizer)
+    """
+
+    def __init__(self, model: str, threshold_tokens: int, keep_recent_turns: int = 2,
+                 provider: Optional[str] = None, api_key: Optional[str] = None,
+                 model_interface: Optional[ModelInterface] = None, **kwargs):
+        """
+        Initialize the summarizer.
+
+        Args:
+            model: Model used to write summaries (a cheap, fast model is usually enough)
+            threshold_tokens: Tokens the sent messages may reach before older turns are summarized
+            keep_recent_turns: Number of most recent user turns always sent in full
+            provider: Explicit provider name for the model
+            api_key: API key for the provider
+            model_interface: Existing model interface to use instead of creating one
+            **kwargs: Additional provider-specific configuration
+        """
+        if threshold_tokens <= 0:
+            raise ValueError("threshold_tokens must be positive")
+        if keep_recent_turns < 1:
+            raise ValueError("keep_recent_turns must be at least 1")
+        self.model = model
+        self.threshold_tokens = threshold_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.model_interface = model_interface or create_model_interface(model, api_key, provider=provider, **kwargs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: "weakref.WeakKeyDictionary[ConversationMemory, Future]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def needs_summary(self, memory: ConversationMemory) -> bool:
+        """Check whether a memory's messages have grown past the threshold."""
+        return memory.active_token_count > self.threshold_tokens
+
+    def maybe_summarize(self, memory: ConversationMemory,
+                        on_summary: Optional[Callable[[ConversationSummary], None]] = None) -> Optional[Future]:
+        """
+        Start summarizing a memory in the background if it has grown past the threshold.
+
+        Args:
+            memory: The conversation memory
+            on_summary: Called with the summary once it has been applied
+
+        Returns:
+            Future resolving to the applied summary (or None), or None if no
+            summary was started
+        """
+        if not self.needs_summary(memory):
+            return None
+        with self._lock:
+            pending = self._pending.get(memory)
+            if pending is not None and not pending.done():
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="liteagent-summarizer")
+            future = self._executor.submit(self._summarize_in_background, memory, on_summary)
+            self._pending[memory] = future
+        return future
+
+    def _summarize_in_background(self, memory: ConversationMemory,
+                                 on_summary: Optional[Callable[[ConversationSummary], None]]
+                                 ) -> Optional[ConversationSummary]:
+        try:
+            summary = self.summarize(memory)
+            if summary is not None and on_summary is not None:
+                on_summary(summary)
+            return summary
+        except Exception as e:
+            logger.warning(f"Conversation summarization failed: {e}")
+            return None
+
+    def summarize(self, memory: ConversationMemory) -> Optional[ConversationSummary]:
+        """
+        Summarize a memory's older turns now and apply the summary.
+
+        Args:
+            memory: The conversation memory
+
+        Returns:
+            The applied summary, or None if there was nothing to summarize or the
+            conversation was rewritten while the summary was being written
+        """
+        previous = memory.get_summary()
+        start = previous.covered if previous is not None else 0
+        messages = memory.messages
+        roles = messages.roles
+        turn_starts = [index for index in range(start, len(roles)) if roles[index] == "user"]
+        if len(turn_starts) <= self.keep_recent_turns:
+            return None
+        covered = turn_starts[-self.keep_recent_turns]
+
+        new_messages = [message for message in messages[start:covered] if message.get("role") != "system"]
+        if not new_messages:
+            return None
+        # Taken before the model call, so a rewrite during it is detected
+        last_message = messages[covered - 1]
+        content = self._write_summary(previous.content if previous is not None else None, new_messages)
+        if not content or not memory.apply_summary(content, covered, last_message=last_message):
+            return None
+        logger.info(f"Summarized {covered} messages into {memory.summary.token_count} tokens")
+        return memory.summary
+
+    def _write_summary(self, previous: Optional[str], messages: List[Dict[str, Any]]) -> str:
+        """Ask the model for a summary of the previous summary and new messages."""
+        prompt = ""
+        if previous:
+            prompt += f"Summary of the conversation so far:\n{previous}\n\nConversation since then:\n"
+        prompt += format_transcript(messages)
+        response = self.model_interface.generate_response([
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ])
+        content = getattr(response, "content", response)
+        return content.strip() if isinstance(content, str) else ""
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for summaries in progress to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures, timeout=timeout)
+
+    def close(self) -> None:
+        """Wait for summaries in progress and stop the background thread."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,190 @@
+"""
+Token counting for LiteAgent.
+
+Tokenizers count the tokens a message will use once it is sent to a model. Each
+provider family can register its own tokenizer; when none is registered, or the
+library it needs is not installed, a character-based heuristic is used so that
+counting always works offline.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .utils import logger
+
+
+class Tokenizer(ABC):
+    """
+    Base class for tokenizers.
+
+    Subclasses implement count_text; message and tool schema counts are built on it.
+    """
+
+    name = "base"
+    # Tokens added per message for the role and message framing
+    message_overhead = 4
+    # Flat cost charged for each image content part
+    image_tokens = 250
+
+    @abstractmethod
+    def count_text(self, text: str) -> int:
+        """
+        Count the tokens in a piece of text.
+
+        Args:
+            text: The text to count
+
+        Returns:
+            Number of tokens
+        """
+        pass
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """
+        Count the tokens a message uses, including text parts, images and tool call arguments.
+
+        Args:
+            message: The message dictionary
+
+        Returns:
+            Number of tokens
+        """
+        tokens = self.message_overhead
+        content = message.get("content")
+        if isinstance(content, list):
+            for item in content:
+                if item.get("type") == "text":
+                    tokens += self.count_text(str(item.get("text", "")))
+                else:
+                    tokens += self.image_tokens
+        elif content:
+            tokens += self.count_text(str(content))
+
+        calls = [tool_call.get("function", {}) for tool_call in message.get("tool_calls") or []]
+        if message.get("function_call"):
+            calls.append(message["function_call"])
+        for function in calls:
+            tokens += self.count_text(str(function.get("name", "")))
+            tokens += self.count_text(str(function.get("arguments", "")))
+        return tokens
+
+    def count_tools(self, tools: Optional[Iterable[Dict[str, Any]]]) -> int:
+        """
+        Count the tokens used by tool schemas sent with a request.
+
+        Args:
+            tools: Tool definitions
+
+        Returns:
+            Number of tokens
+        """
+        if not tools:
+            return 0
+        return self.count_text(json.dumps(list(tools), sort_keys=True))
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Offline tokenizer that assumes a fixed number of characters per token."""
+
+    name = "heuristic"
+
+    def __init__(self, chars_per_token: float = 4.0):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            chars_per_token: Average number of characters in a token
+        """
+        self.chars_per_token = chars_per_token
+
+    def count_text(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact tokenizer for OpenAI models, backed by the optional tiktoken package."""
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            encoding_name: Name of the tiktoken encoding
+
+        Raises:
+            ImportError: If tiktoken is not installed
+        """
+        import tiktoken
+
+        self.encoding_name = encoding_name
+        self.name = f"tiktoken:{encoding_name}"
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count_text(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def __reduce__(self):
+        # Encodings are rebuilt rather than pickled
+        return (self.__class__, (self.encoding_name,))
+
+
+def _openai_tokenizer(model: str) -> Tokenizer:
+    """Pick the tiktoken encoding used by an OpenAI model."""
+    if model.startswith(("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")):
+        return TiktokenTokenizer("o200k_base")
+    return TiktokenTokenizer("cl100k_base")
+
+
+DEFAULT_TOKENIZER = HeuristicTokenizer()
+
+# Tokenizer factories by provider family; each takes the model name
+_TOKENIZER_FACTORIES: Dict[str, Callable[[str], Tokenizer]] = {
+    "openai": _openai_tokenizer,
+}
+_tokenizers: Dict[Tuple[str, str], Tokenizer] = {}
+
+
+def register_tokenizer(provider: str, factory: Callable[[str], Tokenizer]) -> None:
+    """
+    Register the tokenizer used for a provider family.
+
+    Args:
+        provider: Provider name (e.g., "openai", "anthropic")
+        factory: Callable taking a model name and returning a Tokenizer. If it raises
+            (e.g. ImportError for a missing optional dependency), the heuristic
+            tokenizer is used instead.
+    """
+    provider = provider.lower()
+    _TOKENIZER_FACTORIES[provider] = factory
+    for key in [key for key in _tokenizers if key[0] == provider]:
+        del _tokenizers[key]
+
+
+def get_tokenizer(provider: Optional[str] = None, model: Optional[str] = None) -> Tokenizer:
+    """
+    Get the tokenizer for a provider and model.
+
+    Args:
+        provider: Provider name
+        model: Model name
+
+    Returns:
+        The registered tokenizer, or the heuristic tokenizer if none is registered
+        or it could not be created
+    """
+    key = ((provider or "").lower(), model or "")
+    tokenizer = _tokenizers.get(key)
+    if tokenizer is None:
+        factory = _TOKENIZER_FACTORIES.get(key[0])
+        tokenizer = DEFAULT_TOKENIZER
+        if factory is not None:
+            try:
+                tokenizer = factory(key[1])
+            except ImportError as e:
+                logger.debug(f"Using heuristic token counts for {key[0]}: {e}")
+            except Exception as e:
+                # e.g. tiktoken failing to download its encoding files offline
+                logger.warning(f"Could not load the {key[0]} tokenizer, using heuristic token counts: {e}")
+        _tokenizers[key] = tokenizer
+    return tokenizer
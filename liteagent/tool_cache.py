@@ -0,0 +1,249 @@
+"""
+Memoizing caches for deterministic tool results.
+
+Tools opt in with ``@liteagent_tool(cache=...)``. Results are cached by the
+tool's canonicalized arguments in an LRU cache with an optional TTL, and
+concurrent identical calls are collapsed into a single execution.
+"""
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Cache scopes, from narrowest to widest
+CACHE_SCOPES = ("conversation", "agent", "process")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How a tool's results are cached.
+
+    Attributes:
+        scope: Which calls share the cache: "conversation" (one conversation),
+            "agent" (all conversations of an agent) or "process" (every agent in
+            the process, including forks and sub-agents)
+        maxsize: Maximum number of cached results; least recently used results are evicted
+        ttl: Seconds a result stays valid, or None to keep it until evicted
+    """
+    scope: str = "agent"
+    maxsize: int = 128
+    ttl: Optional[float] = None
+
+    def __post_init__(self):
+        if self.scope not in CACHE_SCOPES:
+            raise ValueError(f"Unknown cache scope {self.scope!r}; expected one of {CACHE_SCOPES}")
+
+    @classmethod
+    def from_option(cls, option: Union[bool, str, Dict[str, Any], "CachePolicy", None]) -> Optional["CachePolicy"]:
+        """
+        Build a policy from the ``cache`` option of a tool.
+
+        Args:
+            option: True for the defaults, a scope name, a dict of policy fields,
+                a CachePolicy, or None/False to disable caching
+
+        Returns:
+            The cache policy, or None if caching is disabled
+        """
+        if option is None or option is False:
+            return None
+        if isinstance(option, CachePolicy):
+            return option
+        if option is True:
+            return cls()
+        if isinstance(option, str):
+            return cls(scope=option)
+        if isinstance(option, dict):
+            return cls(**option)
+        raise TypeError(f"Invalid cache option: {option!r}")
+
+
+def make_cache_key(arguments: Dict[str, Any]) -> str:
+    """
+    Canonicalize tool arguments into a cache key.
+
+    Args:
+        arguments: The tool call arguments
+
+    Returns:
+        A key that is the same for equal arguments regardless of key order
+    """
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+class ToolCache:
+    """Thread-safe LRU/TTL cache of tool results with single-flight execution."""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: Seconds a result stays valid, or None for no expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_policy(cls, policy: CachePolicy) -> "ToolCache":
+        """Create an empty cache configured by a policy."""
+        return cls(maxsize=policy.maxsize, ttl=policy.ttl)
+
+    def get_or_call(self, arguments: Dict[str, Any], compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Get the cached result for the arguments, computing it on a miss.
+
+        If another thread is already computing the same arguments, waits for that
+        result instead of computing it again. Errors are not cached.
+
+        Args:
+            arguments: The tool call arguments
+            compute: Callable producing the result on a miss
+
+        Returns:
+            Tuple of (result, whether it came from the cache or another in-flight call)
+        """
+        key = make_cache_key(arguments)
+        with self._lock:
+            entry = self._fresh_entry(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1], True
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.collapsed += 1
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._put(key, result)
+        future.set_result(result)
+        return result, False
+
+    def lookup(self, arguments: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Get the cached result for the arguments without computing it on a miss.
+
+        Used by batched calls, which compute all their misses at once and then store them.
+
+        Args:
+            arguments: The tool call arguments
+
+        Returns:
+            Tuple of (whether a result was cached, the result or None)
+        """
+        with self._lock:
+            entry = self._fresh_entry(make_cache_key(arguments))
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, entry[1]
+
+    def store(self, arguments: Dict[str, Any], result: Any) -> None:
+        """Cache a result computed outside get_or_call."""
+        with self._lock:
+            self._put(make_cache_key(arguments), result)
+
+    def _fresh_entry(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        """Get an unexpired entry and mark it recently used; call with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, result: Any) -> None:
+        """Add an entry, evicting the least recently used ones; call with the lock held."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss and collapsed-call counts and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "collapsed": self.collapsed, "size": len(self)}
+
+
+# Process-wide caches by qualified function name and id of the owning object
+_process_caches: Dict[Tuple[str, Optional[int]], ToolCache] = {}
+# Owners that can't be weakly referenced, kept alive so that their ids are not reused
+_process_owners: Dict[Tuple[str, Optional[int]], Any] = {}
+_process_lock = threading.Lock()
+
+
+def get_process_cache(qualified_name: str, policy: CachePolicy, owner: Any = None) -> ToolCache:
+    """
+    Get the process-wide cache for a tool, creating it if needed.
+
+    Args:
+        qualified_name: Module and qualified name of the tool's function
+        policy: Policy used if the cache has to be created
+        owner: Object the results also depend on, such as the instance of a
+            method; its cache is dropped when it is garbage collected
+
+    Returns:
+        The cache shared by every tool with the same function and owner
+    """
+    key = (qualified_name, id(owner) if owner is not None else None)
+    with _process_lock:
+        cache = _process_caches.get(key)
+        if cache is None:
+            cache = _process_caches[key] = ToolCache.from_policy(policy)
+            if owner is not None:
+                try:
+                    weakref.finalize(owner, _drop_process_cache, key)
+                except TypeError:
+                    _process_owners[key] = owner
+        return cache
+
+
+def _drop_process_cache(key: Tuple[str, Optional[int]]) -> None:
+    with _process_lock:
+        _process_caches.pop(key, None)
+
+
+def clear_process_caches() -> None:
+    """Drop all process-wide tool caches."""
+    with _process_lock:
+        _process_caches.clear()
+        _process_owners.clear()
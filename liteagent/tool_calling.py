@@ -5,7 +5,12 @@ This module provides utilities for tracking and managing tool calls.
 """
 
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+from collections import deque
+import heapq
+import itertools
+import math
+import threading
 import time
 
 
@@ -18,27 +23,168 @@ class ToolCallRecord:
     timestamp: float
     execution_time: Optional[float] = None
     error: Optional[str] = None
+    cached: bool = False
+    error_type: Optional[str] = None
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory histogram of durations for streaming percentiles.
+    
+    Durations fall into buckets whose bounds grow by a constant factor, so any
+    percentile is reported within a few percent of the true value however many
+    durations are added.
+    """
+    
+    # Smallest and largest tracked durations, in seconds; others go to the edge buckets
+    MIN_SECONDS = 1e-5
+    MAX_SECONDS = 1e4
+    # Buckets per doubling of the duration (percentiles within about 4.5%)
+    BUCKETS_PER_DOUBLING = 8
+    
+    _bucket_count = int(math.ceil(math.log2(MAX_SECONDS / MIN_SECONDS) * BUCKETS_PER_DOUBLING)) + 1
+    
+    def __init__(self):
+        self.counts = [0] * self._bucket_count
+        self.total = 0
+    
+    def add(self, seconds: float) -> None:
+        """Add a duration."""
+        if seconds <= self.MIN_SECONDS:
+            bucket = 0
+        else:
+            bucket = min(self._bucket_count - 1,
+                         int(math.log2(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_DOUBLING) + 1)
+        self.counts[bucket] += 1
+        self.total += 1
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Get an approximate percentile.
+        
+        Args:
+            percent: Percentile between 0 and 100
+            
+        Returns:
+            Duration in seconds (the geometric middle of the bucket holding the
+            percentile), or None if no durations were added
+        """
+        if not self.total:
+            return None
+        rank = max(1, int(math.ceil(self.total * percent / 100)))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if bucket == 0:
+                    return self.MIN_SECONDS
+                return self.MIN_SECONDS * 2 ** ((bucket - 0.5) / self.BUCKETS_PER_DOUBLING)
+        return self.MAX_SECONDS
+
+
+class ToolStats:
+    """Streaming aggregates of one tool's calls."""
+    
+    __slots__ = ("count", "errors", "cached", "total_time", "max_time", "latency")
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cached = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.latency = LatencyHistogram()
+    
+    def add(self, record: ToolCallRecord) -> None:
+        """Add a finished call."""
+        self.count += 1
+        if record.error is not None:
+            self.errors += 1
+        if record.cached:
+            self.cached += 1
+        if record.execution_time is not None:
+            self.total_time += record.execution_time
+            self.max_time = max(self.max_time, record.execution_time)
+            self.latency.add(record.execution_time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the aggregates as plain values; times are in seconds."""
+        timed = self.latency.total
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "cached": self.cached,
+            "mean_time": self.total_time / timed if timed else None,
+            "max_time": self.max_time if timed else None,
+            "p50": self.latency.percentile(50),
+            "p95": self.latency.percentile(95),
+            "p99": self.latency.percentile(99),
+        }
 
 
 class ToolCallTracker:
-    """Tracks tool calls for debugging and analysis."""
+    """
+    Tracks tool calls for debugging and analysis.
+    
+    The tracker is shared by every agent in the process and is safe to use from
+    several threads. It keeps the most recent records of each tool in a ring
+    buffer and per-tool aggregates (counts, errors and latency percentiles) over
+    every call, so its memory stays bounded in long-running services.
+    """
     
     _instance = None
+    _instance_lock = threading.Lock()
     
-    def __init__(self):
-        """Initialize the tool call tracker."""
-        self.calls: List[ToolCallRecord] = []
-        self._call_counts: Dict[str, int] = {}
+    # Records kept per tool unless configured otherwise
+    DEFAULT_MAX_RECORDS_PER_TOOL = 1000
+    
+    def __init__(self, max_records_per_tool: Optional[int] = DEFAULT_MAX_RECORDS_PER_TOOL,
+                 keep_results: bool = True):
+        """
+        Initialize the tool call tracker.
+        
+        Args:
+            max_records_per_tool: Most recent records kept for each tool; older ones
+                are dropped (aggregates still count them). None keeps every record.
+            keep_results: Whether records keep the tools' results; without them,
+                large results are not held in memory
+        """
+        self.max_records_per_tool = max_records_per_tool
+        self.keep_results = keep_results
+        self._lock = threading.Lock()
+        # Per tool, (sequence number, record) pairs in call order
+        self._records: Dict[str, deque] = {}
+        self._stats: Dict[str, ToolStats] = {}
+        self._cache_stats: Dict[str, Dict[str, int]] = {}
+        self._sequence = itertools.count()
     
     @classmethod
     def get_instance(cls):
         """Get the singleton instance of ToolCallTracker."""
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
     
+    def configure(self, max_records_per_tool: Optional[int] = DEFAULT_MAX_RECORDS_PER_TOOL,
+                  keep_results: bool = True) -> None:
+        """
+        Change the retention settings, keeping the newest records that still fit.
+        
+        Args:
+            max_records_per_tool: Most recent records kept for each tool, or None for all
+            keep_results: Whether new records keep the tools' results
+        """
+        with self._lock:
+            self.max_records_per_tool = max_records_per_tool
+            self.keep_results = keep_results
+            self._records = {name: deque(records, maxlen=max_records_per_tool)
+                             for name, records in self._records.items()}
+    
     def record_call(self, name: str, arguments: Dict[str, Any], result: Any = None, 
-                   execution_time: Optional[float] = None, error: Optional[str] = None) -> None:
+                   execution_time: Optional[float] = None, error: Optional[str] = None,
+                   cached: bool = False, error_type: Optional[str] = None) -> None:
         """
         Record a tool call.
         
@@ -48,35 +194,133 @@ class ToolCallTracker:
             result: Result of the tool call
             execution_time: Time taken to execute the tool
             error: Error message if the call failed
+            cached: Whether the result was served by the tool's result cache
+            error_type: Class name of the error, such as "ToolTimeoutError"
         """
         record = ToolCallRecord(
             name=name,
             arguments=arguments,
-            result=result,
+            result=result if self.keep_results else None,
             timestamp=time.time(),
             execution_time=execution_time,
-            error=error
+            error=error,
+            cached=cached,
+            error_type=error_type
         )
         
-        self.calls.append(record)
-        self._call_counts[name] = self._call_counts.get(name, 0) + 1
+        with self._lock:
+            records = self._records.get(name)
+            if records is None:
+                records = self._records[name] = deque(maxlen=self.max_records_per_tool)
+                self._stats[name] = ToolStats()
+            records.append((next(self._sequence), record))
+            self._stats[name].add(record)
+    
+    def record_cache_lookup(self, name: str, hit: bool) -> None:
+        """
+        Record a lookup in a tool's result cache.
+        
+        Args:
+            name: Name of the tool
+            hit: Whether the result was served without executing the tool
+        """
+        with self._lock:
+            stats = self._cache_stats.setdefault(name, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+    
+    def get_cache_stats(self, tool_name: Optional[str] = None) -> Dict[str, int]:
+        """
+        Get result cache hits and misses.
+        
+        Args:
+            tool_name: Tool to report on; totals over all cached tools if None
+            
+        Returns:
+            Dict with "hits" and "misses" counts
+        """
+        with self._lock:
+            if tool_name is not None:
+                return dict(self._cache_stats.get(tool_name, {"hits": 0, "misses": 0}))
+            return {
+                "hits": sum(stats["hits"] for stats in self._cache_stats.values()),
+                "misses": sum(stats["misses"] for stats in self._cache_stats.values())
+            }
     
     def get_call_count(self, tool_name: str) -> int:
-        """Get the number of times a tool was called."""
-        return self._call_counts.get(tool_name, 0)
+        """Get the number of times a tool was called, including calls whose records were dropped."""
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            return stats.count if stats is not None else 0
     
     def was_tool_called(self, tool_name: str) -> bool:
         """Check if a tool was called at least once."""
         return self.get_call_count(tool_name) > 0
     
     def get_calls_for_tool(self, tool_name: str) -> List[ToolCallRecord]:
-        """Get all calls for a specific tool."""
-        return [call for call in self.calls if call.name == tool_name]
+        """Get the kept calls for a specific tool, oldest first."""
+        with self._lock:
+            return [record for _, record in self._records.get(tool_name, ())]
+    
+    @property
+    def calls(self) -> List[ToolCallRecord]:
+        """Get the kept calls of all tools, oldest first."""
+        with self._lock:
+            return [record for _, record in heapq.merge(*self._records.values(), key=lambda item: item[0])]
+    
+    def get_tool_stats(self, tool_name: str) -> Dict[str, Any]:
+        """
+        Get the aggregates of a tool's calls.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            Dict with "count", "errors", "cached", "mean_time", "max_time" and the
+            "p50", "p95" and "p99" execution times in seconds (None before any timed call)
+        """
+        with self._lock:
+            return (self._stats.get(tool_name) or ToolStats()).to_dict()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a consistent, JSON-serializable snapshot of the aggregates.
+        
+        Returns:
+            Dict with "timestamp", "total_calls", "tools" (the get_tool_stats
+            aggregates by tool name) and "cache" (cache hits and misses by tool name)
+        """
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "total_calls": sum(stats.count for stats in self._stats.values()),
+                "tools": {name: stats.to_dict() for name, stats in self._stats.items()},
+                "cache": {name: dict(stats) for name, stats in self._cache_stats.items()},
+            }
+    
+    def export_records(self, include_results: bool = False) -> List[Dict[str, Any]]:
+        """
+        Export the kept records as dicts, oldest first.
+        
+        Args:
+            include_results: Whether to include the tools' results
+            
+        Returns:
+            One dict per record with the ToolCallRecord fields
+        """
+        exported = []
+        for record in self.calls:
+            data = asdict(record)
+            if not include_results:
+                del data["result"]
+            exported.append(data)
+        return exported
     
     def clear(self) -> None:
         """Clear all recorded calls."""
-        self.calls.clear()
-        self._call_counts.clear()
+        with self._lock:
+            self._records.clear()
+            self._stats.clear()
+            self._cache_stats.clear()
     
     def reset(self) -> None:
         """Reset the tracker (alias for clear)."""
@@ -84,13 +328,15 @@ class ToolCallTracker:
     
     @property
     def total_calls(self) -> int:
-        """Get the total number of calls recorded."""
-        return len(self.calls)
+        """Get the total number of calls recorded, including calls whose records were dropped."""
+        with self._lock:
+            return sum(stats.count for stats in self._stats.values())
     
     @property
     def unique_tools_called(self) -> List[str]:
         """Get list of unique tool names that were called."""
-        return list(self._call_counts.keys())
+        with self._lock:
+            return list(self._stats.keys())
     
     def get_tool_args(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -102,10 +348,8 @@ class ToolCallTracker:
         Returns:
             Dict containing the arguments, or None if tool wasn't called
         """
-        calls = self.get_calls_for_tool(tool_name)
-        if calls:
-            return calls[-1].arguments
-        return None
+        record = self._last_record(tool_name)
+        return record.arguments if record is not None else None
     
     def get_tool_result(self, tool_name: str) -> Any:
         """
@@ -116,8 +360,12 @@ class ToolCallTracker:
             
         Returns:
             The result of the most recent call, or None if tool wasn't called
+            (or results are not kept)
         """
-        calls = self.get_calls_for_tool(tool_name)
-        if calls:
-            return calls[-1].result
-        return None
\ No newline at end of file
+        record = self._last_record(tool_name)
+        return record.result if record is not None else None
+    
+    def _last_record(self, tool_name: str) -> Optional[ToolCallRecord]:
+        with self._lock:
+            records = self._records.get(tool_name)
+            return records[-1][1] if records else None
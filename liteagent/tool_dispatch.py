@@ -0,0 +1,545 @@
+"""
+Tool call dispatch for LiteAgent.
+
+Runs the tool calls of a model response and writes their outcomes to the
+conversation: one at a time, on a bounded thread pool (parallel_tool_calls),
+awaited on an event loop (async tools and achat), or grouped into a single call
+of a tool's batch implementation when the same tool is called repeatedly.
+Results pass through the tool's result cache and the agent's tool result policy.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .observer import FunctionCallEvent, FunctionResultEvent
+from .providers import ProviderResponse, ToolCall
+from .tool_cache import ToolCache, get_process_cache
+from .tool_calling import ToolCallTracker
+from .tool_results import READ_RESULT_SLICE
+from .tools import run_coroutine
+from .utils import logger
+
+
+class ToolDispatchMixin:
+    """
+    Tool execution methods of LiteAgent.
+    
+    Expects the agent's tool_instances, memory, parallel_tool_calls,
+    max_tool_workers, name, tool caches and result spiller, and its _emit and
+    _log methods.
+    """
+    
+    def _process_tool_calls(self, tool_calls: List[ToolCall], response: ProviderResponse) -> None:
+        """
+        Process tool calls from the model response.
+        
+        Args:
+            tool_calls: List of tool calls to process
+            response: The model response containing the tool calls
+        """
+        if not self._begin_tool_calls(tool_calls, response):
+            return
+        
+        if len(tool_calls) > 1 and self._has_async_tools(tool_calls):
+            # Await the async tools concurrently on the shared background loop
+            self._emit_function_calls(tool_calls)
+            self._record_tool_outcomes(tool_calls, run_coroutine(self._arun_tool_calls(tool_calls)))
+            return
+        
+        batches = self._plan_tool_batches(tool_calls)
+        if batches:
+            self._emit_function_calls(tool_calls)
+            self._record_tool_outcomes(tool_calls, self._run_tool_batches(tool_calls, batches))
+            return
+        
+        if self.parallel_tool_calls and len(tool_calls) > 1:
+            self._process_tool_calls_parallel(tool_calls)
+            return
+        
+        # Add tool calls to memory
+        for tool_call in tool_calls:
+            self._emit_function_call(tool_call)
+            
+            # Add tool call to memory
+            self.memory.add_tool_call(tool_call.name, tool_call.arguments, tool_call.id)
+            
+            # Execute the tool
+            result, error = self._run_tool_call(tool_call)
+            self._record_tool_outcome(tool_call, result, error)
+    
+    async def _aprocess_tool_calls(self, tool_calls: List[ToolCall], response: ProviderResponse) -> None:
+        """
+        Async counterpart of _process_tool_calls.
+        
+        Async tools are awaited concurrently on the running loop; blocking tools
+        run in the loop's default executor.
+        
+        Args:
+            tool_calls: List of tool calls to process
+            response: The model response containing the tool calls
+        """
+        if not self._has_async_tools(tool_calls):
+            # Run (possibly blocking) tools off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._process_tool_calls, tool_calls, response)
+            return
+        
+        if not self._begin_tool_calls(tool_calls, response):
+            return
+        self._emit_function_calls(tool_calls)
+        self._record_tool_outcomes(tool_calls, await self._arun_tool_calls(tool_calls))
+    
+    def _begin_tool_calls(self, tool_calls: List[ToolCall], response: ProviderResponse) -> bool:
+        """
+        Record the assistant's text and check the tool calls for loops.
+        
+        Args:
+            tool_calls: List of tool calls to process
+            response: The model response containing the tool calls
+            
+        Returns:
+            False if the calls repeat earlier ones and should not be executed
+        """
+        # Add assistant message with tool calls to memory
+        if response.content:
+            # If there's content along with tool calls, add it
+            self.memory.add_assistant_message(response.content)
+            
+        # Check for tool calling loops before processing any tools
+        for tool_call in tool_calls:
+            if self.memory.is_function_call_loop(tool_call.name, tool_call.arguments):
+                logger.warning(f"Detected repeated function call: {tool_call.name} with args {tool_call.arguments}")
+                # Stop here to break the cycle
+                return False
+        return True
+    
+    def _process_tool_calls_parallel(self, tool_calls: List[ToolCall]) -> None:
+        """
+        Execute independent tool calls concurrently on a bounded thread pool.
+        
+        All calls are dispatched up front; results are then written to memory in the
+        original tool call order so the conversation looks the same as in sequential mode.
+        
+        Args:
+            tool_calls: List of tool calls to process
+        """
+        self._emit_function_calls(tool_calls)
+        
+        max_workers = max(1, min(self.max_tool_workers, len(tool_calls)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.name}-tool") as executor:
+            futures = [executor.submit(self._run_tool_call, tool_call) for tool_call in tool_calls]
+            self._record_tool_outcomes(tool_calls, (future.result() for future in futures))
+    
+    def _record_tool_outcomes(self, tool_calls: List[ToolCall],
+                              outcomes: Iterable[Tuple[Any, Optional[Exception]]]) -> None:
+        """Write the calls and their (result, error) outcomes to memory in call order."""
+        for tool_call, (result, error) in zip(tool_calls, outcomes):
+            self.memory.add_tool_call(tool_call.name, tool_call.arguments, tool_call.id)
+            self._record_tool_outcome(tool_call, result, error)
+    
+    def _has_async_tools(self, tool_calls: List[ToolCall]) -> bool:
+        """Check whether any of the calls goes to an async tool."""
+        return any(self._is_async_tool(tool_call.name) for tool_call in tool_calls)
+    
+    def _is_async_tool(self, tool_name: str) -> bool:
+        """Check whether a tool can be awaited directly (async and not behind a result cache)."""
+        tool_instance = self.tool_instances.get(tool_name)
+        return (getattr(tool_instance, 'is_async', False)
+                and getattr(tool_instance, 'cache_policy', None) is None)
+    
+    async def _arun_tool_calls(self, tool_calls: List[ToolCall]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Run tool calls on the current event loop.
+        
+        Async tools are awaited concurrently. Blocking tools run in the loop's default
+        executor, one at a time unless parallel_tool_calls is set.
+        
+        Args:
+            tool_calls: List of tool calls to run
+            
+        Returns:
+            List of (result, error) tuples in call order
+        """
+        loop = asyncio.get_running_loop()
+        blocking_lock = None if self.parallel_tool_calls else asyncio.Lock()
+        
+        async def run(tool_call: ToolCall):
+            if self._is_async_tool(tool_call.name):
+                return await self._arun_tool_call(tool_call)
+            if blocking_lock is None:
+                return await loop.run_in_executor(None, self._run_tool_call, tool_call)
+            async with blocking_lock:
+                return await loop.run_in_executor(None, self._run_tool_call, tool_call)
+        
+        async def run_batch(calls: List[ToolCall]):
+            if blocking_lock is None or self._is_async_batch(calls[0].name):
+                return await self._arun_tool_batch(calls)
+            async with blocking_lock:
+                return await self._arun_tool_batch(calls)
+        
+        async def run_unit(unit: List[int]):
+            if len(unit) > 1:
+                return await run_batch([tool_calls[position] for position in unit])
+            return [await run(tool_calls[unit[0]])]
+        
+        batches = self._plan_tool_batches(tool_calls)
+        if not batches:
+            return list(await asyncio.gather(*(run(tool_call) for tool_call in tool_calls)))
+        
+        units = self._tool_call_units(tool_calls, batches)
+        return self._gather_unit_outcomes(len(tool_calls), units,
+                                          await asyncio.gather(*(run_unit(unit) for unit in units)))
+    
+    def _plan_tool_batches(self, tool_calls: List[ToolCall]) -> List[List[int]]:
+        """
+        Group repeated calls of tools that have a batch implementation.
+        
+        Args:
+            tool_calls: List of tool calls from one model response
+            
+        Returns:
+            Positions of the calls in each batch, for tools called more than once
+        """
+        if len(tool_calls) < 2:
+            return []
+        groups: Dict[str, List[int]] = {}
+        for position, tool_call in enumerate(tool_calls):
+            if getattr(self.tool_instances.get(tool_call.name), 'batch', None) is not None:
+                groups.setdefault(tool_call.name, []).append(position)
+        return [positions for positions in groups.values() if len(positions) > 1]
+    
+    def _is_async_batch(self, tool_name: str) -> bool:
+        """Check whether a tool's batch implementation is a coroutine function."""
+        return inspect.iscoroutinefunction(getattr(self.tool_instances.get(tool_name), 'batch', None))
+    
+    @staticmethod
+    def _tool_call_units(tool_calls: List[ToolCall], batches: List[List[int]]) -> List[List[int]]:
+        """Split call positions into the batches and one unit per remaining call."""
+        batched = {position for batch in batches for position in batch}
+        return batches + [[position] for position in range(len(tool_calls)) if position not in batched]
+    
+    @staticmethod
+    def _gather_unit_outcomes(count: int, units: List[List[int]],
+                              unit_outcomes: Iterable[List[Tuple[Any, Optional[Exception]]]]) -> list:
+        """Put the outcomes of each unit back in call order."""
+        outcomes = [None] * count
+        for unit, results in zip(units, unit_outcomes):
+            for position, outcome in zip(unit, results):
+                outcomes[position] = outcome
+        return outcomes
+    
+    def _run_tool_batches(self, tool_calls: List[ToolCall],
+                          batches: List[List[int]]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Run batched and remaining tool calls, concurrently if parallel_tool_calls is set.
+        
+        Args:
+            tool_calls: List of tool calls to run
+            batches: Positions of the calls in each batch (see _plan_tool_batches)
+            
+        Returns:
+            List of (result, error) tuples in call order
+        """
+        units = self._tool_call_units(tool_calls, batches)
+        
+        def run(unit: List[int]) -> List[Tuple[Any, Optional[Exception]]]:
+            if len(unit) > 1:
+                return self._run_tool_batch([tool_calls[position] for position in unit])
+            return [self._run_tool_call(tool_calls[unit[0]])]
+        
+        if self.parallel_tool_calls and len(units) > 1:
+            max_workers = max(1, min(self.max_tool_workers, len(units)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.name}-tool") as executor:
+                unit_outcomes = list(executor.map(run, units))
+        else:
+            unit_outcomes = [run(unit) for unit in units]
+        return self._gather_unit_outcomes(len(tool_calls), units, unit_outcomes)
+    
+    def _run_tool_batch(self, tool_calls: List[ToolCall]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Execute calls of one tool with a single call of its batch implementation.
+        
+        Cached results are served first; only the misses go into the batch.
+        
+        Args:
+            tool_calls: The calls, all of the same tool
+            
+        Returns:
+            List of (result, error) tuples, one per call
+        """
+        tool_name = tool_calls[0].name
+        tool_instance = self.tool_instances[tool_name]
+        cache = self._get_tool_cache(tool_name, tool_instance)
+        lookups = [cache.lookup(tool_call.arguments) if cache is not None else (False, None)
+                   for tool_call in tool_calls]
+        pending = [tool_call.arguments for tool_call, (cached, _) in zip(tool_calls, lookups) if not cached]
+        
+        start_time = time.time()
+        results = []
+        if pending:
+            self._log(f"Executing {len(pending)} calls of {tool_name} as one batch")
+            try:
+                results = tool_instance.execute_batch(pending)
+            except Exception as e:
+                self._log(f"Error executing batch of {tool_name}: {str(e)}")
+                results = [e] * len(pending)
+        return self._scatter_batch_results(tool_calls, lookups, results, start_time, cache)
+    
+    async def _arun_tool_batch(self, tool_calls: List[ToolCall]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Async counterpart of _run_tool_batch.
+        
+        Async batch implementations of uncached tools are awaited on the running
+        loop; anything else runs in the loop's default executor.
+        """
+        tool_name = tool_calls[0].name
+        tool_instance = self.tool_instances[tool_name]
+        if not self._is_async_batch(tool_name) or getattr(tool_instance, 'cache_policy', None) is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._run_tool_batch, tool_calls)
+        
+        start_time = time.time()
+        self._log(f"Executing {len(tool_calls)} calls of {tool_name} as one batch")
+        try:
+            results = await tool_instance.aexecute_batch([tool_call.arguments for tool_call in tool_calls])
+        except Exception as e:
+            self._log(f"Error executing batch of {tool_name}: {str(e)}")
+            results = [e] * len(tool_calls)
+        return self._scatter_batch_results(tool_calls, [(False, None)] * len(tool_calls), results, start_time)
+    
+    def _scatter_batch_results(self, tool_calls: List[ToolCall], lookups: List[Tuple[bool, Any]], results: List[Any],
+                               start_time: float, cache: Optional[ToolCache] = None
+                               ) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Turn a batch's results into per-call outcomes, tracking each call.
+        
+        Args:
+            tool_calls: The calls, all of the same tool
+            lookups: (cached, result) cache lookup of each call
+            results: Batch results for the calls that were not cached, in order;
+                Exception instances mark failed calls
+            start_time: When the batch started
+            cache: The tool's result cache, which new results are stored in
+            
+        Returns:
+            List of (result, error) tuples, one per call
+        """
+        tool_name = tool_calls[0].name
+        results = iter(results)
+        outcomes = []
+        for tool_call, (cached, value) in zip(tool_calls, lookups):
+            if cache is not None:
+                ToolCallTracker.get_instance().record_cache_lookup(tool_name, hit=cached)
+            if not cached:
+                value = next(results)
+                if isinstance(value, Exception):
+                    self._track_tool_call(tool_name, tool_call.arguments, start_time, error=value)
+                    outcomes.append((None, value))
+                    continue
+                if cache is not None:
+                    cache.store(tool_call.arguments, value)
+            self._track_tool_call(tool_name, tool_call.arguments, start_time, result=value, cached=cached)
+            outcomes.append((value, None))
+        return outcomes
+    
+    def _emit_function_calls(self, tool_calls: List[ToolCall]) -> None:
+        """Emit a function call event for each tool call."""
+        for tool_call in tool_calls:
+            self._emit_function_call(tool_call)
+    
+    def _emit_function_call(self, tool_call: ToolCall) -> None:
+        """Emit a function call event for a tool call."""
+        self._emit(FunctionCallEvent, function_name=tool_call.name, function_args=tool_call.arguments)
+    
+    def _run_tool_call(self, tool_call: ToolCall):
+        """
+        Execute a single tool call, capturing any error.
+        
+        Args:
+            tool_call: The tool call to execute
+            
+        Returns:
+            Tuple of (result, error). The error is None on success.
+        """
+        try:
+            self._log(f"Executing tool: {tool_call.name} with args: {tool_call.arguments}")
+            result = self._execute_tool(tool_call.name, tool_call.arguments)
+            self._log(f"Tool {tool_call.name} result: {str(result)[:200]}...")
+            return result, None
+        except Exception as e:
+            self._log(f"Error executing {tool_call.name}: {str(e)}")
+            return None, e
+    
+    async def _arun_tool_call(self, tool_call: ToolCall):
+        """
+        Await a single async tool call, capturing any error.
+        
+        Args:
+            tool_call: The tool call to execute
+            
+        Returns:
+            Tuple of (result, error). The error is None on success.
+        """
+        try:
+            self._log(f"Executing tool: {tool_call.name} with args: {tool_call.arguments}")
+            result = await self._aexecute_tool(tool_call.name, tool_call.arguments)
+            self._log(f"Tool {tool_call.name} result: {str(result)[:200]}...")
+            return result, None
+        except Exception as e:
+            self._log(f"Error executing {tool_call.name}: {str(e)}")
+            return None, e
+    
+    def _record_tool_outcome(self, tool_call: ToolCall, result: Any, error: Optional[Exception]) -> None:
+        """
+        Emit the result event and store the tool result in memory.
+        
+        Args:
+            tool_call: The tool call that was executed
+            result: The tool result (ignored when error is set)
+            error: The exception raised if the tool failed
+        """
+        if error is not None:
+            error_msg = f"Error executing {tool_call.name}: {str(error)}"
+            self._emit(FunctionResultEvent, function_name=tool_call.name, function_call_id=tool_call.id,
+                       error=error_msg, error_type=type(error).__name__)
+            # Add error result to memory, so the model can recover
+            self.memory.add_tool_result(tool_call.name, error_msg, tool_call.id, is_error=True)
+            return
+        
+        # Emit function result event
+        self._emit(FunctionResultEvent, function_name=tool_call.name, result=result)
+        
+        # Add result to memory
+        content = str(result)
+        if self._result_spiller is not None and tool_call.name != READ_RESULT_SLICE:
+            content = self._limit_tool_result(content)
+        self.memory.add_tool_result(tool_call.name, content, tool_call.id)
+    
+    def _limit_tool_result(self, content: str) -> str:
+        """
+        Apply the tool result policy to a result's text.
+        
+        Args:
+            content: The full result text
+            
+        Returns:
+            The text to keep in the conversation
+        """
+        limited = self._result_spiller.limit(content)
+        if limited is not content:
+            self._log(f"Stored a {len(content)} character tool result out of the conversation")
+            if self._turn_tools is not None:
+                # The model needs the reader to page through the stored result
+                self._turn_tools = self._turn_tools | {READ_RESULT_SLICE}
+        return limited
+                
+    def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Execute a tool function.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            arguments: Arguments to pass to the tool
+            
+        Returns:
+            The result of the tool execution
+        """
+        if tool_name not in self.tool_instances:
+            raise ValueError(f"Tool {tool_name} not found")
+            
+        tool_instance = self.tool_instances[tool_name]
+        cache = self._get_tool_cache(tool_name, tool_instance)
+        
+        start_time = time.time()
+        
+        try:
+            if cache is not None:
+                result, cached = cache.get_or_call(
+                    arguments, lambda: self._invoke_tool(tool_name, tool_instance, arguments))
+                ToolCallTracker.get_instance().record_cache_lookup(tool_name, hit=cached)
+            else:
+                result, cached = self._invoke_tool(tool_name, tool_instance, arguments), False
+        except Exception as e:
+            self._track_tool_call(tool_name, arguments, start_time, error=e)
+            raise  # Re-raise the original exception
+        
+        self._track_tool_call(tool_name, arguments, start_time, result=result, cached=cached)
+        return result
+    
+    async def _aexecute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Await an async tool.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            arguments: Arguments to pass to the tool
+            
+        Returns:
+            The result of the tool execution
+        """
+        if tool_name not in self.tool_instances:
+            raise ValueError(f"Tool {tool_name} not found")
+        
+        start_time = time.time()
+        
+        try:
+            result = await self.tool_instances[tool_name].aexecute(**arguments)
+        except Exception as e:
+            self._track_tool_call(tool_name, arguments, start_time, error=e)
+            raise
+        
+        self._track_tool_call(tool_name, arguments, start_time, result=result)
+        return result
+    
+    def _track_tool_call(self, tool_name: str, arguments: Dict[str, Any], start_time: float, result: Any = None,
+                         error: Optional[Exception] = None, cached: bool = False) -> None:
+        """Record a finished tool call with the ToolCallTracker."""
+        ToolCallTracker.get_instance().record_call(
+            name=tool_name,
+            arguments=arguments,
+            result=result,
+            execution_time=time.time() - start_time,
+            error=str(error) if error is not None else None,
+            error_type=type(error).__name__ if error is not None else None,
+            cached=cached
+        )
+    
+    def _invoke_tool(self, tool_name: str, tool_instance: Any, arguments: Dict[str, Any]) -> Any:
+        """Call a tool object or function with the given arguments."""
+        if hasattr(tool_instance, 'execute'):
+            # For tool objects
+            return tool_instance.execute(**arguments)
+        elif callable(tool_instance):
+            # For function objects, running coroutine functions to completion
+            result = tool_instance(**arguments)
+            return run_coroutine(result) if inspect.iscoroutine(result) else result
+        raise ValueError(f"Tool {tool_name} is not executable")
+    
+    def _get_tool_cache(self, tool_name: str, tool_instance: Any) -> Optional[ToolCache]:
+        """
+        Get the result cache for a tool according to its cache policy.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_instance: The tool object
+            
+        Returns:
+            The cache for the current scope, or None if the tool is not cached
+        """
+        policy = getattr(tool_instance, 'cache_policy', None)
+        if policy is None:
+            return None
+        if policy.scope == "process":
+            qualified_name, owner = tool_instance.cache_identity()
+            return get_process_cache(qualified_name, policy, owner)
+        if policy.scope == "conversation":
+            caches = self._conversation_tool_caches.setdefault(self.memory, {})
+        else:
+            caches = self._tool_caches
+        cache = caches.get(tool_name)
+        if cache is None:
+            cache = caches.setdefault(tool_name, ToolCache.from_policy(policy))
+        return cache
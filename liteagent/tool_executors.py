@@ -0,0 +1,166 @@
+"""
+Execution backends for blocking tools.
+
+Tools choose a backend with ``@liteagent_tool(executor=...)``:
+
+- ``"inline"`` (default): run in the calling thread
+- ``"thread"``: run on a shared thread pool
+- ``"process"``: run on a shared, warm process pool, so CPU-bound tools don't
+  hold the GIL of the agent's process. Arguments and results are pickled; the
+  tool's function must be importable (defined at module level), and instance
+  method tools need a picklable ``instance_factory`` to build their instance
+  inside the worker.
+"""
+
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when a tool call exceeds its timeout, including time spent waiting for a concurrency slot."""
+
+    def __init__(self, tool_name: str, timeout: float):
+        super().__init__(f"Tool {tool_name} timed out after {timeout:g}s")
+        self.tool_name = tool_name
+        self.timeout = timeout
+
+_pools: Dict[str, Executor] = {}
+_pool_sizes: Dict[str, Optional[int]] = {"thread": None, "process": None}
+_pools_lock = threading.Lock()
+
+# Instances built by instance factories in this process, by pickled factory
+_worker_instances: Dict[bytes, Any] = {}
+
+
+def check_executor(option: Optional[str]) -> Optional[str]:
+    """
+    Validate the ``executor`` option of a tool.
+
+    Args:
+        option: One of EXECUTOR_KINDS, or None to leave it unset
+
+    Returns:
+        The option
+    """
+    if option is not None and option not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown tool executor {option!r}; expected one of {EXECUTOR_KINDS}")
+    return option
+
+
+def configure_tool_executors(thread_workers: Optional[int] = None, process_workers: Optional[int] = None) -> None:
+    """
+    Set the size of the shared pools, replacing pools that are already running.
+
+    Args:
+        thread_workers: Threads in the tool thread pool (None for the executor default)
+        process_workers: Processes in the tool process pool (None for one per CPU)
+    """
+    shutdown_tool_executors()
+    with _pools_lock:
+        _pool_sizes["thread"] = thread_workers
+        _pool_sizes["process"] = process_workers
+
+
+def get_tool_executor(kind: str) -> Executor:
+    """
+    Get the shared pool for an executor kind, starting it if needed.
+
+    Args:
+        kind: "thread" or "process"
+
+    Returns:
+        The pool
+    """
+    with _pools_lock:
+        pool = _pools.get(kind)
+        if pool is None:
+            if kind == "thread":
+                pool = ThreadPoolExecutor(max_workers=_pool_sizes["thread"], thread_name_prefix="liteagent-tool")
+            elif kind == "process":
+                # Spawned workers don't inherit the parent's threads and locks
+                pool = ProcessPoolExecutor(max_workers=_pool_sizes["process"],
+                                           mp_context=multiprocessing.get_context("spawn"))
+            else:
+                raise ValueError(f"No pool for tool executor {kind!r}")
+            _pools[kind] = pool
+        return pool
+
+
+def warm_process_pool() -> None:
+    """Start every worker of the tool process pool ahead of the first call."""
+    pool = get_tool_executor("process")
+    workers = _pool_sizes["process"] or multiprocessing.cpu_count()
+    for future in [pool.submit(_noop) for _ in range(workers)]:
+        future.result()
+
+
+def shutdown_tool_executors(wait: bool = True) -> None:
+    """Shut down the shared tool pools; they are restarted on next use."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def run_in_tool_executor(kind: str, func: Callable, kwargs: Dict[str, Any]) -> Any:
+    """
+    Run a function with keyword arguments on a tool executor and wait for the result.
+
+    Args:
+        kind: One of EXECUTOR_KINDS
+        func: The function to run (picklable for "process")
+        kwargs: Its keyword arguments
+
+    Returns:
+        The function's result
+    """
+    if kind == "inline":
+        return func(**kwargs)
+    return submit_to_tool_executor(kind, func, kwargs).result()
+
+
+def submit_to_tool_executor(kind: str, func: Callable, kwargs: Dict[str, Any]) -> Future:
+    """
+    Start a function with keyword arguments on the thread or process pool.
+
+    Args:
+        kind: "thread" or "process"
+        func: The function to run (picklable for "process")
+        kwargs: Its keyword arguments
+
+    Returns:
+        Future for the function's result
+    """
+    return get_tool_executor(kind).submit(_call, func, kwargs)
+
+
+def call_instance_method(factory_pickle: bytes, method_name: str, **kwargs) -> Any:
+    """
+    Call a method on the instance built by a pickled factory, building it once per process.
+
+    Args:
+        factory_pickle: Pickled callable returning the instance
+        method_name: Name of the method to call
+        **kwargs: The method's arguments
+
+    Returns:
+        The method's result
+    """
+    instance = _worker_instances.get(factory_pickle)
+    if instance is None:
+        instance = _worker_instances.setdefault(factory_pickle, pickle.loads(factory_pickle)())
+    return getattr(instance, method_name)(**kwargs)
+
+
+def _call(func: Callable, kwargs: Dict[str, Any]) -> Any:
+    return func(**kwargs)
+
+
+def _noop() -> None:
+    return None
@@ -0,0 +1,152 @@
+"""
+Size limits for tool results kept in the conversation.
+
+A tool result is sent again with every later request of its conversation, so a
+single large result inflates every prompt after it. With a ToolResultPolicy,
+results longer than ``max_chars`` are stored out of band in a blob store (in
+memory, or on disk with ``BlobStore(root=...)``) and replaced in the
+conversation by a preview and a handle. The agent registers a
+``read_result_slice`` tool the model can call with the handle to page through
+the rest.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+from .blob_store import BlobStore, get_blob_store
+from .tools import InstanceMethodTool
+
+# Name of the tool that pages through stored results
+READ_RESULT_SLICE = "read_result_slice"
+
+# Handles are blob digests; anything else is rejected before it reaches the store's paths
+_HANDLE_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class ToolResultPolicy:
+    """
+    How large tool results are kept out of the conversation.
+
+    Attributes:
+        max_chars: Results longer than this many characters are stored out of band
+        preview_chars: Characters of a stored result kept in the conversation, and
+            the default page size of read_result_slice
+        store: Blob store holding the full results; defaults to the global store
+    """
+    max_chars: int = 20000
+    preview_chars: int = 2000
+    store: Optional[BlobStore] = None
+
+    def __post_init__(self):
+        if not 0 < self.preview_chars <= self.max_chars:
+            raise ValueError("preview_chars must be positive and at most max_chars")
+
+    @classmethod
+    def from_option(cls, option: Union[int, Dict[str, Any], "ToolResultPolicy", None]) -> Optional["ToolResultPolicy"]:
+        """
+        Build a policy from the ``tool_result_policy`` option of an agent.
+
+        Args:
+            option: A maximum number of characters, a dict of policy fields, a
+                ToolResultPolicy, or None to keep results whole
+
+        Returns:
+            The policy, or None if results are kept whole
+        """
+        if option is None or isinstance(option, ToolResultPolicy):
+            return option
+        if isinstance(option, bool):
+            raise TypeError(f"Invalid tool result policy: {option!r}")
+        if isinstance(option, int):
+            return cls(max_chars=option, preview_chars=min(cls.preview_chars, option))
+        if isinstance(option, dict):
+            return cls(**option)
+        raise TypeError(f"Invalid tool result policy: {option!r}")
+
+
+class ToolResultSpiller:
+    """Moves oversized tool results into a blob store and reads them back in slices."""
+
+    # Decoded results kept for paging through them
+    TEXT_CACHE_SIZE = 4
+
+    def __init__(self, policy: ToolResultPolicy):
+        """
+        Initialize the spiller.
+
+        Args:
+            policy: Size limits and the store to use
+        """
+        self.policy = policy
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def store(self) -> BlobStore:
+        # Not `or`: an empty store is falsy
+        return self.policy.store if self.policy.store is not None else get_blob_store()
+
+    def limit(self, content: str) -> str:
+        """
+        Get the conversation text for a tool result.
+
+        Args:
+            content: The full result text
+
+        Returns:
+            The content itself if it is within max_chars, otherwise a preview
+            followed by the handle of the stored result
+        """
+        if len(content) <= self.policy.max_chars:
+            return content
+        handle = self.store.put(content.encode("utf-8"))
+        preview = content[:self.policy.preview_chars]
+        return (f"{preview}\n\n[Result truncated: showing characters 0-{len(preview)} of {len(content)}. "
+                f'Call {READ_RESULT_SLICE}(handle="{handle}", offset={len(preview)}) to read more.]')
+
+    def read_result_slice(self, handle: str, offset: int = 0, length: Optional[int] = None) -> str:
+        """
+        Read part of a tool result that was too large to include in the conversation.
+
+        Args:
+            handle: The handle given in the truncated result
+            offset: Character position to start reading at
+            length: Number of characters to read
+        """
+        text = self._text(handle)
+        length = min(length or self.policy.preview_chars, self.policy.max_chars)
+        offset = min(max(0, offset), len(text))
+        end = min(offset + length, len(text))
+        if end < len(text):
+            footer = (f"[Characters {offset}-{end} of {len(text)}. "
+                      f'Call {READ_RESULT_SLICE}(handle="{handle}", offset={end}) to read more.]')
+        else:
+            footer = f"[End of result: characters {offset}-{end} of {len(text)}.]"
+        return f"{text[offset:end]}\n\n{footer}"
+
+    def as_tool(self) -> InstanceMethodTool:
+        """Get the read_result_slice tool for an agent."""
+        return InstanceMethodTool(self.read_result_slice, self, name=READ_RESULT_SLICE)
+
+    def _text(self, handle: str) -> str:
+        """Get a stored result's text, decoding it once while it is being paged through."""
+        if not _HANDLE_PATTERN.fullmatch(handle):
+            raise ValueError(f"Invalid result handle {handle!r}")
+        with self._lock:
+            text = self._texts.get(handle)
+            if text is not None:
+                self._texts.move_to_end(handle)
+                return text
+        try:
+            text = self.store.get(handle).decode("utf-8")
+        except KeyError:
+            raise ValueError(f"No stored result with handle {handle!r}") from None
+        with self._lock:
+            self._texts[handle] = text
+            while len(self._texts) > self.TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        return text
@@ -0,0 +1,169 @@
+"""
+Relevance-based selection of the tools sent with each request.
+
+An agent with many tools pays for every tool schema on every model call. With a
+ToolRetriever the agent sends only the tools most relevant to the user's
+message: a BM25 index over each tool's name, description and parameter names is
+built when tools are registered, and the top-k tools (plus any pinned tools)
+are picked once per turn. A tool the model calls from outside the subset is
+added to it and the request is retried.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Splits identifiers and prose into words: "getWeather", "get_weather" and "get weather" all match
+_WORD_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+# Words that say nothing about what a tool does, including docstring section headers
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from get has have if in into is it its of on or so that the their this to
+    was were will with you your args arguments returns return raises optional default defaults none true false
+""".split())
+
+# Name words count more than description words
+_NAME_WEIGHT = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms, dropping stopwords.
+
+    Args:
+        text: Tool name, description or user message
+
+    Returns:
+        The terms, in order
+    """
+    return [word for word in (match.lower() for match in _WORD_PATTERN.findall(text or ""))
+            if word not in _STOPWORDS]
+
+
+class ToolIndex:
+    """
+    BM25 index over a set of tool definitions.
+
+    The index is immutable; agents build a new one whenever their tools change.
+    """
+
+    def __init__(self, tools: Iterable[Dict[str, Any]], k1: float = 1.2, b: float = 0.75):
+        """
+        Build the index.
+
+        Args:
+            tools: Tool definitions, in OpenAI tools format or as bare function definitions
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        documents = []
+        for tool in tools:
+            definition = tool.get('function', tool)
+            name = definition.get('name')
+            if not name:
+                continue
+            terms = tokenize(name) * _NAME_WEIGHT + tokenize(definition.get('description', ''))
+            for parameter in (definition.get('parameters') or {}).get('properties', {}):
+                terms.extend(tokenize(parameter))
+            self._positions[name] = len(self.names)
+            self.names.append(name)
+            documents.append(Counter(terms))
+
+        count = len(documents)
+        average_length = sum(sum(terms.values()) for terms in documents) / count if count else 0
+        # Per term, the (document, BM25 term weight) pairs of the documents containing it
+        self._postings: Dict[str, List[tuple]] = {}
+        for position, terms in enumerate(documents):
+            length_norm = k1 * (1 - b + b * sum(terms.values()) / average_length) if average_length else k1
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, []).append(
+                    (position, frequency * (k1 + 1) / (frequency + length_norm)))
+        self._idf = {term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                     for term, postings in self._postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """
+        Find the tools most relevant to a query.
+
+        Args:
+            query: Text to match, usually the user's message
+            limit: Maximum number of tools to return
+
+        Returns:
+            Tool names, best match first. Tools matching no query term are left out.
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, weight in self._postings[term]:
+                scores[position] = scores.get(position, 0.0) + idf * weight
+        # Ties go to the tool registered first
+        best = heapq.nsmallest(limit, scores, key=lambda position: (-scores[position], position))
+        return [self.names[position] for position in best]
+
+
+class ToolRetriever:
+    """
+    Picks the tools an agent sends with each turn.
+
+    Example:
+        agent = LiteAgent(model="gpt-4o-mini", name="ops", tools=many_tools,
+                          tool_retriever=ToolRetriever(top_k=8, pinned=["search_docs"]))
+    """
+
+    def __init__(self, top_k: int = 8, pinned: Optional[Iterable[str]] = None, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize the retriever.
+
+        Args:
+            top_k: Number of tools picked by relevance for each turn
+            pinned: Names of tools sent with every turn, in addition to the top_k
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        self.top_k = top_k
+        self.pinned = tuple(pinned or ())
+        self.k1 = k1
+        self.b = b
+
+    def build_index(self, tools: Iterable[Dict[str, Any]]) -> ToolIndex:
+        """
+        Index a set of tool definitions.
+
+        Args:
+            tools: Tool definitions, in OpenAI tools format or as bare function definitions
+
+        Returns:
+            The index
+        """
+        return ToolIndex(tools, k1=self.k1, b=self.b)
+
+    def select(self, index: ToolIndex, query: str) -> List[str]:
+        """
+        Pick the tools for a turn.
+
+        Args:
+            index: Index of the agent's tools
+            query: The user's message
+
+        Returns:
+            Names of the pinned tools that exist, followed by up to top_k of the
+            most relevant other tools
+        """
+        pinned = [name for name in self.pinned if name in index]
+        matches = [name for name in index.search(query, self.top_k + len(pinned)) if name not in pinned]
+        return pinned + matches[:self.top_k]
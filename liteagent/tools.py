@@ -5,15 +5,140 @@ This module provides functionality for registering and managing tools
 that can be used by the agent to perform various tasks.
 """
 
-from pydantic import create_model, BaseModel
+from pydantic import create_model, BaseModel, TypeAdapter
+import asyncio
+import concurrent.futures
+import dataclasses
 import inspect
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import threading
+import time
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+import copy
 import functools
+import pickle
 import random
+import weakref
+from collections.abc import Mapping
+
+from typing_extensions import TypedDict
+
+from .tool_cache import CachePolicy
+from .tool_executors import ToolTimeoutError, call_instance_method, check_executor, submit_to_tool_executor
 
 # Global registry for tools
 TOOLS = {}
 
+# Marks a tool whose argument validator has not been compiled yet
+_NOT_COMPILED = object()
+
+# Schemas built for each function, by what else shapes them (see BaseTool._schema_key)
+_schema_cache: "weakref.WeakKeyDictionary[Callable, Dict[tuple, _CachedSchema]]" = weakref.WeakKeyDictionary()
+_schema_cache_lock = threading.Lock()
+
+
+class _CachedSchema:
+    """A tool schema model and its JSON schema, built once and shared by equivalent tools."""
+    
+    __slots__ = ("model", "json_schema")
+    
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.json_schema: Optional[Dict[str, Any]] = None
+
+
+def clear_schema_cache() -> None:
+    """Drop all memoized tool schemas."""
+    with _schema_cache_lock:
+        _schema_cache.clear()
+
+
+# Event loop that runs async tools for callers without one of their own
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared background event loop for async tools, starting it on first use."""
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="liteagent-async-tools", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+def run_coroutine(coro) -> Any:
+    """
+    Run a coroutine to completion from synchronous code on the shared background loop.
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Cannot block on the background tool loop from inside it; await the tool instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until a monotonic deadline, or None for no deadline."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _is_structured(annotation: Any) -> bool:
+    """
+    Check whether an annotation is one the schema model dumps differently than it validates.
+    
+    Nested models and dataclasses are turned back into dicts by model_dump(), and
+    string or forward references are resolved against the schema's module; tools
+    using them keep the model path so their functions receive the same values.
+    """
+    if isinstance(annotation, (str, typing.ForwardRef)):
+        return True
+    if isinstance(annotation, type) and (issubclass(annotation, BaseModel) or dataclasses.is_dataclass(annotation)):
+        return True
+    return any(_is_structured(arg) for arg in typing.get_args(annotation))
+
+class _RegisteredTool(Mapping):
+    """
+    Entry of the global TOOLS registry.
+    
+    Reads as {"schema": ..., "function": ..., "tool": ...}; the schema is only
+    built when it is first looked up.
+    """
+    
+    __slots__ = ("tool",)
+    _KEYS = ("schema", "function", "tool")
+    
+    def __init__(self, tool: "BaseTool"):
+        self.tool = tool
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "schema":
+            return self.tool.schema
+        if key == "function":
+            return self.tool.func
+        if key == "tool":
+            return self.tool
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
 class ToolsForAgents:
     """
     A class containing tools that can be used by agents.
@@ -60,7 +185,9 @@ class ToolsForAgents:
 class BaseTool:
     """Base class for all tools."""
     
-    def __init__(self, func: Callable, name: Optional[str] = None, description: Optional[str] = None):
+    def __init__(self, func: Callable, name: Optional[str] = None, description: Optional[str] = None,
+                 cache=None, executor: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, batch: Optional[Callable] = None):
         """
         Initialize a tool.
         
@@ -68,13 +195,97 @@ class BaseTool:
             func: The function to use as a tool
             name: Optional name for the tool (defaults to function name)
             description: Optional description (defaults to function docstring)
+            cache: Optional result caching (see CachePolicy.from_option). Defaults to
+                the option given to @liteagent_tool, if any.
+            executor: Where the tool runs: "inline", "thread" or "process" (see
+                tool_executors). Defaults to the option given to @liteagent_tool, or "inline".
+            timeout: Seconds a call may take, including waiting for a concurrency slot,
+                before it fails with ToolTimeoutError. Blocking inline tools with a timeout
+                run on the thread pool. Defaults to the option given to @liteagent_tool.
+            max_concurrency: Maximum number of calls running at once. Defaults to the
+                option given to @liteagent_tool, whose limit is shared by every tool
+                instance of the function.
+            batch: Optional bulk implementation taking a list of argument dicts and
+                returning one result per dict, in order (see execute_batch). Defaults
+                to the option given to @liteagent_tool.
         """
         self.func = func
         self.name = name or func.__name__
         self.raw_description = description or func.__doc__ or f"Execute {self.name}"
-        self.description = self._clean_docstring(self.raw_description)
-        self.schema = self._create_schema()
+        # Built on first use, so registering a large number of tools stays cheap
+        self._description: Optional[str] = None
+        self._schema: Optional[_CachedSchema] = None
+        self._validator = _NOT_COMPILED
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.cache_policy = CachePolicy.from_option(cache) or getattr(func, "_liteagent_cache", None)
+        self.executor = check_executor(executor) or getattr(func, "_liteagent_executor", None) or "inline"
+        if self.is_async and self.executor != "inline":
+            raise ValueError(f"Async tool {self.name} runs on an event loop and cannot use the "
+                             f"{self.executor!r} executor")
+        self.timeout = timeout if timeout is not None else getattr(func, "_liteagent_timeout", None)
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+            self._slots = threading.BoundedSemaphore(max_concurrency)
+        else:
+            self.max_concurrency = getattr(func, "_liteagent_max_concurrency", None)
+            self._slots = getattr(func, "_liteagent_slots", None)
+        self.batch = batch if batch is not None else getattr(func, "_liteagent_batch", None)
         
+    @property
+    def description(self) -> str:
+        """The cleaned description sent to models."""
+        if self._description is None:
+            self._description = self._clean_docstring(self.raw_description)
+        return self._description
+    
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+    
+    @property
+    def schema(self) -> Type[BaseModel]:
+        """Pydantic model of the tool's arguments."""
+        return self._cached_schema().model
+    
+    @schema.setter
+    def schema(self, value: Type[BaseModel]) -> None:
+        self._schema = _CachedSchema(value)
+        self._validator = _NOT_COMPILED
+    
+    def _cached_schema(self) -> _CachedSchema:
+        """Get the tool's schema, reusing one built for an equivalent tool if possible."""
+        if self._schema is not None:
+            return self._schema
+        source = self._schema_source()
+        key = self._schema_key()
+        try:
+            with _schema_cache_lock:
+                cached = _schema_cache.setdefault(source, {}).get(key)
+        except TypeError:
+            # Not weak-referenceable; build the schema for this tool alone
+            source = None
+            cached = None
+        if cached is None:
+            cached = _CachedSchema(self._create_schema())
+            if source is not None:
+                with _schema_cache_lock:
+                    cached = _schema_cache.setdefault(source, {}).setdefault(key, cached)
+        self._schema = cached
+        return cached
+    
+    def _schema_source(self) -> Callable:
+        """Get the function the schema is memoized under."""
+        return getattr(self.func, "__func__", self.func)
+    
+    def _schema_key(self) -> tuple:
+        """Get everything besides the function that shapes the schema."""
+        try:
+            signature = str(inspect.signature(self.func))
+        except (TypeError, ValueError):
+            signature = None
+        cls = type(self)
+        return (cls._create_schema, cls._get_schema_fields, self.name, self.raw_description, signature)
+    
     def _clean_docstring(self, docstring: str) -> str:
         """
         Clean and format a docstring for use in tool definitions.
@@ -149,16 +360,235 @@ class BaseTool:
                 fields[name] = (param.annotation, ...)
         return fields
     
+    def _compile_validator(self) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Compile a validator that turns call arguments straight into function kwargs.
+        
+        The validator is a TypeAdapter over a TypedDict of the schema's fields, so
+        arguments are type-checked without building a model and dumping it again.
+        
+        Returns:
+            The validator, or None if the schema needs the model path (optional
+            fields, nested models or annotations pydantic cannot adapt)
+        """
+        fields = self.schema.model_fields
+        if not all(field.is_required() for field in fields.values()):
+            return None
+        annotations = {name: field.annotation for name, field in fields.items()}
+        if any(_is_structured(annotation) for annotation in annotations.values()):
+            return None
+        try:
+            return TypeAdapter(TypedDict(f"{self.name}Arguments", annotations)).validate_python
+        except Exception:
+            return None
+    
+    def validate_arguments(self, **kwargs) -> Dict[str, Any]:
+        """
+        Validate call arguments against the tool's schema.
+        
+        Args:
+            **kwargs: The arguments given by the model
+            
+        Returns:
+            The validated keyword arguments for the function
+            
+        Raises:
+            pydantic.ValidationError: If the arguments don't match the schema
+        """
+        validate = self._validator
+        if validate is _NOT_COMPILED:
+            validate = self._validator = self._compile_validator()
+        if validate is not None:
+            return validate(kwargs)
+        return self.schema(**kwargs).model_dump()
+    
     def execute(self, **kwargs) -> Any:
         """Execute the tool with the given arguments."""
-        # Validate arguments using the schema
-        validated_args = self.schema(**kwargs)
-        # Execute the function with validated arguments
-        return self.func(**validated_args.model_dump())
+        if self.is_async:
+            # Blocking callers run async tools on the shared background loop
+            return run_coroutine(self.aexecute(**kwargs))
+        arguments = self.validate_arguments(**kwargs)
+        if self.executor == "inline" and self.timeout is None and self._slots is None:
+            return self.func(**arguments)
+        return self._call(self.func, self._executor_target(), arguments)
+    
+    async def aexecute(self, **kwargs) -> Any:
+        """
+        Execute the tool from a coroutine.
+        
+        Async tools are awaited on the running loop and cancelled when they time
+        out; other tools run in the loop's default executor so they don't block it.
+        """
+        if not self.is_async:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(self.execute, **kwargs))
+        arguments = self.validate_arguments(**kwargs)
+        if self.timeout is None and self._slots is None:
+            return await self.func(**arguments)
+        return await self._acall(self.func, arguments)
+    
+    def execute_batch(self, argument_sets: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Execute several calls with one call of the tool's batch implementation.
+        
+        Each argument set is validated on its own; sets that fail validation get
+        their error as result and are left out of the batch. The batch runs like a
+        single call of the tool: on its executor, under its timeout, taking one
+        concurrency slot.
+        
+        Args:
+            argument_sets: The arguments of each call
+            
+        Returns:
+            One result per argument set, in order. Calls that failed hold their
+            exception instead of a result; if the batch itself raises, the error
+            propagates.
+        """
+        if self.batch is None:
+            raise ValueError(f"Tool {self.name} has no batch implementation")
+        if inspect.iscoroutinefunction(self.batch):
+            return run_coroutine(self.aexecute_batch(argument_sets))
+        results, valid, positions = self._validate_batch(argument_sets)
+        if valid:
+            batch = functools.partial(self.batch, valid)
+            self._scatter(results, positions, self._call(batch, batch, {}))
+        return results
+    
+    async def aexecute_batch(self, argument_sets: List[Dict[str, Any]]) -> List[Any]:
+        """Execute several calls with the batch implementation from a coroutine (see execute_batch)."""
+        if not inspect.iscoroutinefunction(self.batch):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.execute_batch, argument_sets)
+        results, valid, positions = self._validate_batch(argument_sets)
+        if valid:
+            self._scatter(results, positions, await self._acall(functools.partial(self.batch, valid), {}))
+        return results
+    
+    def _validate_batch(self, argument_sets: List[Dict[str, Any]]) -> tuple:
+        """Validate each argument set, returning (results with errors filled in, valid sets, their positions)."""
+        results: List[Any] = [None] * len(argument_sets)
+        valid = []
+        positions = []
+        for position, kwargs in enumerate(argument_sets):
+            try:
+                valid.append(self.validate_arguments(**kwargs))
+            except Exception as e:
+                results[position] = e
+            else:
+                positions.append(position)
+        return results, valid, positions
+    
+    def _scatter(self, results: List[Any], positions: List[int], batch_results: Any) -> None:
+        """Put the batch implementation's results back at their calls' positions."""
+        batch_results = list(batch_results)
+        if len(batch_results) != len(positions):
+            raise ValueError(f"Batch implementation of {self.name} returned {len(batch_results)} results "
+                             f"for {len(positions)} calls")
+        for position, result in zip(positions, batch_results):
+            results[position] = result
+    
+    def _call(self, func: Callable, target: Callable, arguments: Dict[str, Any]) -> Any:
+        """
+        Run a blocking call under the tool's executor, timeout and concurrency limit.
+        
+        Args:
+            func: Callable run in the calling thread
+            target: Equivalent callable sent to the thread or process pool
+            arguments: Validated keyword arguments
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        self._acquire_slot(deadline)
+        # Only calls running on another thread can be abandoned when they time out
+        kind = "thread" if self.executor == "inline" and deadline is not None else self.executor
+        if kind == "inline":
+            try:
+                return func(**arguments)
+            finally:
+                self._release_slot()
+        
+        future = submit_to_tool_executor(kind, target, arguments)
+        # The slot stays taken until the work really finishes, even after a timeout
+        future.add_done_callback(lambda _: self._release_slot())
+        try:
+            return future.result(timeout=_remaining(deadline))
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise  # Raised by the tool itself
+            future.cancel()
+            raise ToolTimeoutError(self.name, self.timeout) from None
+    
+    async def _acall(self, func: Callable, arguments: Dict[str, Any]) -> Any:
+        """Await a coroutine function under the tool's timeout and concurrency limit."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        await self._aacquire_slot(deadline)
+        try:
+            task = asyncio.ensure_future(func(**arguments))
+            try:
+                done, _ = await asyncio.wait({task}, timeout=_remaining(deadline))
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            if not done:
+                task.cancel()
+                raise ToolTimeoutError(self.name, self.timeout)
+            return task.result()
+        finally:
+            self._release_slot()
+    
+    def _acquire_slot(self, deadline: Optional[float]) -> None:
+        """Wait for a concurrency slot, raising ToolTimeoutError at the deadline."""
+        if self._slots is not None and not self._slots.acquire(timeout=_remaining(deadline)):
+            raise ToolTimeoutError(self.name, self.timeout)
+    
+    async def _aacquire_slot(self, deadline: Optional[float]) -> None:
+        """Wait for a concurrency slot without blocking the event loop."""
+        if self._slots is None or self._slots.acquire(blocking=False):
+            return
+        # The slots are shared with threads, so wait for one in the loop's executor
+        waiter = asyncio.get_running_loop().run_in_executor(None, self._slots.acquire, True, _remaining(deadline))
+        try:
+            acquired = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            def release_late_slot(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.result():
+                    self._release_slot()
+            
+            # Hand back the slot if the abandoned wait still gets one
+            waiter.add_done_callback(release_late_slot)
+            raise
+        if not acquired:
+            raise ToolTimeoutError(self.name, self.timeout)
+    
+    def _release_slot(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+    
+    def _executor_target(self) -> Callable:
+        """Get the callable sent to the tool's thread or process pool."""
+        return self.func
+    
+    def cache_identity(self) -> Tuple[str, Any]:
+        """
+        Get what a process-wide result cache of this tool is shared by.
+        
+        Returns:
+            Tuple of the function's qualified name and the object its results
+            also depend on (None if the name alone identifies the function)
+        """
+        func = self._schema_source()
+        name = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', self.name)}"
+        if "<" in name:
+            # Lambdas and nested functions are told apart by identity
+            return name, func
+        return name, None
     
     def to_function_definition(self) -> Dict:
         """Convert tool to function definition compatible with LLM APIs."""
-        schema_dict = self.schema.model_json_schema()
+        cached = self._cached_schema()
+        if cached.json_schema is None:
+            cached.json_schema = cached.model.model_json_schema()
+        # Copied, since the definition is shared by every equivalent tool
+        schema_dict = copy.deepcopy(cached.json_schema)
         
         # Replace schema description with our cleaned description to avoid duplication
         if 'description' in schema_dict:
@@ -179,14 +609,19 @@ class BaseTool:
 class FunctionTool(BaseTool):
     """Tool implementation for standalone functions."""
     
-    def __init__(self, func: Callable, name: Optional[str] = None, description: Optional[str] = None):
-        super().__init__(func, name, description)
+    def __init__(self, func: Callable, name: Optional[str] = None, description: Optional[str] = None,
+                 cache=None, executor: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, batch: Optional[Callable] = None):
+        super().__init__(func, name, description, cache, executor, timeout, max_concurrency, batch)
 
 
 class InstanceMethodTool(BaseTool):
     """Tool implementation for instance methods."""
     
-    def __init__(self, method: Callable, instance: Any, name: Optional[str] = None, description: Optional[str] = None):
+    def __init__(self, method: Callable, instance: Any, name: Optional[str] = None, description: Optional[str] = None,
+                 cache=None, executor: Optional[str] = None, instance_factory: Optional[Callable[[], Any]] = None,
+                 timeout: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 batch: Optional[Callable] = None):
         """
         Initialize a tool from an instance method.
         
@@ -195,8 +630,18 @@ class InstanceMethodTool(BaseTool):
             instance: The instance the method belongs to
             name: Optional name for the tool (defaults to method name)
             description: Optional description (defaults to method docstring)
+            cache: Optional result caching (see CachePolicy.from_option)
+            executor: Where the tool runs: "inline", "thread" or "process"
+            instance_factory: Picklable callable building an equivalent instance; required
+                for the "process" executor, which calls the method on an instance built
+                once per worker process
+            timeout: Seconds a call may take before it fails with ToolTimeoutError
+            max_concurrency: Maximum number of calls running at once
+            batch: Optional bulk implementation taking a list of argument dicts
         """
         self.instance = instance
+        self.method_name = method.__name__
+        self._factory_pickle = pickle.dumps(instance_factory) if instance_factory is not None else None
         
         # Check if this is a class method or static method
         if isinstance(instance, type):
@@ -204,9 +649,14 @@ class InstanceMethodTool(BaseTool):
             self.unbound_method = method
             
             # Create a wrapper function that handles the class correctly
-            @functools.wraps(method)
-            def wrapper(**kwargs):
-                return method(**kwargs)
+            if inspect.iscoroutinefunction(method):
+                @functools.wraps(method)
+                async def wrapper(**kwargs):
+                    return await method(**kwargs)
+            else:
+                @functools.wraps(method)
+                def wrapper(**kwargs):
+                    return method(**kwargs)
         else:
             # This is an instance method
             # Get the unbound method from the class
@@ -218,11 +668,19 @@ class InstanceMethodTool(BaseTool):
                 self.unbound_method = method
                 
             # Create a wrapper function that handles the instance correctly
-            @functools.wraps(method)
-            def wrapper(**kwargs):
-                return self.unbound_method(instance, **kwargs)
+            if inspect.iscoroutinefunction(method):
+                @functools.wraps(method)
+                async def wrapper(**kwargs):
+                    return await self.unbound_method(instance, **kwargs)
+            else:
+                @functools.wraps(method)
+                def wrapper(**kwargs):
+                    return self.unbound_method(instance, **kwargs)
         
-        super().__init__(wrapper, name or method.__name__, description or method.__doc__)
+        super().__init__(wrapper, name or method.__name__, description or method.__doc__, cache, executor,
+                         timeout, max_concurrency, batch)
+        if self.executor == "process" and self._factory_pickle is None and not isinstance(instance, type):
+            raise ValueError(f"Tool {self.name} needs an instance_factory to run on the process executor")
     
     def _get_schema_fields(self, sig: inspect.Signature) -> Dict:
         """Extract fields from method signature, excluding 'self'."""
@@ -239,21 +697,32 @@ class InstanceMethodTool(BaseTool):
             else:
                 fields[name] = (param.annotation, ...)
         return fields
-    
-    def execute(self, **kwargs) -> Any:
-        """Execute the tool with the given arguments."""
-        # Validate arguments using the schema
-        validated_args = self.schema(**kwargs)
-        
-        # The wrapper function created in __init__ already handles the instance correctly
-        return self.func(**validated_args.model_dump())
+
+    def _schema_source(self) -> Callable:
+        """Get the function the schema is memoized under, shared by every instance."""
+        return getattr(self.unbound_method, "__func__", self.unbound_method)
+
+    def cache_identity(self) -> Tuple[str, Any]:
+        """Get what a process-wide result cache of this tool is shared by: the method and its instance."""
+        return super().cache_identity()[0], self.instance
+
+    def _executor_target(self) -> Callable:
+        """Get the callable sent to the tool's thread or process pool."""
+        if self.executor != "process":
+            return self.func
+        if isinstance(self.instance, type):
+            # Class and static methods pickle by reference
+            return self.unbound_method
+        return functools.partial(call_instance_method, self._factory_pickle, self.method_name)
 
 
 class StaticMethodTool(BaseTool):
     """Tool implementation for static methods."""
     
-    def __init__(self, method: Callable, name: Optional[str] = None, description: Optional[str] = None):
-        super().__init__(method, name, description)
+    def __init__(self, method: Callable, name: Optional[str] = None, description: Optional[str] = None,
+                 cache=None, executor: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, batch: Optional[Callable] = None):
+        super().__init__(method, name, description, cache, executor, timeout, max_concurrency, batch)
 
 
 def get_function_definitions(tool_functions=None):
@@ -294,7 +763,8 @@ def get_function_definitions(tool_functions=None):
     return function_definitions
 
 
-def liteagent_tool(func=None, *, name=None, description=None):
+def liteagent_tool(func=None, *, name=None, description=None, cache=None, executor=None, timeout=None,
+                   max_concurrency=None, batch=None):
     """
     Universal decorator to register any function or method as a tool.
     Automatically detects the function type and creates the appropriate tool instance.
@@ -305,11 +775,42 @@ def liteagent_tool(func=None, *, name=None, description=None):
         func: The function or method to register
         name: Optional custom name for the tool
         description: Optional custom description
+        cache: Optional result caching for deterministic tools: True, a scope name
+            ("conversation", "agent" or "process"), a dict of CachePolicy fields or
+            a CachePolicy
+        executor: Where the tool runs: "inline" (default), "thread" for a shared thread
+            pool, or "process" for a shared process pool (for CPU-bound tools; the
+            function must be importable)
+        timeout: Seconds a call may take before it fails with ToolTimeoutError; the
+            failure is stored as an error result so the model can recover
+        max_concurrency: Maximum number of calls of the function running at once,
+            across all agents
+        batch: Bulk implementation for several calls in one model response. It is
+            called once with a list of validated argument dicts and returns one
+            result per dict, in order; an Exception instance in the list fails
+            only that call
         
     Returns:
         Decorator function or decorated function
     """
+    cache_policy = CachePolicy.from_option(cache)
+    check_executor(executor)
+    
     def decorator(f):
+        # Picked up by the tool instances agents create for this function
+        target = f.__func__ if inspect.ismethod(f) else f
+        if cache_policy is not None:
+            target._liteagent_cache = cache_policy
+        if executor is not None:
+            target._liteagent_executor = executor
+        if timeout is not None:
+            target._liteagent_timeout = timeout
+        if max_concurrency is not None:
+            target._liteagent_max_concurrency = max_concurrency
+            target._liteagent_slots = threading.BoundedSemaphore(max_concurrency)
+        if batch is not None:
+            target._liteagent_batch = batch
+        
         # Determine the appropriate tool type
         if inspect.ismethod(f):
             # For bound methods
@@ -328,10 +829,7 @@ def liteagent_tool(func=None, *, name=None, description=None):
         
         # Register the tool
         if 'tool_instance' in locals():
-            TOOLS[tool_instance.name] = {
-                "schema": tool_instance.schema,
-                "function": tool_instance.func
-            }
+            TOOLS[tool_instance.name] = _RegisteredTool(tool_instance)
         
         return f
     
@@ -9,16 +9,16 @@ This implementation provides:
 - Comprehensive error handling and recovery
 """
 
-import copy
 import uuid
 import time
 import asyncio
-from typing import Any, Dict, List, Optional, Union, Set
+from typing import Any, Dict, List, Optional, Sequence, Union, Set
 from dataclasses import dataclass
 from enum import Enum
 
 from .agent import LiteAgent
 from .memory import ConversationMemory
+from .messages import SharedMessageList, snapshot_messages
 from .models import create_model_interface
 from .utils import logger
 from .observer import generate_context_id, AgentEvent
@@ -99,11 +99,18 @@ class UnifiedForkedMemory(ConversationMemory):
             prefill_messages: Optional prefill messages for role definition
             session_type: Type of session management being used
         """
-        # Create a deep copy of parent messages to avoid mutations
-        self.messages = copy.deepcopy(parent_memory.messages)
+        # Share the parent's messages rather than copying them; the fork only
+        # stores what it adds, and copies the prefix if it ever changes it
+        self.tokenizer = parent_memory.tokenizer
+        self._fork_prefix = snapshot_messages(parent_memory.messages, self.tokenizer)
+        self.messages = SharedMessageList(self._fork_prefix, self.tokenizer)
+        self.summary = parent_memory.summary
+        self.token_budget = parent_memory.token_budget
+        self.blob_store = parent_memory.blob_store
         self.system_prompt = parent_memory.system_prompt
         self.function_calls = {}
         self.last_function_call = None
+        self._conversion_cache = {}
         self.session_type = session_type
         
         # Mark the fork point for cache optimization
@@ -121,16 +128,20 @@ class UnifiedForkedMemory(ConversationMemory):
         import json
         
         # Hash the messages up to fork point
-        fork_content = json.dumps(self.messages[:self._fork_point], sort_keys=True)
+        fork_content = json.dumps([dict(message) for message in self._fork_prefix], sort_keys=True)
         return hashlib.sha256(fork_content.encode()).hexdigest()
     
-    def get_fork_point_messages(self) -> List[Dict]:
-        """Get messages up to the fork point for caching."""
-        return self.messages[:self._fork_point]
+    def get_fork_point_messages(self) -> Sequence[Dict]:
+        """Get a read-only view of the messages up to the fork point, for caching."""
+        return self._fork_prefix
     
-    def get_post_fork_messages(self) -> List[Dict]:
-        """Get messages after the fork point."""
-        return self.messages[self._fork_point:]
+    def get_post_fork_messages(self) -> Sequence[Dict]:
+        """Get a read-only view of the messages after the fork point."""
+        messages = self.messages
+        if isinstance(messages, SharedMessageList) and messages.prefix is self._fork_prefix:
+            return messages.snapshot_suffix()
+        # The prefix has been changed or the messages replaced
+        return messages[self._fork_point:]
 
 
 class UnifiedForkedAgent(LiteAgent):
@@ -215,12 +226,7 @@ class UnifiedForkedAgent(LiteAgent):
             return
             
         try:
-            provider_name = getattr(self.model_interface, 'provider_name', 'unknown')
-            limits = self.rate_limiter.get_rate_limit(
-                provider=provider_name,
-                model=self.model,
-                tier=self.tier
-            )
+            limits = self.rate_limiter.get_rate_limit(**self._rate_limit_target())
             logger.info(f"[{self.name}] Rate limits: {limits.rpm} RPM, {limits.tpm} TPM")
         except RateLimitError as e:
             logger.warning(f"[{self.name}] {e}")
@@ -544,44 +550,24 @@ class UnifiedForkedAgent(LiteAgent):
         ]
     
     def _generate_response_with_rate_limiting(self, messages: List[Dict[str, Any]], **kwargs) -> str:
-        """Generate response with intelligent rate limiting."""
-        # Estimate tokens for rate limiting
-        estimated_tokens = sum(len(msg.get('content', '')) for msg in messages) // 4
-        
-        # Wait if needed
-        if self.rate_limiter:
-            provider_name = getattr(self.model_interface, 'provider_name', 'unknown')
-            wait_time = self.rate_limiter.wait_if_needed(
-                provider=provider_name,
-                model=self.model,
-                tier=self.tier,
-                estimated_tokens=estimated_tokens
-            )
-            
-            if wait_time > 0:
-                logger.info(f"[{self.name}] Waited {wait_time:.1f}s for rate limits")
+        """
+        Generate a response, throttled by the rate limiter.
         
-        # Generate response using parent's method
+        The limiter is consulted once per model call inside the tool loop, under
+        this agent's tier (see _rate_limit_target).
+        """
         try:
-            response = self._generate_response_with_tools(**kwargs)
-            
-            # Update rate limiter with actual usage if available
-            if self.rate_limiter and hasattr(response, 'usage') and response.usage:
-                actual_tokens = response.usage.get('total_tokens', estimated_tokens)
-                provider_name = getattr(self.model_interface, 'provider_name', 'unknown')
-                self.rate_limiter.consume_tokens(
-                    provider=provider_name,
-                    model=self.model,
-                    tier=self.tier,
-                    actual_tokens=actual_tokens
-                )
-            
-            return response
-            
+            return self._generate_response_with_tools(**kwargs)
         except Exception as e:
             logger.error(f"[{self.name}] Error generating response: {e}")
             raise
     
+    def _rate_limit_target(self) -> Dict[str, Any]:
+        """Count model calls against this agent's rate limiting tier."""
+        target = super()._rate_limit_target()
+        target["tier"] = self.tier
+        return target
+    
     def batch_analyze(self, tasks: List[Dict[str, Any]], max_parallel: int = 3) -> Dict[str, Any]:
         """
         Run multiple analysis tasks with intelligent batching.
@@ -652,12 +638,7 @@ class UnifiedForkedAgent(LiteAgent):
             return 0
             
         try:
-            provider_name = getattr(self.model_interface, 'provider_name', 'unknown')
-            limits = self.rate_limiter.get_rate_limit(
-                provider=provider_name,
-                model=self.model,
-                tier=self.tier
-            )
+            limits = self.rate_limiter.get_rate_limit(**self._rate_limit_target())
             
             # Conservative delay based on RPM limits
             min_delay = 60.0 / limits.rpm
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for conversation memory footprint and history reads.
+
+Fills a ConversationMemory with a mix of user, assistant, tool-call and
+tool-result messages, then reports the heap bytes held per stored message and
+the throughput of get_messages(). For comparison it also measures the same
+messages as plain dicts, the old storage, read the old way (copy each message,
+then delete its internal fields).
+
+Usage:
+    python bench_message_memory.py [--messages 10000] [--iterations 50]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from liteagent.memory import ConversationMemory
+from liteagent.messages import INTERNAL_FIELDS, Message
+
+
+def fill(memory, count):
+    """Add `count` messages in repeating user/tool call/tool result/assistant turns."""
+    turn = 0
+    while len(memory.messages) < count:
+        memory.add_user_message(f"Question {turn}: what is the weather in city {turn}?")
+        memory.add_tool_call("get_weather", {"city": f"city {turn}"}, f"call_{turn}")
+        memory.add_tool_result("get_weather", f"Sunny, {turn % 30} degrees", f"call_{turn}")
+        memory.add_assistant_message(f"It is sunny and {turn % 30} degrees in city {turn}.")
+        turn += 1
+
+
+def legacy_get_messages(messages):
+    """Read a list of plain dicts the way get_messages used to."""
+    result = []
+    for message in messages:
+        filtered = message.copy()
+        for field in INTERNAL_FIELDS:
+            if field in filtered:
+                del filtered[field]
+        result.append(filtered)
+    return result
+
+
+def measure_bytes(build):
+    """Heap bytes still allocated by the object `build` returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    def build_memory():
+        memory = ConversationMemory("You are a weather assistant.")
+        fill(memory, args.messages)
+        return memory
+
+    memory, memory_bytes = measure_bytes(build_memory)
+    count = len(memory.messages)
+    # Containers only: both share the message values already held by memory
+    dicts, dict_bytes = measure_bytes(lambda: [message.to_dict() for message in memory.messages])
+    _, record_bytes = measure_bytes(lambda: [Message(message) for message in dicts])
+
+    print(f"{'dict container':>20}: {dict_bytes / count:8.1f} bytes/message")
+    print(f"{'Message record':>20}: {record_bytes / count:8.1f} bytes/message")
+    print(f"{'ConversationMemory':>20}: {memory_bytes / count:8.1f} bytes/message "
+          f"(records, values and token counts)")
+
+    for label, fn in (("legacy copy+delete", lambda: legacy_get_messages(dicts)),
+                      ("get_messages()", memory.get_messages)):
+        seconds = timeit.timeit(fn, number=args.iterations)
+        print(f"{label:>20}: {seconds / args.iterations * 1e3:8.2f} ms/call, "
+              f"{count * args.iterations / seconds / 1e6:6.2f} M messages/s ({count} messages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for per-request tool preparation.
+
+Compares converting the agent's tools on every request (the old behaviour)
+with reusing the payloads cached on the agent's ToolManifest.
+
+Usage:
+    python bench_tool_manifest.py [--tools 60] [--iterations 10000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from liteagent import LiteAgent, liteagent_tool
+from liteagent.providers.anthropic_provider import AnthropicProvider
+from liteagent.providers.ollama_provider import OllamaProvider
+
+
+def make_tools(count):
+    tools = []
+    for i in range(count):
+        def tool(query: str, limit: int = 10) -> str:
+            return query
+        tool.__name__ = f"tool_{i}"
+        tool.__doc__ = f"Tool number {i}. Looks things up.\n\nArgs:\n    query: What to look up\n    limit: Max results"
+        tools.append(liteagent_tool(tool))
+    return tools
+
+
+def legacy_prepare(agent, providers):
+    """Rebuild and convert the tool list the way every request used to."""
+    tools = [tool_def if 'function' in tool_def else {'type': 'function', 'function': tool_def}
+             for tool_def in agent.tools.values()]
+    tools = agent.model_interface._convert_functions_to_tools(tools)
+    for provider in providers:
+        provider._convert_tools(tools)
+
+
+def cached_prepare(agent, providers):
+    """Prepare tools through the agent's manifest."""
+    tools = agent.model_interface._convert_functions_to_tools(agent._prepare_tools())
+    for provider in providers:
+        provider._compile_tools(tools)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=60)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    agent = LiteAgent(model="mock-model", name="bench", provider="mock", tools=make_tools(args.tools))
+    providers = [
+        AnthropicProvider("claude-3-5-haiku-20241022", api_key="bench"),
+        OllamaProvider("llama3.1"),
+    ]
+
+    for label, fn in (("convert per request", legacy_prepare), ("cached manifest", cached_prepare)):
+        seconds = timeit.timeit(lambda: fn(agent, providers), number=args.iterations)
+        print(f"{label:>20}: {seconds / args.iterations * 1e6:8.2f} us/request ({args.tools} tools)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for loading and using a large tool registry.
+
+Decorates a registry of generated tool functions with @liteagent_tool (what
+importing a tool module does), then times building the first agent over the
+registry and building further agents once the schemas are memoized. For
+comparison it also times building every tool's schema eagerly, which is what
+decorating used to do.
+
+Usage:
+    python bench_tool_registry.py [--tools 400] [--agents 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from liteagent import LiteAgent, liteagent_tool
+from liteagent.tools import FunctionTool, clear_schema_cache
+
+
+def make_functions(count):
+    """Generate module-level style tool functions with a few typed parameters."""
+    functions = []
+    for i in range(count):
+        def tool(query: str, limit: int = 10, tags: list = None, exact: bool = False) -> str:
+            return query
+        tool.__name__ = tool.__qualname__ = f"tool_{i}"
+        tool.__doc__ = f"Tool number {i}. Looks things up.\n\nArgs:\n    query: What to look up\n    limit: Max results"
+        functions.append(tool)
+    return functions
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=400)
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+
+    functions = make_functions(args.tools)
+
+    _, eager = timed(lambda: [FunctionTool(f).to_dict() for f in functions])
+    clear_schema_cache()
+    _, decorate = timed(lambda: [liteagent_tool(f) for f in functions])
+    _, first_agent = timed(lambda: LiteAgent(model="mock-model", name="bench", provider="mock", tools=functions))
+    _, more_agents = timed(lambda: [LiteAgent(model="mock-model", name="bench", provider="mock", tools=functions)
+                                    for _ in range(args.agents)])
+
+    print(f"{'eager schemas':>22}: {eager * 1e3:8.1f} ms ({args.tools} tools)")
+    print(f"{'decorate (lazy)':>22}: {decorate * 1e3:8.1f} ms")
+    print(f"{'first agent':>22}: {first_agent * 1e3:8.1f} ms")
+    print(f"{'each further agent':>22}: {more_agents / args.agents * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
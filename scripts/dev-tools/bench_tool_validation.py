@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for tool argument validation.
+
+Compares validating call arguments through the tool's pydantic schema model
+followed by model_dump() (the old behaviour, still used for nested models)
+with the compiled TypeAdapter validator, for small and large payloads.
+
+Usage:
+    python bench_tool_validation.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from liteagent.tools import FunctionTool
+
+
+def search(query: str, limit: int, tags: List[str], filters: Dict[str, Any]) -> int:
+    """Search documents."""
+    return limit
+
+
+PAYLOADS = {
+    "small": {"query": "weather in Paris", "limit": 5, "tags": ["news"], "filters": {"lang": "en"}},
+    "large": {
+        "query": "x" * 2000,
+        "limit": 50,
+        "tags": [f"tag{i}" for i in range(1000)],
+        "filters": {f"field{i}": {"values": list(range(10)), "exact": True} for i in range(200)},
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    tool = FunctionTool(search)
+    tool.validate_arguments(**PAYLOADS["small"])
+
+    for size, payload in PAYLOADS.items():
+        paths = (("model + model_dump", lambda: tool.schema(**payload).model_dump()),
+                 ("compiled validator", lambda: tool.validate_arguments(**payload)))
+        for label, fn in paths:
+            seconds = timeit.timeit(fn, number=args.iterations)
+            print(f"{label:>20}: {seconds / args.iterations * 1e6:10.2f} us/call ({size} payload)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,21 @@ Pytest fixtures for LiteAgent tests using REAL API calls.
 
 This module provides fixtures for setting up real LLM testing.
 NO MOCKS - uses actual API keys and real provider calls.
+
+Offline tests of the agent loop instead use ScriptedProvider, a provider that
+replays scripted responses, and the make_agent fixture.
 """
 
+import asyncio
 import pytest
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Union
 from liteagent import LiteAgent
 from liteagent.models import create_model_interface
 from liteagent.observer import ConsoleObserver, AgentObserver
+from liteagent.providers import ProviderInterface, ProviderResponse, StreamChunk, ToolCall
 from liteagent.tools import BaseTool, FunctionTool, liteagent_tool
 
 
@@ -261,4 +268,158 @@ def ollama_agent(api_keys, test_tool):
         api_key=None,
         tools=[test_tool],
         system_prompt="You are a helpful test assistant. Use tools when needed."
-    )
\ No newline at end of file
+    )
+
+
+def text_response(content: str) -> ProviderResponse:
+    """Build a scripted reply with text content."""
+    return ProviderResponse(content=content, tool_calls=[], usage=None, model="scripted-model",
+                            provider="scripted", raw_response=None)
+
+
+def tool_response(*tool_calls: ToolCall, content: Optional[str] = None) -> ProviderResponse:
+    """Build a scripted reply calling tools."""
+    return ProviderResponse(content=content, tool_calls=list(tool_calls), usage=None, model="scripted-model",
+                            provider="scripted", raw_response=None)
+
+
+class ScriptedRequest(NamedTuple):
+    """A request received by a ScriptedProvider."""
+    messages: List[Dict[str, Any]]
+    tools: Optional[List[Dict[str, Any]]]
+
+
+class ScriptedProvider(ProviderInterface):
+    """
+    Provider that replays scripted responses, so the agent loop runs without API keys.
+
+    Each request takes the next scripted response (a ProviderResponse, or a string
+    for a text reply). Once the script is used up, ``reply`` builds the response
+    from the request's messages; without it the request fails with IndexError.
+    Requests, call counts and peak concurrency are recorded, calls wait while
+    ``gate`` is cleared, and streams send the text word by word.
+    """
+
+    def __init__(self, responses: Sequence[Union[ProviderResponse, str]] = (),
+                 reply: Optional[Callable[[List[Dict[str, Any]]], Union[ProviderResponse, str]]] = None,
+                 delay: Union[float, Callable[[List[Dict[str, Any]]], float]] = 0.0,
+                 max_image_dimension: Optional[int] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            responses: Responses to return, in order
+            reply: Builds the response once the scripted ones are used up
+            delay: Seconds each call takes, or a callable computing them from the messages
+            max_image_dimension: Image size limit reported to the model interface
+        """
+        self.responses = list(responses)
+        self.reply = reply
+        self.delay = delay
+        self.max_image_dimension = max_image_dimension
+        self.requests: List[ScriptedRequest] = []
+        self.sync_calls = 0
+        self.async_calls = 0
+        self.active = 0
+        self.peak = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+        super().__init__("scripted-model")
+
+    def _get_provider_name(self) -> str:
+        return "scripted"
+
+    def _setup_client(self) -> None:
+        pass
+
+    def _next_response(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]]
+                       ) -> ProviderResponse:
+        with self._lock:
+            self.requests.append(ScriptedRequest(messages, tools))
+            if self.responses or self.reply is None:
+                response = self.responses.pop(0)
+            else:
+                response = self.reply(messages)
+        return text_response(response) if isinstance(response, str) else response
+
+    def _delay_for(self, messages: List[Dict[str, Any]]) -> float:
+        return self.delay(messages) if callable(self.delay) else self.delay
+
+    def generate_response(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None,
+                          **kwargs) -> ProviderResponse:
+        response = self._next_response(messages, tools)
+        with self._lock:
+            self.sync_calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self.gate.wait(5)
+            time.sleep(self._delay_for(messages))
+        finally:
+            with self._lock:
+                self.active -= 1
+        return response
+
+    async def agenerate_response(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None,
+                                 **kwargs) -> ProviderResponse:
+        response = self._next_response(messages, tools)
+        self.async_calls += 1
+        await asyncio.sleep(self._delay_for(messages))
+        return response
+
+    def stream_response(self, messages, tools=None, **kwargs):
+        response = self._next_response(messages, tools)
+        if response.content:
+            for word in response.content.split(" "):
+                yield StreamChunk(delta=word + " ")
+        yield StreamChunk(response=response)
+
+    async def astream_response(self, messages, tools=None, **kwargs):
+        for chunk in self.stream_response(messages, tools, **kwargs):
+            await asyncio.sleep(0)
+            yield chunk
+
+    def supports_tool_calling(self) -> bool:
+        return True
+
+    def supports_parallel_tools(self) -> bool:
+        return True
+
+
+class RecordingRateLimiter:
+    """Stands in for the global RateLimiter and records calls."""
+
+    def __init__(self):
+        self.waits = []
+        self.awaits = []
+        self.consumed = []
+
+    def wait_if_needed(self, provider, model, tier=None, estimated_tokens=1):
+        self.waits.append((provider, model, tier, estimated_tokens))
+        return 0
+
+    async def await_if_needed(self, provider, model, tier=None, estimated_tokens=1):
+        self.awaits.append((provider, model, tier, estimated_tokens))
+        return 0
+
+    def consume_tokens(self, provider, model, tier=None, actual_tokens=1):
+        self.consumed.append((provider, model, tier, actual_tokens))
+
+
+@pytest.fixture
+def make_agent():
+    """
+    Build offline agents on the mock model.
+
+    Call it with the agent's tools, an optional provider (e.g. a ScriptedProvider)
+    to answer in place of the mock model, and any other LiteAgent arguments.
+    """
+    def make(tools: Sequence = (), provider: Optional[ProviderInterface] = None, **kwargs) -> LiteAgent:
+        kwargs.setdefault("name", "test-agent")
+        agent = LiteAgent(model="mock-model", provider="mock", tools=list(tools), **kwargs)
+        if provider is not None:
+            agent.model_interface.provider = provider
+        return agent
+
+    return make
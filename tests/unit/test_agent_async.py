@@ -0,0 +1,130 @@
+"""
+Unit tests for the asyncio agent API (LiteAgent.achat).
+
+A scripted provider replays canned responses so the tests run without API keys.
+"""
+
+import asyncio
+import time
+
+from liteagent import LiteAgent
+from liteagent.async_executor import AsyncCoordinator, AgentTask
+from liteagent.observer import AgentObserver, FunctionResultEvent
+from liteagent.providers import ProviderInterface, ToolCall
+
+from .conftest import ScriptedProvider, text_response, tool_response
+
+
+class BlockingOnlyProvider(ScriptedProvider):
+    """Provider without an async client, relying on the default agenerate_response."""
+
+    agenerate_response = ProviderInterface.agenerate_response
+
+
+class RecordingObserver(AgentObserver):
+    """Observer that records every event it receives."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+class TestAchat:
+    """Tests for LiteAgent.achat."""
+
+    async def test_achat_returns_text(self, make_agent):
+        provider = ScriptedProvider([text_response("hello")])
+        agent = make_agent([add], provider)
+
+        response = await agent.achat("hi")
+
+        assert response == "hello"
+        assert provider.async_calls == 1
+        assert provider.sync_calls == 0
+        assert agent.memory.messages[-1] == {"role": "assistant", "content": "hello"}
+
+    async def test_achat_runs_tool_loop_like_chat(self, make_agent):
+        """Tool calls, memory and observer events match the sync path."""
+        script = lambda: [
+            tool_response(ToolCall(id="call_1", name="add", arguments={"a": 2, "b": 3})),
+            text_response("The sum is 5"),
+        ]
+        async_observer, sync_observer = RecordingObserver(), RecordingObserver()
+        async_agent = make_agent([add], ScriptedProvider(script()), observers=[async_observer])
+        sync_agent = make_agent([add], ScriptedProvider(script()), observers=[sync_observer])
+
+        async_result = await async_agent.achat("add 2 and 3")
+        sync_result = sync_agent.chat("add 2 and 3")
+
+        assert async_result == sync_result == "The sum is 5"
+        assert async_agent.memory.messages == sync_agent.memory.messages
+        assert [type(e) for e in async_observer.events] == [type(e) for e in sync_observer.events]
+        results = [e for e in async_observer.events if isinstance(e, FunctionResultEvent)]
+        assert results[0].result == 5
+
+    async def test_concurrent_conversations_overlap(self, make_agent):
+        """Many achat calls share one event loop instead of running back to back."""
+        agents = [make_agent([add], ScriptedProvider([text_response(f"reply {i}")], delay=0.2)) for i in range(10)]
+
+        start = time.time()
+        replies = await asyncio.gather(*(agent.achat("hi") for agent in agents))
+
+        assert replies == [f"reply {i}" for i in range(10)]
+        assert time.time() - start < 1.0
+
+    async def test_default_agenerate_response_uses_executor(self, make_agent):
+        """Providers without an async client still work through achat."""
+        provider = BlockingOnlyProvider([text_response("from thread")])
+        agent = make_agent([add], provider)
+
+        response = await agent.achat("hi")
+
+        assert response == "from thread"
+        assert provider.sync_calls == 1
+
+    async def test_achat_reports_provider_errors(self, make_agent):
+        agent = make_agent([add], ScriptedProvider([]))
+
+        response = await agent.achat("hi")
+
+        assert response.startswith("I encountered an error")
+
+
+class TestAsyncCoordinatorUsesAchat:
+    """AsyncCoordinator should await achat rather than block the loop on chat."""
+
+    async def test_call_agent_prefers_achat(self, make_agent):
+        provider = ScriptedProvider([text_response("async reply")])
+        agent = make_agent([add], provider)
+        coordinator = AsyncCoordinator(registry=None, blackboard=None, max_concurrent_tasks=1)
+
+        task = AgentTask(task_id="t1", agent_id="a1", capability="chat", input_data="hi")
+        result = await coordinator._call_agent(agent, task)
+
+        assert result == "async reply"
+        assert provider.async_calls == 1
+        coordinator._executor.shutdown(wait=False)
+
+    async def test_call_agent_uses_chat_overridden_without_achat(self):
+        class ShoutingAgent(LiteAgent):
+            def chat(self, message, images=None, enable_caching=False):
+                return super().chat(message, images, enable_caching).upper()
+
+        provider = ScriptedProvider([text_response("sync reply")])
+        agent = ShoutingAgent(model="mock-model", name="shouting-agent", provider="mock", tools=[add])
+        agent.model_interface.provider = provider
+        coordinator = AsyncCoordinator(registry=None, blackboard=None, max_concurrent_tasks=1)
+
+        task = AgentTask(task_id="t1", agent_id="a1", capability="chat", input_data="hi")
+        result = await coordinator._call_agent(agent, task)
+
+        assert result == "SYNC REPLY"
+        assert provider.async_calls == 0
+        coordinator._executor.shutdown(wait=False)
@@ -0,0 +1,104 @@
+"""
+Unit tests for AgentTemplate.
+
+Agents are created from a template backed by the mock provider, so no API keys
+are required.
+"""
+
+import liteagent.agent as agent_module
+from liteagent import AgentTemplate, LiteAgent
+from liteagent.observer import AgentInitializedEvent, AgentObserver
+
+
+class RecordingObserver(AgentObserver):
+    """Observer that records every event it receives."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+def multiply(a: int, b: int) -> int:
+    """Multiply two numbers."""
+    return a * b
+
+
+def make_template(**kwargs) -> AgentTemplate:
+    return AgentTemplate(model="mock-model", name="templated", provider="mock", tools=[add], **kwargs)
+
+
+class TestAgentTemplate:
+    """Tests for creating agents from a template."""
+
+    def test_create_skips_expensive_setup(self, monkeypatch):
+        template = make_template()
+        calls = []
+        monkeypatch.setattr(agent_module, "get_model_capabilities", lambda *a, **k: calls.append("caps"))
+        monkeypatch.setattr(agent_module, "create_model_interface", lambda *a, **k: calls.append("client"))
+        monkeypatch.setattr(agent_module, "get_function_definitions", lambda *a, **k: calls.append("schemas"))
+
+        agent = template.create()
+
+        assert calls == []
+        assert isinstance(agent, LiteAgent)
+
+    def test_agents_share_client_and_tools(self):
+        template = make_template()
+
+        first, second = template.create(), template.create()
+
+        assert first.model_interface is second.model_interface is template.model_interface
+        assert first._prepare_tools() is second._prepare_tools()
+        assert first.capabilities is second.capabilities
+
+    def test_agents_have_own_memory_and_ids(self):
+        template = make_template()
+
+        first = template.create()
+        second = template.create(name="other", context_id="ctx-2", parent_context_id="parent")
+        first.memory.add_user_message("hello")
+
+        assert len(second.memory.messages) == 1
+        assert first.agent_id != second.agent_id
+        assert first.context_id != second.context_id
+        assert (second.name, second.context_id, second.parent_context_id) == ("other", "ctx-2", "parent")
+
+    def test_tool_changes_stay_local(self):
+        template = make_template()
+        first, second = template.create(), template.create()
+
+        first.add_tool(multiply)
+
+        assert set(first.tools) == {"add", "multiply"}
+        assert set(second.tools) == {"add"}
+        assert [t["function"]["name"] for t in second._prepare_tools()] == ["add"]
+        assert set(template.create().tools) == {"add"}
+
+    def test_observers_per_agent(self):
+        shared = RecordingObserver()
+        template = make_template(observers=[shared])
+
+        first = template.create()
+        own = RecordingObserver()
+        second = template.create(observers=[own])
+        first.add_observer(RecordingObserver())
+
+        assert [type(e) for e in shared.events] == [AgentInitializedEvent]
+        assert shared.events[0].agent_id == first.agent_id
+        assert [e.agent_id for e in own.events] == [second.agent_id]
+        assert len(template.create().observers) == 1
+
+    def test_created_agent_chats(self):
+        agent = make_template().create()
+
+        response = agent.chat("hello")
+
+        assert isinstance(response, str)
+        assert agent.memory.messages[-1]["content"] == response
@@ -0,0 +1,360 @@
+"""
+Unit tests for LiteAgent tool execution.
+
+These tests drive the agent's tool-call processing directly with the mock
+provider, so they run without API keys.
+"""
+
+import asyncio
+import threading
+import time
+
+from liteagent import LiteAgent
+from liteagent.observer import AgentObserver, FunctionCallEvent, FunctionResultEvent
+from liteagent.providers import ProviderResponse, ToolCall
+from liteagent.tool_calling import ToolCallTracker
+from liteagent import tools as tools_module
+from liteagent.tools import FunctionTool
+
+
+class RecordingObserver(AgentObserver):
+    """Observer that records every event it receives."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+def make_response(tool_calls, content=None):
+    """Build a provider response carrying the given tool calls."""
+    return ProviderResponse(
+        content=content,
+        tool_calls=tool_calls,
+        usage=None,
+        model="mock-model",
+        provider="mock",
+        raw_response=None,
+    )
+
+
+def slow_lookup(key: str) -> str:
+    """Look up a key after a simulated network delay."""
+    time.sleep(0.2)
+    return f"value-{key}"
+
+
+def failing_lookup(key: str) -> str:
+    """Always fails."""
+    raise RuntimeError(f"lookup failed for {key}")
+
+
+class TestParallelToolCalls:
+    """Tests for concurrent execution of multiple tool calls."""
+
+    def test_parallel_calls_run_concurrently(self, make_agent):
+        """Independent tool calls overlap instead of running back to back."""
+        agent = make_agent([slow_lookup], parallel_tool_calls=True)
+        calls = [ToolCall(id=f"call_{i}", name="slow_lookup", arguments={"key": str(i)}) for i in range(5)]
+
+        start = time.time()
+        agent._process_tool_calls(calls, make_response(calls))
+        elapsed = time.time() - start
+
+        assert elapsed < 0.2 * len(calls) / 2
+
+    def test_results_stored_in_tool_call_order(self, make_agent):
+        """Memory holds each call followed by its result, in the original order."""
+        agent = make_agent([slow_lookup], parallel_tool_calls=True)
+        calls = [ToolCall(id=f"call_{i}", name="slow_lookup", arguments={"key": str(i)}) for i in range(4)]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        messages = agent.memory.messages[1:]
+        assert len(messages) == 8
+        for i, call in enumerate(calls):
+            call_msg, result_msg = messages[2 * i], messages[2 * i + 1]
+            assert call_msg["tool_calls"][0]["id"] == call.id
+            assert result_msg["tool_call_id"] == call.id
+            assert result_msg["content"] == f"value-{i}"
+
+    def test_events_fire_for_each_call(self, make_agent):
+        """FunctionCall and FunctionResult events fire for every parallel call."""
+        observer = RecordingObserver()
+        agent = make_agent([slow_lookup], parallel_tool_calls=True, observers=[observer])
+        calls = [ToolCall(id=f"call_{i}", name="slow_lookup", arguments={"key": str(i)}) for i in range(3)]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        call_events = [e for e in observer.events if isinstance(e, FunctionCallEvent)]
+        result_events = [e for e in observer.events if isinstance(e, FunctionResultEvent)]
+        assert [e.function_args["key"] for e in call_events] == ["0", "1", "2"]
+        assert [e.result for e in result_events] == ["value-0", "value-1", "value-2"]
+
+    def test_errors_recorded_per_call(self, make_agent):
+        """A failing call is stored as an error result without affecting the others."""
+        agent = make_agent([slow_lookup, failing_lookup], parallel_tool_calls=True)
+        calls = [
+            ToolCall(id="call_ok", name="slow_lookup", arguments={"key": "a"}),
+            ToolCall(id="call_bad", name="failing_lookup", arguments={"key": "b"}),
+        ]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        results = [m for m in agent.memory.messages if m["role"] == "tool"]
+        assert results[0]["content"] == "value-a"
+        assert results[1]["is_error"] is True
+        assert "lookup failed for b" in results[1]["content"]
+
+    def test_worker_count_is_bounded(self, make_agent):
+        """No more than max_tool_workers calls run at the same time."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def tracked(key: str) -> str:
+            """Track concurrency."""
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return key
+
+        agent = make_agent([tracked], parallel_tool_calls=True, max_tool_workers=2)
+        calls = [ToolCall(id=f"call_{i}", name="tracked", arguments={"key": str(i)}) for i in range(6)]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert peak <= 2
+
+    def test_sequential_by_default(self, make_agent):
+        """Without parallel_tool_calls the calls still execute one after another."""
+        agent = make_agent([slow_lookup])
+        calls = [ToolCall(id=f"call_{i}", name="slow_lookup", arguments={"key": str(i)}) for i in range(2)]
+
+        start = time.time()
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert time.time() - start >= 0.4
+        assert [m["content"] for m in agent.memory.messages if m["role"] == "tool"] == ["value-0", "value-1"]
+
+
+async def async_lookup(key: str) -> str:
+    """Look up a key with a non-blocking simulated network delay."""
+    await asyncio.sleep(0.2)
+    return f"async-{key}"
+
+
+class TestAsyncTools:
+    """Tests for tools defined with async def."""
+
+    def test_async_tool_result_is_awaited(self, make_agent):
+        """A single async tool call stores its result, not a coroutine."""
+        agent = make_agent([async_lookup])
+        calls = [ToolCall(id="call_0", name="async_lookup", arguments={"key": "a"})]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert [m["content"] for m in agent.memory.messages if m["role"] == "tool"] == ["async-a"]
+
+    def test_async_calls_awaited_concurrently(self, make_agent):
+        """Several async calls in one turn overlap, even without parallel_tool_calls."""
+        agent = make_agent([async_lookup, slow_lookup])
+        calls = [ToolCall(id=f"call_{i}", name="async_lookup", arguments={"key": str(i)}) for i in range(5)]
+        calls.append(ToolCall(id="call_sync", name="slow_lookup", arguments={"key": "s"}))
+
+        start = time.time()
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert time.time() - start < 0.2 * len(calls) / 2
+        results = [m["content"] for m in agent.memory.messages if m["role"] == "tool"]
+        assert results == [f"async-{i}" for i in range(5)] + ["value-s"]
+
+    async def test_async_tools_run_on_agent_loop(self, make_agent):
+        """In the async loop, async tools are awaited on the running loop."""
+        loops = []
+
+        async def where(key: str) -> str:
+            """Report the loop the tool ran on."""
+            loops.append(asyncio.get_running_loop())
+            return key
+
+        agent = make_agent([where, async_lookup])
+        calls = [ToolCall(id="call_0", name="where", arguments={"key": "a"}),
+                 ToolCall(id="call_1", name="async_lookup", arguments={"key": "b"})]
+
+        await agent._aprocess_tool_calls(calls, make_response(calls))
+
+        assert loops == [asyncio.get_running_loop()]
+        assert [m["content"] for m in agent.memory.messages if m["role"] == "tool"] == ["a", "async-b"]
+
+    def test_async_tool_errors_recorded(self, make_agent):
+        """An exception raised by an async tool is stored as an error result."""
+        async def broken(key: str) -> str:
+            """Always fails."""
+            raise RuntimeError(f"broken {key}")
+
+        agent = make_agent([broken])
+        calls = [ToolCall(id="call_0", name="broken", arguments={"key": "x"})]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        result = agent.memory.messages[-1]
+        assert result["is_error"] is True
+        assert "broken x" in result["content"]
+
+
+class TestToolTimeouts:
+    """Tests for how the agent records tool timeouts."""
+
+    def test_timeout_recorded_as_error(self, make_agent):
+        """A timed-out call becomes an error result, a tracker error type and an event."""
+        def hang(key: str) -> str:
+            """Hang for a while."""
+            time.sleep(1)
+            return key
+
+        observer = RecordingObserver()
+        agent = make_agent([FunctionTool(hang, timeout=0.05), slow_lookup], observers=[observer])
+        calls = [ToolCall(id="call_hang", name="hang", arguments={"key": "a"}),
+                 ToolCall(id="call_ok", name="slow_lookup", arguments={"key": "b"})]
+        ToolCallTracker.get_instance().clear()
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        results = [m for m in agent.memory.messages if m["role"] == "tool"]
+        assert results[0]["is_error"] is True
+        assert "timed out" in results[0]["content"]
+        assert results[1]["content"] == "value-b"
+        record = ToolCallTracker.get_instance().get_calls_for_tool("hang")[-1]
+        assert record.error_type == "ToolTimeoutError"
+        events = [e for e in observer.events if isinstance(e, FunctionResultEvent)]
+        assert events[0].error_type == "ToolTimeoutError"
+        assert events[0].event_data["error_type"] == "ToolTimeoutError"
+        assert events[1].error is None
+
+
+class TestGlobalRegistry:
+    """Tests for agents created without an explicit tool list."""
+
+    def test_registered_tools_used_when_tools_is_none(self, monkeypatch):
+        """Agents created with tools=None use the tools registered with @liteagent_tool."""
+        registry_tool = FunctionTool(slow_lookup)
+        monkeypatch.setattr(tools_module, "TOOLS", {"slow_lookup": tools_module._RegisteredTool(registry_tool)})
+
+        agent = LiteAgent(model="mock-model", name="registry-agent", provider="mock")
+
+        assert agent.tool_instances == {"slow_lookup": registry_tool}
+        assert agent.tools["slow_lookup"]["parameters"]["required"] == ["key"]
+
+
+class TestBatchedTools:
+    """Tests for tools with a batch implementation."""
+
+    @staticmethod
+    def make_weather_tool(batches, **kwargs):
+        def fetch_all(calls):
+            batches.append([call["city"] for call in calls])
+            return [ValueError("unknown city") if call["city"] == "Atlantis" else f"sunny in {call['city']}"
+                    for call in calls]
+
+        def get_weather(city: str) -> str:
+            """Get the weather for a city."""
+            return fetch_all([{"city": city}])[0]
+
+        return FunctionTool(get_weather, batch=fetch_all, **kwargs)
+
+    def test_repeated_calls_share_one_batch(self, make_agent):
+        """Calls of a batch tool run as one batch and results go back to each call id."""
+        batches = []
+        agent = make_agent([self.make_weather_tool(batches), slow_lookup])
+        calls = [
+            ToolCall(id="call_a", name="get_weather", arguments={"city": "Oslo"}),
+            ToolCall(id="call_b", name="slow_lookup", arguments={"key": "x"}),
+            ToolCall(id="call_c", name="get_weather", arguments={"city": "Atlantis"}),
+            ToolCall(id="call_d", name="get_weather", arguments={"city": 5}),
+            ToolCall(id="call_e", name="get_weather", arguments={"city": "Rome"}),
+        ]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert batches == [["Oslo", "Atlantis", "Rome"]]
+        results = {m["tool_call_id"]: m for m in agent.memory.messages if m["role"] == "tool"}
+        assert list(results) == ["call_a", "call_b", "call_c", "call_d", "call_e"]
+        assert results["call_a"]["content"] == "sunny in Oslo"
+        assert results["call_b"]["content"] == "value-x"
+        assert results["call_c"]["is_error"] and "unknown city" in results["call_c"]["content"]
+        assert results["call_d"]["is_error"]
+        assert results["call_e"]["content"] == "sunny in Rome"
+        assert len(ToolCallTracker.get_instance().get_calls_for_tool("get_weather")) == 4
+
+    def test_single_call_uses_function(self, make_agent):
+        """A lone call of a batch tool goes through the tool's function."""
+        batches = []
+        agent = make_agent([self.make_weather_tool(batches)])
+        calls = [ToolCall(id="call_a", name="get_weather", arguments={"city": "Oslo"})]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert agent.memory.messages[-1]["content"] == "sunny in Oslo"
+        assert batches == [["Oslo"]]
+
+    def test_cached_results_left_out_of_batch(self, make_agent):
+        """Only arguments missing from the tool's cache are sent to the batch."""
+        batches = []
+        agent = make_agent([self.make_weather_tool(batches, cache=True)])
+        first = [ToolCall(id=f"call_{city}", name="get_weather", arguments={"city": city}) for city in ("Oslo", "Rome")]
+        second = [ToolCall(id=f"again_{city}", name="get_weather", arguments={"city": city})
+                  for city in ("Oslo", "Rome", "Lima")]
+
+        agent._process_tool_calls(first, make_response(first))
+        agent._process_tool_calls(second, make_response(second))
+
+        assert batches == [["Oslo", "Rome"], ["Lima"]]
+        results = [m["content"] for m in agent.memory.messages if m["role"] == "tool"]
+        assert results[-3:] == ["sunny in Oslo", "sunny in Rome", "sunny in Lima"]
+
+    def test_batch_failure_recorded_for_every_call(self, make_agent):
+        """If the batch raises, each of its calls gets the error."""
+        def fail_all(calls):
+            raise RuntimeError("bulk endpoint down")
+
+        @tools_module.liteagent_tool(batch=fail_all)
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            return key
+
+        tools_module.TOOLS.pop("lookup", None)
+        agent = make_agent([lookup])
+        calls = [ToolCall(id=f"call_{i}", name="lookup", arguments={"key": str(i)}) for i in range(2)]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        results = [m for m in agent.memory.messages if m["role"] == "tool"]
+        assert all(m["is_error"] and "bulk endpoint down" in m["content"] for m in results)
+
+    def test_async_batch_awaited_in_async_loop(self, make_agent):
+        """Async batch implementations are awaited once for all calls."""
+        batches = []
+
+        async def fetch_all(calls):
+            batches.append([call["key"] for call in calls])
+            await asyncio.sleep(0)
+            return [f"async-{call['key']}" for call in calls]
+
+        async def fetch(key: str) -> str:
+            """Fetch a key."""
+            return (await fetch_all([{"key": key}]))[0]
+
+        agent = make_agent([FunctionTool(fetch, batch=fetch_all)])
+        calls = [ToolCall(id=f"call_{i}", name="fetch", arguments={"key": str(i)}) for i in range(3)]
+
+        asyncio.run(agent._aprocess_tool_calls(calls, make_response(calls)))
+
+        assert batches == [["0", "1", "2"]]
+        assert [m["content"] for m in agent.memory.messages if m["role"] == "tool"] == ["async-0", "async-1",
+                                                                                     "async-2"]
@@ -0,0 +1,149 @@
+"""
+Unit tests for the content-addressed blob store and image references in memory.
+
+Images come from tests/assets; no API keys are required.
+"""
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from liteagent.blob_store import BlobStore, downscale_image, get_blob_store, set_blob_store
+from liteagent.memory import ConversationMemory, MessageHistory, resolve_image_refs
+
+from .conftest import ScriptedProvider
+
+ASSETS = Path(__file__).parent.parent / "assets"
+IMAGE = str(ASSETS / "Unknown.png")
+
+
+@pytest.fixture(autouse=True)
+def blob_store():
+    previous = get_blob_store()
+    store = BlobStore()
+    set_blob_store(store)
+    yield store
+    set_blob_store(previous)
+
+
+class TestBlobStore:
+    """Tests for BlobStore."""
+
+    def test_content_is_deduplicated(self, blob_store):
+        first = blob_store.put(b"same bytes")
+        second = blob_store.put(b"same bytes")
+
+        assert first == second
+        assert len(blob_store) == 1
+        assert blob_store.get(first) == b"same bytes"
+
+    def test_directory_store_persists(self, tmp_path):
+        digest = BlobStore(root=str(tmp_path)).put_file(IMAGE)
+
+        reopened = BlobStore(root=str(tmp_path))
+
+        assert digest in reopened
+        assert len(reopened) == 1
+        assert reopened.get(digest) == Path(IMAGE).read_bytes()
+        with pytest.raises(KeyError):
+            reopened.get("missing")
+
+    def test_data_url_encoded_once(self, blob_store):
+        digest = blob_store.put(b"image bytes")
+
+        url = blob_store.data_url(digest, "image/png")
+
+        assert url == "data:image/png;base64," + base64.b64encode(b"image bytes").decode()
+        assert blob_store.data_url(digest, "image/png") is url
+
+    def test_least_recently_used_blobs_are_evicted(self):
+        store = BlobStore(max_bytes=10)
+        first = store.put(b"aaaa")
+        second = store.put(b"bbbb")
+        store.get(first)
+        third = store.put(b"cccc")
+
+        assert first in store and third in store
+        assert second not in store
+        assert store.put(b"x" * 20) in store
+        assert len(store) == 1
+
+    def test_delete(self, blob_store, tmp_path):
+        for store in (blob_store, BlobStore(root=str(tmp_path))):
+            digest = store.put(b"image bytes")
+            store.data_url(digest, "image/png")
+
+            store.delete(digest)
+            store.delete(digest)
+
+            assert digest not in store
+            with pytest.raises(KeyError):
+                store.data_url(digest, "image/png")
+
+    def test_downscale_without_pillow_is_a_no_op(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "PIL", None)
+
+        assert downscale_image(b"raw", "image/png", 10) == (b"raw", "image/png")
+
+
+class TestImageReferences:
+    """Tests for image references stored in conversation memory."""
+
+    def test_memory_stores_small_deduplicated_references(self, blob_store):
+        first = ConversationMemory("System prompt")
+        second = ConversationMemory("System prompt")
+        first.add_user_message_with_images("Look", [IMAGE, IMAGE])
+        second.add_user_message_with_images("Look too", [IMAGE])
+
+        message = first.messages[-1]
+        refs = [item["image_ref"] for item in message["content"][1:]]
+        assert len(blob_store) == 1
+        assert refs[0] == refs[1] == second.messages[-1]["content"][1]["image_ref"]
+        assert len(json.dumps(dict(message))) < 400
+
+    def test_resolution_keeps_history_links(self):
+        memory = ConversationMemory("System prompt")
+        memory.add_user_message("No images here")
+        history = memory.get_messages()
+        assert resolve_image_refs(history) is history
+
+        memory.add_user_message_with_images("Look", [IMAGE])
+        resolved = resolve_image_refs(memory.get_messages())
+
+        assert isinstance(resolved, MessageHistory)
+        assert resolved[-1]["content"][1]["image_url"]["url"].startswith("data:image/png;base64,")
+        assert resolved.token_count == memory.token_count
+        assert memory.messages[-1]["content"][1]["type"] == "image_ref"
+
+    def test_images_encoded_at_send_time(self, make_agent):
+        provider = ScriptedProvider(["seen"], max_image_dimension=512)
+        agent = make_agent(provider=provider)
+        agent.memory.add_user_message_with_images("What is this?", [IMAGE])
+
+        agent.model_interface.generate_response(agent.memory.get_messages())
+
+        sent = provider.requests[-1].messages[-1]["content"][1]
+        assert sent["type"] == "image_url"
+        assert base64.b64decode(sent["image_url"]["url"].split(",", 1)[1]) == Path(IMAGE).read_bytes()
+        assert agent.memory.messages[-1]["content"][1]["type"] == "image_ref"
+
+    def test_conversions_with_images_are_not_cached(self):
+        memory = ConversationMemory("System prompt")
+        memory.add_user_message("No images here")
+        memory.add_user_message_with_images("Look", [IMAGE])
+
+        resolve_image_refs(memory.get_messages()).converted("test", dict)
+
+        assert sorted(memory._conversion_cache["test"]) == [0, 1]
+
+    def test_missing_images_are_replaced_by_a_note(self, blob_store):
+        memory = ConversationMemory("System prompt")
+        memory.add_user_message_with_images("Look", [IMAGE])
+        blob_store.delete(memory.messages[-1]["content"][1]["image_ref"]["digest"])
+
+        resolved = resolve_image_refs(memory.get_messages())
+
+        assert resolved[-1]["content"][1] == {"type": "text", "text": "[Image no longer available]"}
@@ -0,0 +1,89 @@
+"""
+Unit tests for LiteAgent.chat_many and chat_many_jsonl.
+
+An echoing provider answers each conversation from its own history, so the
+tests can check isolation and concurrency without API keys.
+"""
+
+import json
+import time
+from typing import Dict, Optional
+
+from .conftest import RecordingRateLimiter, ScriptedProvider
+
+
+def echo_provider(delays: Optional[Dict[str, float]] = None) -> ScriptedProvider:
+    """Provider that replies with the conversation's user messages after a delay."""
+    delays = delays or {}
+
+    def user_messages(messages):
+        return [m["content"] for m in messages if m["role"] == "user"]
+
+    return ScriptedProvider(reply=lambda messages: "echo: " + " | ".join(user_messages(messages)),
+                            delay=lambda messages: delays.get(user_messages(messages)[-1], 0.05))
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+class TestChatMany:
+    """Tests for concurrent batch conversations."""
+
+    def test_conversations_are_isolated(self, make_agent):
+        provider = echo_provider()
+        agent = make_agent([add], provider)
+        prompts = [f"prompt {i}" for i in range(6)]
+
+        results = dict(agent.chat_many(prompts, concurrency=3, rate_limit=False))
+
+        assert results == {i: f"echo: prompt {i}" for i in range(6)}
+        assert len(agent.memory.messages) == 1
+        assert all(len(messages) == 2 for messages, _ in provider.requests)
+
+    def test_concurrency_is_bounded(self, make_agent):
+        provider = echo_provider()
+        agent = make_agent([add], provider)
+
+        start = time.time()
+        list(agent.chat_many([f"p{i}" for i in range(8)], concurrency=4, rate_limit=False))
+
+        assert provider.peak == 4
+        assert time.time() - start < 0.05 * 8 / 2
+
+    def test_results_yielded_as_completed(self, make_agent):
+        provider = echo_provider(delays={"slow": 0.3, "fast": 0.01})
+        agent = make_agent([add], provider)
+
+        order = [index for index, _ in agent.chat_many(["slow", "fast"], concurrency=2, rate_limit=False)]
+
+        assert order == [1, 0]
+
+    def test_shares_tool_manifest_and_rate_limiter(self, monkeypatch, make_agent):
+        limiter = RecordingRateLimiter()
+        monkeypatch.setattr("liteagent.agent.get_rate_limiter", lambda: limiter)
+        provider = echo_provider()
+        agent = make_agent([add], provider)
+
+        list(agent.chat_many(["a", "b", "c"], concurrency=2))
+
+        assert all(tools is agent._prepare_tools() for _, tools in provider.requests)
+        assert len(limiter.waits) == len(limiter.consumed) == 3
+        assert limiter.waits[0][:2] == ("scripted", "scripted-model")
+
+    def test_jsonl_round_trip(self, tmp_path, make_agent):
+        agent = make_agent([add], echo_provider())
+        input_path = tmp_path / "in.jsonl"
+        output_path = tmp_path / "out.jsonl"
+        input_path.write_text('{"id": "a", "prompt": "first"}\n\n"second"\n')
+
+        written = agent.chat_many_jsonl(str(input_path), str(output_path), concurrency=2, rate_limit=False)
+
+        records = sorted((json.loads(line) for line in output_path.read_text().splitlines()),
+                         key=lambda r: r["index"])
+        assert written == 2
+        assert records == [
+            {"index": 0, "id": "a", "prompt": "first", "response": "echo: first"},
+            {"index": 1, "prompt": "second", "response": "echo: second"},
+        ]
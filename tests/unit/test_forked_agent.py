@@ -24,6 +24,18 @@ class TestForkedMemoryBasic:
         assert forked_memory.system_prompt == "System prompt"
         assert forked_memory._fork_point == 2
         
+    def test_forked_memory_keeps_token_budget(self):
+        """Test that a fork sends no more of the history than its parent."""
+        parent_memory = ConversationMemory("System prompt")
+        for i in range(20):
+            parent_memory.add_user_message(f"Message {i} " + "x" * 200)
+        parent_memory.token_budget = 200
+        
+        forked_memory = ForkedMemory(parent_memory)
+        
+        assert forked_memory.token_budget == 200
+        assert forked_memory.get_messages() == parent_memory.get_messages()
+        
     def test_forked_memory_with_prefill(self):
         """Test forked memory with prefill messages."""
         parent_memory = ConversationMemory("System")
@@ -11,7 +11,7 @@ import base64
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from liteagent.memory import ConversationMemory
+from liteagent.memory import ConversationMemory, resolve_image_refs
 from liteagent.agent import LiteAgent
 from liteagent.capabilities import get_model_capabilities
 
@@ -64,8 +64,13 @@ class TestImageCapabilities:
         assert text_content["type"] == "text"
         assert text_content["text"] == test_message
         
-        # Check image content
+        # Memory keeps a reference to the stored image
         image_content = user_message["content"][1]
+        assert image_content["type"] == "image_ref"
+        assert image_content["image_ref"]["media_type"] == "image/png"
+        
+        # The image is encoded when the messages are sent
+        image_content = resolve_image_refs(memory.get_messages())[1]["content"][1]
         assert image_content["type"] == "image_url"
         assert "image_url" in image_content
         assert image_content["image_url"]["url"].startswith("data:image/")
@@ -89,8 +94,8 @@ class TestImageCapabilities:
         
         # Check all are properly formatted
         assert user_message["content"][0]["type"] == "text"
-        assert user_message["content"][1]["type"] == "image_url"
-        assert user_message["content"][2]["type"] == "image_url"
+        assert user_message["content"][1]["type"] == "image_ref"
+        assert user_message["content"][2]["type"] == "image_ref"
     
     def test_memory_add_user_message_with_url_images(self):
         """Test adding user message with URL images."""
@@ -121,7 +126,7 @@ class TestImageCapabilities:
         
         user_message = memory.messages[1]
         assert len(user_message["content"]) == 1  # Only image, no text
-        assert user_message["content"][0]["type"] == "image_url"
+        assert user_message["content"][0]["type"] == "image_ref"
     
     def test_memory_image_format_detection(self, test_image_files):
         """Test proper image format detection and base64 encoding."""
@@ -133,7 +138,7 @@ class TestImageCapabilities:
         for image_name, image_path in test_image_files.items():
             memory.add_user_message_with_images(f"Test {image_name}", [image_path])
             
-            user_message = memory.messages[-1]
+            user_message = resolve_image_refs(memory.get_messages())[-1]
             image_content = user_message["content"][1]
             image_url = image_content["image_url"]["url"]
             
@@ -249,8 +254,8 @@ class TestAgentImageSupport:
                 user_message = user_messages[-1]
                 assert isinstance(user_message['content'], list)
                 
-                # Should have both text and image content
-                content_types = [item['type'] for item in user_message['content']]
+                # Should have both text and image content (encoded by the model interface)
+                content_types = [item['type'] for item in resolve_image_refs(messages)[-1]['content']]
                 assert 'text' in content_types
                 assert 'image_url' in content_types
     
@@ -9,6 +9,7 @@ import pytest
 from typing import Dict, List
 
 from liteagent.memory import ConversationMemory
+from liteagent.messages import Message
 
 
 class TestConversationMemory:
@@ -197,4 +198,69 @@ class TestConversationMemory:
         assert memory.messages[0]["role"] == "system"
         assert memory.messages[0]["content"] == system_prompt
         assert memory.function_calls == {}
-        assert memory.last_function_call is None 
\ No newline at end of file
+        assert memory.last_function_call is None 
+
+class TestMessageRecords:
+    """Test suite for the compact Message records stored in memory."""
+    
+    def test_stored_messages_are_records(self) -> None:
+        """Test that messages are stored as read-only records that read like dicts."""
+        memory = ConversationMemory(system_prompt="System prompt")
+        memory.add_tool_result("get_weather", "Sunny", "call_1", is_error=True)
+        
+        message = memory.messages[-1]
+        assert isinstance(message, Message)
+        assert message == {"role": "tool", "content": "Sunny", "tool_call_id": "call_1",
+                           "name": "get_weather", "is_error": True}
+        assert message.get("is_error") is True
+        assert "pinned" not in message
+        assert {**message, "pinned": True}["pinned"] is True
+        with pytest.raises(TypeError, match="replace_message"):
+            message["content"] = "Rainy"
+    
+    def test_replace_message(self) -> None:
+        """Test that replace_message swaps in an edited record and recounts it."""
+        memory = ConversationMemory(system_prompt="System prompt")
+        memory.add_user_message("short")
+        memory.pin_message()
+        before = memory.token_count
+        
+        memory.replace_message(1, content="a much longer question " * 10)
+        
+        assert memory.messages[1] == {"role": "user", "content": "a much longer question " * 10, "pinned": True}
+        assert isinstance(memory.messages[1], Message)
+        assert memory.token_count > before
+        assert memory.token_count == memory.count_tokens(list(memory.messages))
+        assert memory.get_messages()[1]["content"] == "a much longer question " * 10
+    
+    def test_records_share_layout_and_roles(self) -> None:
+        """Test that records with the same keys share a layout and interned roles."""
+        first = Message({"role": "".join(["us", "er"]), "content": "a"})
+        second = Message({"role": "user", "content": "b"})
+        
+        assert first._shape is second._shape
+        assert first.role is second.role
+    
+    def test_get_messages_builds_provider_dicts(self) -> None:
+        """Test that get_messages returns new plain dicts without internal fields."""
+        memory = ConversationMemory(system_prompt="System prompt")
+        memory.add_function_result("lookup", "done", args={"key": "a"}, call_id="fn_1")
+        memory.pin_message()
+        
+        history = memory.get_messages()
+        
+        assert type(history[-1]) is dict
+        assert not set(history[-1]) & {"args", "function_call_id", "is_error", "pinned"}
+        history[-1]["content"] = "changed"
+        assert memory.messages[-1]["content"] == "done"
+    
+    def test_records_copy_and_pickle(self) -> None:
+        """Test that records survive copying and pickling."""
+        import copy
+        import pickle
+        
+        message = Message({"role": "assistant", "content": None, "tool_calls": [{"id": "call_1"}]})
+        
+        assert pickle.loads(pickle.dumps(message)) == message
+        duplicate = copy.deepcopy(message)
+        assert duplicate == message and duplicate["tool_calls"] is not message["tool_calls"]
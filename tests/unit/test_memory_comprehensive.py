@@ -490,5 +490,78 @@ class TestConversationMemoryComprehensive:
         assert memory.is_function_call_loop(func_name, empty_args)
 
 
+class TestContextWindowing:
+    """Tests for token-budgeted message windowing."""
+    
+    def build_memory(self, turns: int = 5) -> ConversationMemory:
+        """Build a memory with several turns, each using a tool."""
+        memory = ConversationMemory(system_prompt="System prompt")
+        for i in range(turns):
+            memory.add_user_message(f"question {i} " + "x" * 200)
+            memory.add_tool_call("lookup", {"key": str(i)}, f"call_{i}")
+            memory.add_tool_result("lookup", "y" * 200, f"call_{i}")
+            memory.add_assistant_message(f"answer {i}")
+        return memory
+    
+    def test_no_budget_returns_everything(self):
+        memory = self.build_memory()
+        
+        assert len(memory.get_messages()) == len(memory.messages)
+    
+    def test_budget_keeps_system_prompt_and_recent_turns(self):
+        memory = self.build_memory()
+        memory.token_budget = 300
+        
+        messages = memory.get_messages()
+        
+        assert messages[0] == {"role": "system", "content": "System prompt"}
+        assert messages[1]["content"].startswith("question 3")
+        assert messages[-1]["content"] == "answer 4"
+        assert len(messages) == 9
+    
+    def test_tool_calls_stay_with_results(self):
+        memory = self.build_memory()
+        for budget in range(50, 800, 25):
+            memory.token_budget = budget
+            messages = memory.get_messages()
+            call_ids = [m["tool_calls"][0]["id"] for m in messages if m.get("tool_calls")]
+            result_ids = [m["tool_call_id"] for m in messages if m["role"] == "tool"]
+            assert call_ids == result_ids
+            assert messages[1]["role"] == "user"
+    
+    def test_latest_turn_always_kept(self):
+        memory = self.build_memory()
+        memory.token_budget = 1
+        
+        messages = memory.get_messages()
+        
+        assert [m["role"] for m in messages] == ["system", "user", "assistant", "tool", "assistant"]
+    
+    def test_pinned_messages_survive(self):
+        memory = self.build_memory()
+        memory.pin_message(1)
+        memory.pin_message(7)
+        memory.token_budget = 300
+        
+        messages = memory.get_messages()
+        
+        assert messages[1]["content"].startswith("question 0")
+        assert messages[2]["role"] == "assistant" and messages[2]["tool_calls"][0]["id"] == "call_1"
+        assert messages[3]["tool_call_id"] == "call_1"
+        assert all("pinned" not in m for m in messages)
+    
+    def test_agent_budget_from_context_window(self, monkeypatch):
+        from liteagent import LiteAgent
+        from liteagent.models import ModelInterface
+        monkeypatch.setattr(ModelInterface, "get_context_window", lambda self: 1000)
+        
+        windowed = LiteAgent(model="mock-model", name="window-agent", provider="mock", tools=[],
+                             context_window_share=0.5)
+        unbounded = LiteAgent(model="mock-model", name="window-agent", provider="mock", tools=[],
+                              context_window_share=None)
+        
+        assert windowed.memory.token_budget == 500
+        assert unbounded.memory.token_budget is None
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Unit tests for the incremental provider message conversion cache.
+
+Messages returned by ConversationMemory.get_messages carry a link to the
+memory's conversion cache, so providers only convert messages they have not
+seen before. No API keys are required.
+"""
+
+import pytest
+
+from liteagent.memory import ConversationMemory, MessageHistory
+from liteagent.providers.anthropic_provider import AnthropicProvider
+from liteagent.providers.ollama_provider import OllamaProvider
+
+
+@pytest.fixture
+def provider():
+    return AnthropicProvider("claude-3-5-haiku-20241022", api_key="test-key")
+
+
+@pytest.fixture
+def memory():
+    memory = ConversationMemory(system_prompt="You are helpful.")
+    memory.add_user_message("What is the weather in Paris?")
+    memory.add_tool_call("get_weather", {"city": "Paris"}, "call_1")
+    memory.add_tool_result("get_weather", "Sunny", "call_1")
+    return memory
+
+
+def counting(provider):
+    """Wrap the provider's per-message converter to count calls."""
+    calls = []
+    original = provider._convert_message
+
+    def convert(message):
+        calls.append(message)
+        return original(message)
+
+    provider._convert_message = convert
+    return calls
+
+
+class TestMessageConversionCache:
+    """Tests for MessageHistory.converted and AnthropicProvider._convert_messages."""
+
+    def test_only_new_messages_are_converted(self, provider, memory):
+        calls = counting(provider)
+
+        first = provider._convert_messages(memory.get_messages())
+        memory.add_assistant_message("It is sunny in Paris.")
+        second = provider._convert_messages(memory.get_messages())
+
+        assert len(calls) == 5
+        assert calls[-1]["content"] == "It is sunny in Paris."
+        assert second[:4] == first
+        assert all(a is b for a, b in zip(first, second))
+        assert second[2]["content"][0]["input"] == {"city": "Paris"}
+
+    def test_matches_uncached_conversion(self, provider, memory):
+        cached = provider._convert_messages(memory.get_messages())
+        uncached = provider._convert_messages(list(memory.get_messages()))
+
+        assert cached == uncached
+
+    def test_reset_and_system_prompt_update_invalidate(self, provider, memory):
+        provider._convert_messages(memory.get_messages())
+
+        memory.update_system_prompt("You are terse.")
+        assert provider._convert_messages(memory.get_messages())[0]["content"] == "You are terse."
+
+        memory.reset()
+        memory.add_user_message("Hello")
+        converted = provider._convert_messages(memory.get_messages())
+        assert [m["content"] for m in converted] == ["You are terse.", "Hello"]
+
+    def test_modified_history_is_not_cached(self, provider, memory):
+        messages = memory.get_messages()
+        messages[1] = {"role": "user", "content": "Edited"}
+
+        assert provider._convert_messages(messages)[1]["content"] == "Edited"
+        assert provider._convert_messages(memory.get_messages())[1]["content"] == "What is the weather in Paris?"
+
+    def test_count_limited_history(self, provider, memory):
+        calls = counting(provider)
+        provider._convert_messages(memory.get_messages())
+
+        recent = memory.get_messages(count=2)
+        provider._convert_messages(recent)
+
+        assert isinstance(recent, MessageHistory)
+        assert len(calls) == 4
+
+    def test_caching_marks_do_not_leak_into_cache(self, provider, memory):
+        memory.add_user_message("x" * 2000)
+        provider.supports_caching = lambda: True
+
+        params = provider._prepare_request(memory.get_messages(), enable_caching=True)
+        plain = provider._prepare_request(memory.get_messages())
+
+        assert params["messages"][-1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert plain["messages"][-1]["content"] == "x" * 2000
+
+
+class TestOllamaConversionCache:
+    """Tests for OllamaProvider._preprocess_messages_for_ollama."""
+
+    def test_only_new_messages_are_converted(self, memory):
+        provider = OllamaProvider("llama3.1:8b")
+        calls = counting(provider)
+
+        first = provider._preprocess_messages_for_ollama(memory.get_messages())
+        memory.add_assistant_message("It is sunny in Paris.")
+        second = provider._preprocess_messages_for_ollama(memory.get_messages())
+
+        assert len(calls) == 5
+        assert all(a is b for a, b in zip(first, second))
+        assert second[2]["tool_calls"][0]["function"]["arguments"] == {"city": "Paris"}
+        assert isinstance(memory.messages[2]["tool_calls"][0]["function"]["arguments"], str)
+        assert provider._preprocess_messages_for_ollama(list(memory.get_messages())) == second
@@ -679,5 +679,86 @@ class TestEdgeCases:
         assert len(observer.agent_events["test-agent"]) == 1
 
 
+class CountingStr:
+    """Object that counts how often it is converted to a string."""
+    
+    def __init__(self):
+        self.str_calls = 0
+    
+    def __str__(self):
+        self.str_calls += 1
+        return "x" * 500
+
+
+class RecordingObserver(AgentObserver):
+    """Observer that records events and the handler that received them."""
+    
+    def __init__(self, subscribed_events=None):
+        self.subscribed_events = subscribed_events
+        self.events = []
+        self.handled_by = []
+    
+    def on_event(self, event):
+        self.events.append(event)
+    
+    def on_function_call(self, event):
+        self.handled_by.append("on_function_call")
+        super().on_function_call(event)
+
+
+class TestLazyEventDispatch:
+    """Test that agents only build events that some observer subscribes to."""
+    
+    def test_no_observers_builds_no_events(self, monkeypatch, make_agent):
+        agent = make_agent()
+        built = []
+        monkeypatch.setattr(ModelResponseEvent, "__init__",
+                            lambda self, **kwargs: built.append(kwargs))
+        response = CountingStr()
+        
+        agent._emit(ModelResponseEvent, response=response)
+        
+        assert built == []
+        assert response.str_calls == 0
+    
+    def test_unsubscribed_event_types_are_skipped(self, make_agent):
+        observer = RecordingObserver(subscribed_events=(FunctionCallEvent,))
+        agent = make_agent(observers=[observer])
+        
+        agent._emit(UserMessageEvent, message="hi")
+        agent._emit(FunctionCallEvent, function_name="lookup", function_args={"key": "a"})
+        
+        assert [type(e) for e in observer.events] == [FunctionCallEvent]
+        assert observer.handled_by == ["on_function_call"]
+    
+    def test_dispatch_table_follows_observer_list(self, make_agent):
+        first = RecordingObserver()
+        agent = make_agent(observers=[first])
+        agent._emit(UserMessageEvent, message="one")
+        
+        second = RecordingObserver()
+        agent.add_observer(second)
+        agent._emit(UserMessageEvent, message="two")
+        agent.remove_observer(first)
+        agent._emit(UserMessageEvent, message="three")
+        
+        assert [e.message for e in first.events if isinstance(e, UserMessageEvent)] == ["one", "two"]
+        assert [e.message for e in second.events] == ["two", "three"]
+    
+    def test_response_summary_computed_on_access(self):
+        response = CountingStr()
+        event = ModelResponseEvent(agent_id="a", agent_name="n", context_id="c", response=response)
+        
+        assert response.str_calls == 0
+        assert event.event_data["response_summary"] == "x" * 100 + "..."
+        event.to_dict()
+        assert response.str_calls == 1
+    
+    def test_events_use_slots(self):
+        event = FunctionCallEvent(agent_id="a", agent_name="n", context_id="c", function_name="f")
+        
+        assert not hasattr(event, "__dict__")
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
\ No newline at end of file
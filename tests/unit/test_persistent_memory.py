@@ -0,0 +1,201 @@
+"""
+Unit tests for PersistentConversationMemory.
+
+Sessions are stored in temporary SQLite files; no API keys are required.
+"""
+
+import copy
+import threading
+from pathlib import Path
+
+import pytest
+
+from liteagent import LiteAgent
+from liteagent.blob_store import BlobStore
+from liteagent.memory import ConversationMemory, resolve_image_refs
+from liteagent.messages import MessageList
+from liteagent.persistent_memory import PersistentConversationMemory, SQLiteMessageStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def fill(memory: ConversationMemory, turns: int = 3) -> None:
+    """Add the same conversation to any memory."""
+    for i in range(turns):
+        memory.add_user_message(f"question {i} " + "x" * 100)
+        memory.add_tool_call("lookup", {"key": str(i)}, f"call_{i}")
+        memory.add_tool_result("lookup", "y" * 100, f"call_{i}")
+        memory.add_function_result("lookup", "done", args={"key": str(i)}, call_id=f"fn_{i}")
+        memory.add_assistant_message(f"answer {i}")
+
+
+class TestPersistentConversationMemory:
+    """Tests for the SQLite-backed memory."""
+
+    def test_matches_in_memory_behaviour(self, db_path):
+        plain = ConversationMemory(system_prompt="System prompt")
+        persistent = PersistentConversationMemory("System prompt", db_path)
+        for memory in (plain, persistent):
+            fill(memory)
+            memory.pin_message(1)
+            memory.update_system_prompt("New prompt")
+
+        assert persistent.get_messages() == plain.get_messages()
+        assert persistent.get_messages(count=3) == plain.get_messages(count=3)
+        assert persistent.token_count == plain.token_count
+        assert persistent.get_last_function_result("lookup") == plain.get_last_function_result("lookup")
+
+        plain.token_budget = persistent.token_budget = 150
+        assert persistent.get_messages() == plain.get_messages()
+
+    def test_resume_session_without_replay(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path, session_id="user-42")
+        fill(memory)
+        memory.pin_message(6)
+
+        resumed = PersistentConversationMemory("Ignored prompt", SQLiteMessageStore(db_path), session_id="user-42")
+
+        assert len(resumed.messages._resident) == 0
+        assert resumed.token_count == memory.token_count
+        assert resumed.messages.pinned_indices() == [6]
+        assert resumed.get_messages() == memory.get_messages()
+
+    def test_summary_survives_reload_and_resume(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path, session_id="user-42")
+        fill(memory)
+        assert memory.apply_summary("Earlier questions 0 and 1", 11, last_message=dict(memory.messages[10]))
+
+        memory.release()
+        assert memory.get_summary() is not None
+
+        resumed = PersistentConversationMemory("System prompt", SQLiteMessageStore(db_path), session_id="user-42")
+        assert resumed.get_summary() == memory.get_summary()
+        assert resumed.get_messages() == memory.get_messages()
+
+        resumed.messages[10] = {"role": "assistant", "content": "rewritten"}
+        assert resumed.get_summary() is None
+
+        resumed.reset()
+        assert PersistentConversationMemory("System prompt", db_path, session_id="user-42").summary is None
+
+    def test_images_are_kept_with_the_session(self, db_path):
+        image = str(Path(__file__).parent.parent / "assets" / "Unknown.png")
+        memory = PersistentConversationMemory("System prompt", db_path, session_id="user-42")
+        memory.add_user_message_with_images("Look", [image])
+
+        resumed = PersistentConversationMemory("System prompt", db_path, session_id="user-42")
+        resolved = resolve_image_refs(resumed.get_messages())
+
+        assert resumed.blob_store.root == f"{db_path}.blobs"
+        assert resolved[-1]["content"][1]["image_url"]["url"].startswith("data:image/png;base64,")
+        with pytest.raises(ValueError):
+            PersistentConversationMemory("System prompt", db_path, blob_store=BlobStore())
+
+    def test_only_recent_messages_stay_resident(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path, resident_messages=4)
+        fill(memory, turns=10)
+
+        assert len(memory.messages) == 51
+        assert sorted(memory.messages._resident) == [47, 48, 49, 50]
+
+        memory.token_budget = 120
+        window = memory.get_messages()
+        assert window[0]["role"] == "system"
+        assert len(memory.messages._resident) <= 4
+
+        memory.release()
+        assert len(memory.messages._resident) == 0
+        assert memory.messages[-1]["content"] == "answer 9"
+
+    def test_slices_leave_resident_messages_alone(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path, resident_messages=4)
+        fill(memory, turns=4)
+        resident = list(memory.messages._resident.items())
+
+        messages = memory.messages[1:20:2]
+
+        assert messages == list(memory.messages)[1:20:2]
+        assert memory.messages[15:][-1] is resident[-1][1]
+        assert list(memory.messages._resident.items()) == resident
+
+    def test_concurrent_reads_while_appending(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path, resident_messages=8)
+        fill(memory, turns=2)
+        errors = []
+        done = threading.Event()
+
+        def read():
+            try:
+                while not done.is_set():
+                    count = len(memory.messages)
+                    memory.messages[count // 2]
+                    memory.messages[:count // 2]
+            except Exception as e:
+                errors.append(e)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            fill(memory, turns=40)
+        finally:
+            done.set()
+            reader.join()
+
+        assert errors == []
+        assert len(memory.messages._resident) <= 8
+
+    def test_structural_changes_and_reset(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path)
+        fill(memory, turns=1)
+        expected = list(memory.messages)
+
+        memory.messages.insert(1, {"role": "user", "content": "inserted"})
+        expected.insert(1, {"role": "user", "content": "inserted"})
+        del memory.messages[2]
+        del expected[2]
+        memory.messages.pop()
+        expected.pop()
+        memory.replace_message(1, content="edited")
+        expected[1] = {"role": "user", "content": "edited"}
+
+        assert memory.messages == expected
+        assert memory.token_count == sum(memory.tokenizer.count_message(m) for m in expected)
+
+        memory.reset()
+        assert memory.messages == [{"role": "system", "content": "System prompt"}]
+        assert PersistentConversationMemory("System prompt", db_path, memory.session_id).messages == memory.messages
+
+    def test_fork_copies_to_memory(self, db_path):
+        memory = PersistentConversationMemory("System prompt", db_path)
+        fill(memory, turns=1)
+
+        duplicate = copy.deepcopy(memory.messages)
+
+        assert isinstance(duplicate, MessageList)
+        assert duplicate == list(memory.messages)
+        assert duplicate.token_count == memory.token_count
+
+    def test_sessions_share_a_store(self, db_path):
+        store = SQLiteMessageStore(db_path)
+        first = PersistentConversationMemory("System prompt", store, session_id="a")
+        second = PersistentConversationMemory("System prompt", store, session_id="b")
+        first.add_user_message("only in a")
+
+        assert store.sessions() == ["a", "b"]
+        assert len(second.messages) == 1
+
+        store.delete_session("a")
+        assert store.sessions() == ["b"]
+
+    def test_agent_uses_persistent_memory(self, db_path):
+        agent = LiteAgent(model="mock-model", name="persistent-agent", provider="mock", tools=[])
+        agent.memory = PersistentConversationMemory(agent.system_prompt, db_path, session_id="chat")
+
+        response = agent.chat("hello")
+
+        resumed = PersistentConversationMemory(agent.system_prompt, db_path, session_id="chat")
+        assert [m["role"] for m in resumed.messages] == ["system", "user", "assistant"]
+        assert resumed.messages[-1]["content"] == response
@@ -0,0 +1,203 @@
+"""
+Unit tests for streamed responses.
+
+Covers delta assembly in StreamAccumulator, the OpenAI and Anthropic stream
+converters fed with recorded chunk shapes, and LiteAgent.stream_chat driven
+by a scripted provider. No API keys are required.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+from liteagent.providers import StreamAccumulator, ToolCall
+
+from .conftest import RecordingRateLimiter, ScriptedProvider, text_response, tool_response
+
+
+def openai_chunk(content=None, tool_calls=None, finish_reason=None, usage=None, choices=True):
+    """Build an OpenAI ChatCompletionChunk."""
+    data = {
+        "id": "chunk",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [],
+    }
+    if choices:
+        delta = {}
+        if content is not None:
+            delta["content"] = content
+        if tool_calls is not None:
+            delta["tool_calls"] = tool_calls
+        data["choices"] = [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    if usage:
+        data["usage"] = usage
+    return ChatCompletionChunk.model_validate(data)
+
+
+class TestStreamAccumulator:
+    """Tests for incremental response assembly."""
+
+    def test_text_and_tool_call_fragments(self):
+        acc = StreamAccumulator("model", "provider")
+        acc.add_text("Hel")
+        acc.add_text("lo")
+        acc.add_tool_call_delta(0, id="call_1", name="get_weather", arguments='{"ci')
+        acc.add_tool_call_delta(1, id="call_2", name="get_time", arguments="")
+        acc.add_tool_call_delta(0, arguments='ty": "Paris"}')
+
+        response = acc.build()
+
+        assert response.content == "Hello"
+        assert response.tool_calls == [
+            ToolCall(id="call_1", name="get_weather", arguments={"city": "Paris"}),
+            ToolCall(id="call_2", name="get_time", arguments={}),
+        ]
+
+    def test_complete_argument_dicts(self):
+        acc = StreamAccumulator("model", "ollama")
+        acc.add_tool_call_delta(0, name="lookup", arguments={"key": "a"})
+
+        response = acc.build()
+
+        assert response.content is None
+        assert response.tool_calls[0].arguments == {"key": "a"}
+        assert response.tool_calls[0].id == "ollama_tool_0"
+
+    def test_invalid_json_arguments_raise(self):
+        acc = StreamAccumulator("model", "provider")
+        acc.add_tool_call_delta(0, id="call_1", name="broken", arguments='{"a": ')
+
+        with pytest.raises(ValueError):
+            acc.build()
+
+
+class TestOpenAIStreaming:
+    """Tests for OpenAIProvider.stream_response."""
+
+    @pytest.fixture
+    def provider(self):
+        from liteagent.providers.openai_provider import OpenAIProvider
+        provider = OpenAIProvider("gpt-4o-mini", api_key="test-key")
+        provider.supports_tool_calling = lambda: True
+        provider.supports_parallel_tools = lambda: True
+        return provider
+
+    def test_stream_text_tool_calls_and_usage(self, provider):
+        chunks = [
+            openai_chunk(content="Let me "),
+            openai_chunk(content="check."),
+            openai_chunk(tool_calls=[{"index": 0, "id": "call_1", "type": "function",
+                                      "function": {"name": "get_weather", "arguments": ""}}]),
+            openai_chunk(tool_calls=[{"index": 0, "function": {"arguments": '{"city":'}}]),
+            openai_chunk(tool_calls=[{"index": 0, "function": {"arguments": ' "Paris"}'}}]),
+            openai_chunk(finish_reason="tool_calls"),
+            openai_chunk(choices=False, usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}),
+        ]
+        captured = {}
+
+        def fake_create(**params):
+            captured.update(params)
+            return iter(chunks)
+
+        provider.client.chat.completions.create = fake_create
+
+        output = list(provider.stream_response([{"role": "user", "content": "weather?"}],
+                                               tools=[{"type": "function", "function": {"name": "get_weather"}}]))
+
+        assert captured["stream"] is True
+        assert captured["stream_options"] == {"include_usage": True}
+        assert [c.delta for c in output[:-1]] == ["Let me ", "check."]
+        final = output[-1].response
+        assert final.content == "Let me check."
+        assert final.tool_calls == [ToolCall(id="call_1", name="get_weather", arguments={"city": "Paris"})]
+        assert final.finish_reason == "tool_calls"
+        assert final.usage["total_tokens"] == 15
+
+
+class TestAnthropicStreaming:
+    """Tests for AnthropicProvider event assembly."""
+
+    def test_accumulate_events(self):
+        from liteagent.providers.anthropic_provider import AnthropicProvider
+        provider = AnthropicProvider("claude-3-5-haiku-20241022", api_key="test-key")
+        acc = StreamAccumulator(provider.model_name, provider.provider_name)
+
+        events = [
+            SimpleNamespace(type="message_start", message=SimpleNamespace(
+                model="claude-3-5-haiku-20241022",
+                usage=SimpleNamespace(input_tokens=12, output_tokens=1,
+                                      cache_read_input_tokens=0, cache_creation_input_tokens=0))),
+            SimpleNamespace(type="content_block_start", index=0, content_block=SimpleNamespace(type="text", text="")),
+            SimpleNamespace(type="content_block_delta", index=0, delta=SimpleNamespace(type="text_delta", text="On it")),
+            SimpleNamespace(type="content_block_start", index=1,
+                            content_block=SimpleNamespace(type="tool_use", id="toolu_1", name="lookup")),
+            SimpleNamespace(type="content_block_delta", index=1,
+                            delta=SimpleNamespace(type="input_json_delta", partial_json='{"key": ')),
+            SimpleNamespace(type="content_block_delta", index=1,
+                            delta=SimpleNamespace(type="input_json_delta", partial_json='"a"}')),
+            SimpleNamespace(type="message_delta", delta=SimpleNamespace(stop_reason="tool_use"),
+                            usage=SimpleNamespace(output_tokens=20)),
+        ]
+        deltas = [provider._accumulate_event(acc, event) for event in events]
+        response = acc.build()
+
+        assert "".join(deltas) == "On it"
+        assert response.tool_calls == [ToolCall(id="toolu_1", name="lookup", arguments={"key": "a"})]
+        assert response.finish_reason == "tool_use"
+        assert response.usage["prompt_tokens"] == 12
+        assert response.usage["completion_tokens"] == 20
+        assert response.usage["total_tokens"] == 32
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+class TestStreamChat:
+    """Tests for LiteAgent.stream_chat and astream_chat."""
+
+    def script(self):
+        return [
+            tool_response(ToolCall(id="call_1", name="add", arguments={"a": 1, "b": 2})),
+            text_response("The answer is 3"),
+        ]
+
+    def test_stream_chat_yields_deltas_and_runs_tools(self, make_agent):
+        agent = make_agent([add], ScriptedProvider(self.script()))
+
+        deltas = list(agent.stream_chat("what is 1 + 2?"))
+
+        assert deltas == ["The ", "answer ", "is ", "3 "]
+        tool_results = [m for m in agent.memory.messages if m["role"] == "tool"]
+        assert tool_results[0]["content"] == "3"
+        assert agent.memory.messages[-1] == {"role": "assistant", "content": "The answer is 3"}
+
+    async def test_astream_chat(self, make_agent):
+        agent = make_agent([add], ScriptedProvider(self.script()))
+
+        deltas = [delta async for delta in agent.astream_chat("what is 1 + 2?")]
+
+        assert "".join(deltas).strip() == "The answer is 3"
+        assert agent.memory.messages[-1]["content"] == "The answer is 3"
+
+    async def test_streams_are_rate_limited(self, make_agent):
+        agent = make_agent([add], ScriptedProvider(self.script() + self.script()))
+        agent.rate_limiter = RecordingRateLimiter()
+
+        list(agent.stream_chat("what is 1 + 2?"))
+        [delta async for delta in agent.astream_chat("what is 1 + 2?")]
+
+        assert len(agent.rate_limiter.waits) == len(agent.rate_limiter.awaits) == 2
+        assert len(agent.rate_limiter.consumed) == 4
+
+    def test_stream_chat_reports_errors(self, make_agent):
+        agent = make_agent([add], ScriptedProvider([]))
+
+        deltas = list(agent.stream_chat("hi"))
+
+        assert len(deltas) == 1
+        assert deltas[0].startswith("I encountered an error")
@@ -0,0 +1,175 @@
+"""
+Unit tests for background conversation summarization.
+
+The summarizing model is a scripted provider, so no API keys are required.
+"""
+
+import itertools
+
+import pytest
+
+from liteagent.memory import SUMMARY_HEADING, ConversationMemory
+from liteagent.observer import AgentObserver, ConversationSummarizedEvent
+from liteagent.summarization import ConversationSummarizer, format_transcript
+
+from .conftest import ScriptedProvider
+
+
+class EventRecorder(AgentObserver):
+    """Observer that keeps summary events."""
+
+    subscribed_events = (ConversationSummarizedEvent,)
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event) -> None:
+        self.events.append(event)
+
+
+def make_summarizer(threshold_tokens: int = 50, keep_recent_turns: int = 1):
+    summarizer = ConversationSummarizer("mock-model", threshold_tokens, keep_recent_turns, provider="mock")
+    # Numbered summaries, so tests can tell them apart
+    count = itertools.count(1)
+    summarizer.model_interface.provider = ScriptedProvider(reply=lambda messages: f"summary {next(count)}")
+    return summarizer
+
+
+def fill(memory: ConversationMemory, turns: int, first: int = 0) -> None:
+    for i in range(first, first + turns):
+        memory.add_user_message(f"question {i} " + "x" * 40)
+        memory.add_assistant_message(f"answer {i}")
+
+
+class TestMemorySummary:
+    """Tests for summaries applied to ConversationMemory."""
+
+    def test_summary_replaces_covered_messages(self):
+        memory = ConversationMemory("System prompt")
+        fill(memory, 3)
+        memory.pin_message(1)
+
+        assert memory.apply_summary("Earlier turns", covered=5)
+
+        history = memory.get_messages()
+        assert history[0] == {"role": "system", "content": f"System prompt\n\n{SUMMARY_HEADING}\nEarlier turns"}
+        assert [m["content"] for m in history[1:]] == [memory.messages[1]["content"], "question 2 " + "x" * 40,
+                                                       "answer 2"]
+        assert len(memory.messages) == 7
+        counts = memory.messages.token_counts
+        assert history.token_count == sum(counts[i] for i in (0, 1, 5, 6)) + memory.summary.token_count
+        assert memory.active_token_count < memory.token_count
+
+    def test_stale_summary_is_ignored(self):
+        memory = ConversationMemory("System prompt")
+        fill(memory, 2)
+        last = memory.messages[2]
+
+        assert not memory.apply_summary("Too late", covered=3, last_message={"role": "assistant"})
+        assert memory.apply_summary("Earlier turns", covered=3, last_message=last)
+
+        memory.reset()
+        fill(memory, 2)
+        assert memory.get_summary() is None
+        assert len(memory.get_messages()) == 5
+
+    def test_summary_with_token_budget(self):
+        memory = ConversationMemory("System prompt")
+        fill(memory, 6)
+        memory.apply_summary("Earlier turns", covered=5)
+        memory.token_budget = memory.active_token_count - memory.messages.token_counts[5]
+
+        history = memory.get_messages()
+
+        assert SUMMARY_HEADING in history[0]["content"]
+        assert [m["content"] for m in history[1::2]] == ["question 3 " + "x" * 40, "question 4 " + "x" * 40,
+                                                         "question 5 " + "x" * 40]
+
+
+class TestConversationSummarizer:
+    """Tests for ConversationSummarizer."""
+
+    def test_summarize_keeps_recent_turns(self):
+        summarizer = make_summarizer(keep_recent_turns=2)
+        memory = ConversationMemory("System prompt")
+        fill(memory, 4)
+
+        summary = summarizer.summarize(memory)
+
+        assert summary.content == "summary 1"
+        assert summary.covered == 5
+        prompt = summarizer.model_interface.provider.requests[-1].messages[-1]["content"]
+        assert "question 0" in prompt and "question 1" in prompt and "question 2" not in prompt
+
+    def test_running_summary_includes_previous(self):
+        summarizer = make_summarizer()
+        memory = ConversationMemory("System prompt")
+        fill(memory, 2)
+        summarizer.summarize(memory)
+        fill(memory, 2, first=2)
+
+        summary = summarizer.summarize(memory)
+
+        prompt = summarizer.model_interface.provider.requests[-1].messages[-1]["content"]
+        assert "summary 1" in prompt
+        assert "question 0" not in prompt and "question 2" in prompt
+        assert summary.covered == 7
+
+    def test_nothing_to_summarize(self):
+        summarizer = make_summarizer(keep_recent_turns=2)
+        memory = ConversationMemory("System prompt")
+        fill(memory, 2)
+
+        assert summarizer.summarize(memory) is None
+        assert summarizer.model_interface.provider.requests == []
+
+    def test_transcript_includes_tool_calls(self):
+        memory = ConversationMemory("System prompt")
+        memory.add_tool_call("lookup", {"key": "a"}, "call_1")
+        memory.add_tool_result("lookup", "found", "call_1")
+
+        transcript = format_transcript(memory.messages[1:])
+
+        assert 'called lookup({"key": "a"})' in transcript
+        assert "tool: found" in transcript
+
+
+class TestAgentSummarization:
+    """Tests for agents summarizing in the background."""
+
+    def test_summary_does_not_block_turns(self, make_agent):
+        summarizer = make_summarizer(threshold_tokens=30)
+        provider = summarizer.model_interface.provider
+        provider.gate.clear()
+        recorder = EventRecorder()
+        agent = make_agent(summarizer=summarizer, observers=[recorder])
+
+        for i in range(3):
+            agent.chat(f"question {i} " + "x" * 80)
+
+        # Turns complete while the summary is still being written
+        assert len(provider.requests) == 1
+        assert agent.memory.summary is None
+        provider.gate.set()
+        summarizer.wait()
+
+        assert len(summarizer.model_interface.provider.requests) == 1
+        assert len(agent.memory.messages) == 7
+        history = agent.memory.get_messages()
+        assert SUMMARY_HEADING in history[0]["content"]
+        assert len(history) < len(agent.memory.messages)
+        assert [event.summary for event in recorder.events] == ["summary 1"]
+        summarizer.close()
+
+    def test_short_conversations_are_not_summarized(self, make_agent):
+        summarizer = make_summarizer(threshold_tokens=10000)
+        agent = make_agent(summarizer=summarizer)
+
+        agent.chat("hello")
+
+        assert summarizer.maybe_summarize(agent.memory) is None
+        assert agent.memory.summary is None
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ConversationSummarizer("mock-model", 0, provider="mock")
@@ -0,0 +1,193 @@
+"""
+Unit tests for token counting and the per-message counts kept by ConversationMemory.
+
+Only the offline heuristic and test tokenizers are used, so no tokenizer
+libraries or API keys are required.
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from liteagent import LiteAgent
+from liteagent.memory import ConversationMemory
+from liteagent.messages import MessageList
+from liteagent.tokenization import (DEFAULT_TOKENIZER, HeuristicTokenizer, Tokenizer, get_tokenizer,
+                                    register_tokenizer)
+
+
+class WordTokenizer(Tokenizer):
+    """Counts one token per word and records every message it counts."""
+
+    name = "words"
+
+    def __init__(self):
+        self.counted = []
+
+    def count_text(self, text: str) -> int:
+        return len(text.split())
+
+    def count_message(self, message):
+        self.counted.append(message)
+        return super().count_message(message)
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@pytest.fixture
+def memory():
+    memory = ConversationMemory(system_prompt="You are helpful.", tokenizer=WordTokenizer())
+    memory.add_user_message("What is the weather in Paris?")
+    memory.add_tool_call("get_weather", {"city": "Paris"}, "call_1")
+    memory.add_tool_result("get_weather", "Sunny and warm", "call_1")
+    return memory
+
+
+def recount(messages) -> int:
+    return sum(messages.tokenizer.count_message(message) for message in messages)
+
+
+class TestTokenizers:
+    """Tests for tokenizers and the tokenizer registry."""
+
+    def test_message_counts_include_images_and_tool_arguments(self):
+        tokenizer = HeuristicTokenizer()
+        multimodal = {"role": "user", "content": [
+            {"type": "text", "text": "x" * 40},
+            {"type": "image_url", "image_url": {"url": "https://example.com/cat.png"}},
+        ]}
+        tool_call = {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "1", "type": "function", "function": {"name": "lookup", "arguments": "y" * 80}}]}
+
+        assert tokenizer.count_message(multimodal) == 4 + 10 + tokenizer.image_tokens
+        assert tokenizer.count_message(tool_call) == 4 + 1 + 20
+
+    def test_count_text_is_required(self):
+        class Incomplete(Tokenizer):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_unknown_provider_falls_back_to_heuristic(self):
+        assert get_tokenizer("some-provider", "some-model") is DEFAULT_TOKENIZER
+        assert get_tokenizer() is DEFAULT_TOKENIZER
+
+    def test_missing_dependency_falls_back_to_heuristic(self):
+        def factory(model):
+            raise ImportError("no tokenizer library")
+
+        register_tokenizer("needs-library", factory)
+
+        assert get_tokenizer("needs-library", "m") is DEFAULT_TOKENIZER
+
+    def test_failing_tokenizer_falls_back_to_heuristic(self):
+        def factory(model):
+            raise OSError("could not download encoding")
+
+        register_tokenizer("needs-network", factory)
+
+        assert get_tokenizer("needs-network", "m") is DEFAULT_TOKENIZER
+
+    def test_registered_tokenizer_is_cached_per_model(self):
+        created = []
+        register_tokenizer("Words", lambda model: created.append(model) or WordTokenizer())
+
+        first = get_tokenizer("words", "model-a")
+
+        assert isinstance(first, WordTokenizer)
+        assert get_tokenizer("WORDS", "model-a") is first
+        assert get_tokenizer("words", "model-b") is not first
+        assert created == ["model-a", "model-b"]
+
+
+class TestMessageTokenCounts:
+    """Tests for the running token total kept by ConversationMemory."""
+
+    def test_each_message_counted_once(self, memory):
+        tokenizer = memory.tokenizer
+        counted = len(tokenizer.counted)
+
+        memory.get_messages()
+        memory.add_assistant_message("It is sunny")
+
+        assert len(tokenizer.counted) == counted + 1
+        assert memory.token_count == recount(memory.messages)
+        assert memory.messages.token_counts[-1] == 4 + 3
+
+    def test_total_follows_list_mutations(self, memory):
+        messages = memory.messages
+
+        messages.insert(1, {"role": "user", "content": "one two three"})
+        messages[0] = {"role": "system", "content": "short"}
+        del messages[2]
+        messages.pop()
+        messages.extend([{"role": "user", "content": "a b"}, {"role": "assistant", "content": "c"}])
+        messages.remove(messages[-1])
+        messages[1:2] = [{"role": "user", "content": "replaced slice"}]
+
+        assert memory.token_count == recount(messages)
+        assert messages.token_counts == [messages.tokenizer.count_message(m) for m in messages]
+
+    def test_reset_and_assignment_recount(self, memory):
+        memory.reset()
+        assert memory.token_count == recount(memory.messages)
+
+        memory.messages = [{"role": "system", "content": "a b c"}]
+        assert isinstance(memory.messages, MessageList)
+        assert memory.token_count == 7
+
+    def test_set_tokenizer_recounts(self, memory):
+        memory.set_tokenizer(HeuristicTokenizer(chars_per_token=1))
+
+        assert memory.token_count == recount(memory.messages)
+        assert memory.messages.tokenizer is memory.tokenizer
+
+    def test_count_tokens_reuses_history_counts(self, memory):
+        history = memory.get_messages()
+        counted = len(memory.tokenizer.counted)
+
+        assert memory.count_tokens(history) == memory.token_count
+        assert memory.count_tokens(memory.get_messages(count=1)) == memory.messages.token_counts[-1]
+        assert len(memory.tokenizer.counted) == counted
+
+        history.append({"role": "user", "content": "extra words here"})
+        assert memory.count_tokens(history) == memory.token_count + 4 + 3
+
+    def test_copies_keep_counts(self, memory):
+        counted = len(memory.tokenizer.counted)
+
+        duplicate = copy.deepcopy(memory.messages)
+        duplicate.append({"role": "user", "content": "only in the copy"})
+
+        assert len(memory.tokenizer.counted) == counted + 1
+        assert memory.token_count == recount(memory.messages)
+        assert duplicate.token_count == recount(duplicate)
+
+    def test_pickle_round_trip(self):
+        memory = ConversationMemory(system_prompt="You are helpful.")
+        memory.add_user_message("Hello there")
+
+        restored = pickle.loads(pickle.dumps(memory.messages))
+
+        assert restored == memory.messages
+        assert restored.token_count == memory.token_count
+
+
+class TestAgentTokenEstimates:
+    """Tests for the agent's rate limiter estimates."""
+
+    def test_estimate_includes_messages_and_tools(self):
+        agent = LiteAgent(model="mock-model", name="token-agent", provider="mock", tools=[add])
+        agent.memory.add_user_message("x" * 400)
+        messages = agent.memory.get_messages()
+
+        estimate = agent._estimate_request_tokens(messages)
+
+        tool_tokens = agent.memory.tokenizer.count_tools(agent._prepare_tools())
+        assert tool_tokens > 0
+        assert estimate == agent.memory.token_count + tool_tokens
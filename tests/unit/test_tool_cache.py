@@ -0,0 +1,249 @@
+"""
+Unit tests for memoizing tool result caches.
+
+Tools run through mock-provider agents, so no API keys are required.
+"""
+
+import threading
+import time
+
+import pytest
+
+from liteagent import AgentTemplate, liteagent_tool
+from liteagent.tool_cache import CachePolicy, ToolCache, clear_process_caches, make_cache_key
+from liteagent.tool_calling import ToolCallTracker
+from liteagent.tools import FunctionTool, InstanceMethodTool
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    ToolCallTracker.get_instance().clear()
+    clear_process_caches()
+    yield
+    ToolCallTracker.get_instance().clear()
+    clear_process_caches()
+
+
+def counting_tool(cache, delay: float = 0.0, fail: bool = False):
+    """Build a cached lookup tool that counts its executions."""
+    calls = []
+
+    def lookup(key: str, page: int) -> str:
+        """Look up a key."""
+        calls.append((key, page))
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("lookup failed")
+        return f"{key}:{page}"
+
+    return FunctionTool(lookup, cache=cache), calls
+
+
+class TestToolCache:
+    """Tests for the cache itself."""
+
+    def test_key_ignores_argument_order(self):
+        assert make_cache_key({"a": 1, "b": [1, 2]}) == make_cache_key({"b": [1, 2], "a": 1})
+        assert make_cache_key({"a": 1}) != make_cache_key({"a": "1"})
+
+    def test_lru_eviction(self):
+        cache = ToolCache(maxsize=2)
+        cache.get_or_call({"k": 1}, lambda: 1)
+        cache.get_or_call({"k": 2}, lambda: 2)
+        cache.get_or_call({"k": 1}, lambda: 1)
+        cache.get_or_call({"k": 3}, lambda: 3)
+
+        assert cache.get_or_call({"k": 1}, lambda: "recomputed") == (1, True)
+        assert cache.get_or_call({"k": 2}, lambda: "recomputed") == ("recomputed", False)
+
+    def test_ttl_expiry(self):
+        cache = ToolCache(ttl=0.05)
+        cache.get_or_call({"k": 1}, lambda: "old")
+        assert cache.get_or_call({"k": 1}, lambda: "new") == ("old", True)
+
+        time.sleep(0.06)
+
+        assert cache.get_or_call({"k": 1}, lambda: "new") == ("new", False)
+
+    def test_concurrent_identical_calls_collapse(self):
+        cache = ToolCache()
+        executions = []
+
+        def compute():
+            executions.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_call({"k": 1}, compute)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(executions) == 1
+        assert sorted(results) == [("value", False)] + [("value", True)] * 4
+        assert cache.stats() == {"hits": 0, "misses": 1, "collapsed": 4, "size": 1}
+
+    def test_errors_are_not_cached(self):
+        cache = ToolCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_call({"k": 1}, fail)
+
+        assert cache.get_or_call({"k": 1}, lambda: "ok") == ("ok", False)
+
+    def test_lookup_and_store(self):
+        cache = ToolCache(maxsize=1)
+
+        assert cache.lookup({"k": 1}) == (False, None)
+        cache.store({"k": 1}, "stored")
+        assert cache.lookup({"k": 1}) == (True, "stored")
+        assert cache.get_or_call({"k": 1}, lambda: "recomputed") == ("stored", True)
+        cache.store({"k": 2}, "other")
+        assert cache.lookup({"k": 1}) == (False, None)
+        assert cache.stats() == {"hits": 2, "misses": 2, "collapsed": 0, "size": 1}
+
+    def test_policy_options(self):
+        assert CachePolicy.from_option(None) is None
+        assert CachePolicy.from_option(True) == CachePolicy()
+        assert CachePolicy.from_option("process").scope == "process"
+        assert CachePolicy.from_option({"ttl": 5, "maxsize": 10}) == CachePolicy(maxsize=10, ttl=5)
+        with pytest.raises(ValueError):
+            CachePolicy(scope="galaxy")
+
+
+class TestAgentToolCaching:
+    """Tests for cached tools executed by agents."""
+
+    def test_repeated_call_served_from_cache(self, make_agent):
+        tool, calls = counting_tool(cache=True)
+        agent = make_agent([tool])
+
+        first = agent._execute_tool("lookup", {"key": "a", "page": 2})
+        second = agent._execute_tool("lookup", {"page": 2, "key": "a"})
+        agent._execute_tool("lookup", {"key": "b", "page": 1})
+
+        tracker = ToolCallTracker.get_instance()
+        assert first == second == "a:2"
+        assert calls == [("a", 2), ("b", 1)]
+        assert tracker.get_cache_stats("lookup") == {"hits": 1, "misses": 2}
+        assert [record.cached for record in tracker.calls] == [False, True, False]
+        assert tracker.get_call_count("lookup") == 3
+
+    def test_uncached_tools_untouched(self, make_agent):
+        tool, calls = counting_tool(cache=None)
+        agent = make_agent([tool])
+
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 2
+        assert ToolCallTracker.get_instance().get_cache_stats() == {"hits": 0, "misses": 0}
+
+    def test_failed_calls_are_retried(self, make_agent):
+        tool, calls = counting_tool(cache=True, fail=True)
+        agent = make_agent([tool])
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                agent._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 2
+        assert ToolCallTracker.get_instance().calls[-1].error == "lookup failed"
+
+    def test_conversation_scope(self, make_agent):
+        tool, calls = counting_tool(cache="conversation")
+        agent = make_agent([tool])
+
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+        agent._new_conversation()._execute_tool("lookup", {"key": "a", "page": 1})
+        agent.reset_memory()
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 3
+
+    def test_agent_scope(self, make_agent):
+        tool, calls = counting_tool(cache="agent")
+        agent = make_agent([tool])
+
+        agent._execute_tool("lookup", {"key": "a", "page": 1})
+        agent._new_conversation()._execute_tool("lookup", {"key": "a", "page": 1})
+        make_agent([tool])._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 2
+
+    def test_template_agents_have_own_agent_cache(self):
+        tool, calls = counting_tool(cache="agent")
+        template = AgentTemplate(model="mock-model", name="templated", provider="mock", tools=[tool])
+
+        template.create()._execute_tool("lookup", {"key": "a", "page": 1})
+        template.create()._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 2
+
+    def test_process_scope_shared_across_agents(self, make_agent):
+        tool, calls = counting_tool(cache="process")
+
+        make_agent([tool])._execute_tool("lookup", {"key": "a", "page": 1})
+        make_agent([tool])._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(calls) == 1
+
+    def test_process_scope_keyed_by_function_not_name(self, make_agent):
+        first, first_calls = counting_tool(cache="process")
+        second, second_calls = counting_tool(cache="process")
+
+        make_agent([first])._execute_tool("lookup", {"key": "a", "page": 1})
+        make_agent([second])._execute_tool("lookup", {"key": "a", "page": 1})
+
+        assert len(first_calls) == len(second_calls) == 1
+
+    def test_process_scope_keyed_by_instance(self, make_agent):
+        class Catalog:
+            def __init__(self, prefix):
+                self.prefix = prefix
+
+            def lookup(self, key: str) -> str:
+                """Look up a key."""
+                return self.prefix + key
+
+        results = [make_agent([InstanceMethodTool(catalog.lookup, catalog, cache="process")])
+                   ._execute_tool("lookup", {"key": "a"}) for catalog in (Catalog("x"), Catalog("y"))]
+
+        assert results == ["xa", "ya"]
+
+    def test_parallel_identical_calls_execute_once(self, make_agent):
+        tool, calls = counting_tool(cache=True, delay=0.1)
+        agent = make_agent([tool])
+
+        threads = [threading.Thread(target=agent._execute_tool, args=("lookup", {"key": "a", "page": 1}))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert ToolCallTracker.get_instance().get_cache_stats("lookup") == {"hits": 3, "misses": 1}
+
+    def test_decorator_option(self, make_agent):
+        calls = []
+
+        @liteagent_tool(cache={"scope": "process", "ttl": 60})
+        def cached_square(x: int) -> int:
+            """Square a number."""
+            calls.append(x)
+            return x * x
+
+        agent = make_agent([cached_square])
+        agent._execute_tool("cached_square", {"x": 3})
+        agent._execute_tool("cached_square", {"x": 3})
+
+        assert agent.tool_instances["cached_square"].cache_policy == CachePolicy(scope="process", ttl=60)
+        assert calls == [3]
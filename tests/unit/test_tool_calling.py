@@ -0,0 +1,110 @@
+"""
+Unit tests for the ToolCallTracker.
+
+These tests use their own tracker instances, so the process-wide singleton is
+left alone.
+"""
+
+import json
+import threading
+
+import pytest
+
+from liteagent.tool_calling import LatencyHistogram, ToolCallTracker
+
+
+class TestLatencyHistogram:
+    """Tests for the fixed-memory latency histogram."""
+
+    def test_percentiles_within_bucket_error(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.add(i / 1000)
+
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.05)
+        assert histogram.percentile(95) == pytest.approx(0.95, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.05)
+
+    def test_memory_is_fixed(self):
+        histogram = LatencyHistogram()
+        buckets = len(histogram.counts)
+        for seconds in (0, 1e-9, 0.3, 5e6):
+            histogram.add(seconds)
+
+        assert len(histogram.counts) == buckets
+        assert histogram.total == 4
+        assert LatencyHistogram().percentile(50) is None
+
+
+class TestToolCallTracker:
+    """Tests for bounded retention, aggregates and exports."""
+
+    def test_retention_keeps_newest_records(self):
+        tracker = ToolCallTracker(max_records_per_tool=3)
+        for i in range(10):
+            tracker.record_call("lookup", {"i": i}, result=i, execution_time=0.01)
+        tracker.record_call("other", {}, result="x")
+
+        assert [record.arguments["i"] for record in tracker.get_calls_for_tool("lookup")] == [7, 8, 9]
+        assert [record.name for record in tracker.calls] == ["lookup"] * 3 + ["other"]
+        assert tracker.get_call_count("lookup") == 10
+        assert tracker.total_calls == 11
+        assert tracker.get_tool_result("lookup") == 9
+
+    def test_results_can_be_dropped(self):
+        tracker = ToolCallTracker(keep_results=False)
+        tracker.record_call("lookup", {"key": "a"}, result="x" * 10000)
+
+        assert tracker.get_tool_result("lookup") is None
+        assert tracker.get_tool_args("lookup") == {"key": "a"}
+
+    def test_aggregates_and_snapshot(self):
+        tracker = ToolCallTracker()
+        tracker.record_call("lookup", {}, result=1, execution_time=0.1)
+        tracker.record_call("lookup", {}, error="boom", error_type="RuntimeError", execution_time=0.3)
+        tracker.record_call("lookup", {}, result=1, execution_time=0.0, cached=True)
+        tracker.record_cache_lookup("lookup", hit=True)
+
+        stats = tracker.get_tool_stats("lookup")
+        snapshot = tracker.snapshot()
+
+        assert (stats["count"], stats["errors"], stats["cached"]) == (3, 1, 1)
+        assert stats["max_time"] == 0.3
+        assert stats["p99"] == pytest.approx(0.3, rel=0.05)
+        assert snapshot["tools"]["lookup"] == stats
+        assert snapshot["cache"] == {"lookup": {"hits": 1, "misses": 0}}
+        json.dumps(snapshot)
+
+    def test_export_records(self):
+        tracker = ToolCallTracker()
+        tracker.record_call("lookup", {"key": "a"}, result="value", execution_time=0.1)
+
+        assert "result" not in tracker.export_records()[0]
+        assert tracker.export_records(include_results=True)[0]["result"] == "value"
+
+    def test_configure_shrinks_retention(self):
+        tracker = ToolCallTracker()
+        for i in range(5):
+            tracker.record_call("lookup", {"i": i})
+
+        tracker.configure(max_records_per_tool=2)
+
+        assert [record.arguments["i"] for record in tracker.get_calls_for_tool("lookup")] == [3, 4]
+
+    def test_concurrent_recording(self):
+        tracker = ToolCallTracker(max_records_per_tool=50)
+
+        def record():
+            for i in range(500):
+                tracker.record_call(f"tool_{i % 4}", {"i": i}, execution_time=0.001)
+                tracker.record_cache_lookup("tool_0", hit=i % 2 == 0)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tracker.total_calls == 4000
+        assert tracker.get_cache_stats("tool_0") == {"hits": 2000, "misses": 2000}
+        assert len(tracker.calls) == 200
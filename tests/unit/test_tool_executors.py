@@ -0,0 +1,257 @@
+"""
+Unit tests for tool execution backends.
+
+The process-pool tests use module-level functions and classes so they can be
+pickled into the pool's workers.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+
+import pytest
+
+from liteagent import LiteAgent, liteagent_tool
+from liteagent.tool_calling import ToolCallTracker
+from liteagent.tool_executors import ToolTimeoutError, configure_tool_executors, shutdown_tool_executors
+from liteagent.tools import FunctionTool, InstanceMethodTool
+
+
+@pytest.fixture(autouse=True, scope="module")
+def single_worker_pool():
+    configure_tool_executors(process_workers=1)
+    yield
+    configure_tool_executors()
+
+
+@pytest.fixture(autouse=True)
+def clean_tracker():
+    ToolCallTracker.get_instance().clear()
+    yield
+    ToolCallTracker.get_instance().clear()
+
+
+@liteagent_tool(executor="process")
+def process_id(offset: int) -> int:
+    """Return the id of the process the tool ran in, plus an offset."""
+    return os.getpid() + offset
+
+
+def thread_name(label: str) -> str:
+    """Return the name of the thread the tool ran in."""
+    return f"{label}:{threading.current_thread().name}"
+
+
+class Counter:
+    """Counter whose instance lives in the worker process."""
+
+    def __init__(self, start: int):
+        self.value = start
+        self.pid = os.getpid()
+
+    def bump(self, by: int) -> list:
+        """Increase the counter."""
+        self.value += by
+        return [self.pid, self.value]
+
+
+class TestToolExecutors:
+    """Tests for inline, thread and process tool executors."""
+
+    def test_inline_by_default(self):
+        tool = FunctionTool(thread_name)
+
+        assert tool.executor == "inline"
+        assert tool.execute(label="a") == f"a:{threading.current_thread().name}"
+
+    def test_thread_executor(self):
+        tool = FunctionTool(thread_name, executor="thread")
+
+        assert tool.execute(label="a").startswith("a:liteagent-tool")
+
+    def test_process_executor_from_decorator(self):
+        tool = FunctionTool(process_id)
+
+        assert tool.executor == "process"
+        assert tool.execute(offset=0) != os.getpid()
+        with pytest.raises(Exception):
+            tool.execute(offset="not a number")
+
+    def test_instance_method_uses_factory_in_worker(self):
+        counter = Counter(0)
+        tool = InstanceMethodTool(counter.bump, counter, executor="process",
+                                  instance_factory=functools.partial(Counter, 10))
+
+        first_pid, first = tool.execute(by=1)
+        second_pid, second = tool.execute(by=1)
+
+        assert first_pid == second_pid != os.getpid()
+        assert (first, second) == (11, 12)
+        assert counter.value == 0
+
+    def test_instance_method_requires_factory(self):
+        counter = Counter(0)
+
+        with pytest.raises(ValueError, match="instance_factory"):
+            InstanceMethodTool(counter.bump, counter, executor="process")
+
+    def test_invalid_options(self):
+        async def fetch(key: str) -> str:
+            """Fetch a key."""
+            return key
+
+        with pytest.raises(ValueError, match="Unknown tool executor"):
+            FunctionTool(thread_name, executor="gpu")
+        with pytest.raises(ValueError, match="event loop"):
+            FunctionTool(fetch, executor="process")
+
+    def test_execution_time_recorded(self):
+        agent = LiteAgent(model="mock-model", name="executor-agent", provider="mock", tools=[process_id])
+
+        result = agent._execute_tool("process_id", {"offset": 1})
+
+        record = ToolCallTracker.get_instance().get_calls_for_tool("process_id")[-1]
+        assert record.result == result
+        assert record.execution_time is not None and record.execution_time > 0
+
+    def test_shutdown_restarts_pool(self):
+        tool = FunctionTool(process_id)
+        tool.execute(offset=0)
+
+        shutdown_tool_executors()
+
+        assert tool.execute(offset=0) != os.getpid()
+
+
+class TestTimeoutsAndConcurrency:
+    """Tests for per-tool timeouts and concurrency limits."""
+
+    def test_blocking_tool_times_out(self):
+        def hang(seconds: float) -> str:
+            """Sleep for a while."""
+            time.sleep(seconds)
+            return "done"
+
+        tool = FunctionTool(hang, timeout=0.1)
+
+        start = time.monotonic()
+        with pytest.raises(ToolTimeoutError, match="hang timed out after 0.1s"):
+            tool.execute(seconds=1)
+        assert time.monotonic() - start < 0.5
+        assert tool.execute(seconds=0) == "done"
+
+    def test_async_tool_is_cancelled_on_timeout(self):
+        cancelled = threading.Event()
+
+        async def hang(seconds: float) -> str:
+            """Sleep for a while."""
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "done"
+
+        tool = FunctionTool(hang, timeout=0.1)
+
+        with pytest.raises(ToolTimeoutError):
+            tool.execute(seconds=5)
+        assert cancelled.wait(1)
+
+    def test_errors_raised_by_tool_are_not_timeouts(self):
+        def fail() -> str:
+            """Raise a TimeoutError of its own."""
+            raise TimeoutError("upstream timed out")
+
+        tool = FunctionTool(fail, timeout=1)
+
+        with pytest.raises(TimeoutError, match="upstream") as excinfo:
+            tool.execute()
+        assert not isinstance(excinfo.value, ToolTimeoutError)
+
+    def test_max_concurrency_shared_by_decorated_function(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        @liteagent_tool(max_concurrency=2)
+        def tracked(key: str) -> str:
+            """Track concurrency."""
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return key
+
+        tools = [FunctionTool(tracked), FunctionTool(tracked)]
+        threads = [threading.Thread(target=tools[i % 2].execute, kwargs={"key": str(i)}) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+    def test_waiting_for_a_slot_counts_toward_timeout(self):
+        release = threading.Event()
+
+        def hold() -> str:
+            """Hold the only slot until released."""
+            release.wait(2)
+            return "held"
+
+        tool = FunctionTool(hold, timeout=0.2, max_concurrency=1)
+        first = threading.Thread(target=lambda: pytest.raises(ToolTimeoutError, tool.execute))
+        first.start()
+        time.sleep(0.05)
+
+        with pytest.raises(ToolTimeoutError):
+            tool.execute()
+        release.set()
+        first.join()
+        # The slot comes back once the abandoned call finishes
+        assert tool.execute() == "held"
+
+    def test_async_calls_wait_for_a_slot(self):
+        active = 0
+        peak = 0
+        release = None
+
+        async def fetch(key: str) -> str:
+            """Track concurrency."""
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            if key == "hold":
+                await release.wait()
+            else:
+                await asyncio.sleep(0.02)
+            active -= 1
+            return key
+
+        tool = FunctionTool(fetch, max_concurrency=1)
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            assert await asyncio.gather(*(tool.aexecute(key=str(i)) for i in range(3))) == ["0", "1", "2"]
+
+            holder = asyncio.ensure_future(tool.aexecute(key="hold"))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(tool.aexecute(key="abandoned"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            release.set()
+            assert await holder == "hold"
+            # The cancelled wait hands back the slot it was given
+            assert await asyncio.get_running_loop().run_in_executor(None, tool._slots.acquire, True, 1)
+            tool._slots.release()
+            return await tool.aexecute(key="after")
+
+        assert asyncio.run(run()) == "after"
+        assert peak == 1
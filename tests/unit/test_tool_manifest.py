@@ -0,0 +1,139 @@
+"""
+Unit tests for the agent's compiled tool manifest.
+
+These tests check that tool payloads are converted once per provider wire
+format and rebuilt only when the agent's tools change, and that a tool
+retriever narrows the tools sent with each turn. No API keys are required.
+"""
+
+from liteagent import ToolRetriever
+from liteagent.providers import ToolCall, ToolManifest
+from liteagent.providers.anthropic_provider import AnthropicProvider
+from liteagent.providers.openai_provider import OpenAIProvider
+
+from .conftest import ScriptedProvider, tool_response
+
+
+def get_weather(city: str) -> str:
+    """Get the weather for a city."""
+    return f"Sunny in {city}"
+
+
+def get_time(timezone: str) -> str:
+    """Get the current time in a timezone."""
+    return "12:00"
+
+
+class TestToolManifest:
+    """Tests for ToolManifest caching and invalidation."""
+
+    def test_manifest_reused_between_requests(self, make_agent):
+        agent = make_agent([get_weather])
+
+        assert agent._prepare_tools() is agent._prepare_tools()
+        assert agent.model_interface._convert_functions_to_tools(agent._prepare_tools()) is agent._prepare_tools()
+
+    def test_manifest_rebuilt_on_add_and_remove(self, make_agent):
+        agent = make_agent([get_weather])
+        first = agent._prepare_tools()
+
+        agent.add_tool(get_time)
+        second = agent._prepare_tools()
+        agent.remove_tool("get_weather")
+        third = agent._prepare_tools()
+
+        assert second.version > first.version
+        assert third.version > second.version
+        assert [t["function"]["name"] for t in second] == ["get_weather", "get_time"]
+        assert [t["function"]["name"] for t in third] == ["get_time"]
+
+    def test_compiled_once_per_wire_format(self):
+        manifest = ToolManifest([{"type": "function", "function": {"name": "a", "parameters": {}}}])
+        calls = []
+
+        def converter(tools):
+            calls.append(tools)
+            return [{"converted": t["function"]["name"]} for t in tools]
+
+        first = manifest.compiled("custom", converter)
+        second = manifest.compiled("custom", converter)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_providers_send_cached_payload(self, make_agent):
+        agent = make_agent([get_weather, get_time])
+        manifest = agent._prepare_tools()
+        anthropic = AnthropicProvider("claude-3-5-haiku-20241022", api_key="test-key")
+        openai = OpenAIProvider("gpt-4o-mini", api_key="test-key")
+
+        anthropic_payload = anthropic._compile_tools(manifest)
+
+        assert anthropic_payload is anthropic._compile_tools(manifest)
+        assert anthropic_payload[0] == {
+            "name": "get_weather",
+            "description": manifest[0]["function"]["description"],
+            "input_schema": manifest[0]["function"]["parameters"],
+        }
+        assert openai._compile_tools(manifest) is openai._compile_tools(manifest)
+        assert openai._compile_tools(manifest) == list(manifest)
+
+    def test_plain_tool_lists_still_converted(self):
+        anthropic = AnthropicProvider("claude-3-5-haiku-20241022", api_key="test-key")
+        tools = [{"type": "function", "function": {"name": "a", "description": "A", "parameters": {}}}]
+
+        assert anthropic._compile_tools(tools) == [{"name": "a", "description": "A", "input_schema": {}}]
+
+
+def convert_currency(amount: float, currency: str) -> str:
+    """Convert an amount of money into another currency."""
+    return f"{amount} {currency}"
+
+
+def send_email(recipient: str, body: str) -> str:
+    """Send an email message to a recipient."""
+    return "sent"
+
+
+def search_docs(query: str) -> str:
+    """Search the product documentation."""
+    return "docs"
+
+
+def sent_tool_names(tools):
+    return [t["function"]["name"] for t in tools] if tools else []
+
+
+class TestToolRetrieval:
+    """Tests for per-turn tool selection with a ToolRetriever."""
+
+    ALL_TOOLS = [get_weather, get_time, convert_currency, send_email, search_docs]
+
+    def test_index_ranks_by_relevance(self, make_agent):
+        index = ToolRetriever().build_index(make_agent(self.ALL_TOOLS)._prepare_tools())
+
+        assert index.search("What's the weather in Paris?", 2) == ["get_weather"]
+        assert index.search("convert 20 dollars to another currency", 1) == ["convert_currency"]
+        assert set(index.search("email Bob the timezone", 2)) == {"send_email", "get_time"}
+        assert index.search("hello there", 3) == []
+
+    def test_turn_sends_pinned_and_top_k(self, make_agent):
+        provider = ScriptedProvider(["Bring one", "Hi"])
+        agent = make_agent(self.ALL_TOOLS, provider, tool_retriever=ToolRetriever(top_k=1, pinned=["search_docs"]))
+
+        agent.chat("Will I need an umbrella? Check the weather.")
+        agent.chat("hello")
+
+        sent = [sent_tool_names(request.tools) for request in provider.requests]
+        assert sent == [["get_weather", "search_docs"], ["search_docs"]]
+        assert agent._prepare_tools() is agent._prepare_tools()
+
+    def test_unselected_tool_call_is_retried_with_tool(self, make_agent):
+        call = ToolCall(id="call_1", name="send_email", arguments={"recipient": "bob", "body": "hi"})
+        provider = ScriptedProvider([tool_response(call), tool_response(call), "Done"])
+        agent = make_agent(self.ALL_TOOLS, provider, tool_retriever=ToolRetriever(top_k=1))
+
+        assert agent.chat("What's the weather?") == "Done"
+        sent = [sent_tool_names(request.tools) for request in provider.requests]
+        assert sent == [["get_weather"], ["get_weather", "send_email"], ["get_weather", "send_email"]]
+        assert [m.get("role") for m in agent.memory.get_messages()].count("tool") == 1
@@ -0,0 +1,103 @@
+"""
+Unit tests for keeping large tool results out of the conversation.
+
+These tests drive the agent's tool-call processing directly with the mock
+provider, so they run without API keys.
+"""
+
+import json
+
+import pytest
+
+from liteagent import BlobStore, ToolResultPolicy
+from liteagent.providers import ProviderResponse, ToolCall
+from liteagent.tool_results import READ_RESULT_SLICE, ToolResultSpiller
+
+
+def big_report(rows: int) -> str:
+    """Return a large JSON report."""
+    return json.dumps([{"row": i, "value": "x" * 20} for i in range(rows)])
+
+
+def make_response(tool_calls):
+    return ProviderResponse(content=None, tool_calls=tool_calls, usage=None,
+                            model="mock-model", provider="mock", raw_response=None)
+
+
+def tool_results(agent):
+    return [m["content"] for m in agent.memory.messages if m["role"] == "tool"]
+
+
+class TestToolResultSpiller:
+    """Tests for storing and paging through large results."""
+
+    def test_small_results_kept_whole(self):
+        spiller = ToolResultSpiller(ToolResultPolicy(max_chars=100, preview_chars=10, store=BlobStore()))
+
+        assert spiller.limit("short") == "short"
+
+    def test_pages_through_stored_result(self, tmp_path):
+        store = BlobStore(root=str(tmp_path))
+        spiller = ToolResultSpiller(ToolResultPolicy(max_chars=100, preview_chars=40, store=store))
+        text = "".join(str(i % 10) for i in range(250))
+
+        limited = spiller.limit(text)
+        handle = limited.split('handle="')[1].split('"')[0]
+        first = spiller.read_result_slice(handle, offset=40)
+        last = spiller.read_result_slice(handle, offset=200, length=500)
+
+        assert limited.startswith(text[:40]) and "of 250" in limited
+        assert first.startswith(text[40:80]) and "offset=80" in first
+        assert last.startswith(text[200:]) and "End of result" in last
+        assert len(store) == 1
+
+    def test_rejects_bad_handles(self):
+        spiller = ToolResultSpiller(ToolResultPolicy(store=BlobStore()))
+
+        with pytest.raises(ValueError, match="Invalid result handle"):
+            spiller.read_result_slice("../../etc/passwd")
+        with pytest.raises(ValueError, match="No stored result"):
+            spiller.read_result_slice("0" * 64)
+
+    def test_policy_options(self):
+        assert ToolResultPolicy.from_option(None) is None
+        assert ToolResultPolicy.from_option(500) == ToolResultPolicy(max_chars=500, preview_chars=500)
+        assert ToolResultPolicy.from_option({"max_chars": 10, "preview_chars": 5}).preview_chars == 5
+        with pytest.raises(ValueError):
+            ToolResultPolicy(max_chars=10, preview_chars=20)
+
+
+class TestAgentResultPolicy:
+    """Tests for the agent's tool result policy."""
+
+    def test_large_result_replaced_by_preview(self, make_agent):
+        agent = make_agent([big_report], tool_result_policy={"max_chars": 1000, "preview_chars": 200, "store": BlobStore()})
+        calls = [ToolCall(id="call_1", name="big_report", arguments={"rows": 500})]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        stored = tool_results(agent)[0]
+        assert len(stored) < 400
+        assert stored.startswith(big_report(500)[:200])
+        assert READ_RESULT_SLICE in agent.tools
+
+    def test_model_reads_rest_with_slice_tool(self, make_agent):
+        agent = make_agent([big_report], tool_result_policy={"max_chars": 1000, "preview_chars": 200, "store": BlobStore()})
+        calls = [ToolCall(id="call_1", name="big_report", arguments={"rows": 500})]
+        agent._process_tool_calls(calls, make_response(calls))
+        handle = tool_results(agent)[0].split('handle="')[1].split('"')[0]
+
+        read = [ToolCall(id="call_2", name=READ_RESULT_SLICE,
+                         arguments={"handle": handle, "offset": 200, "length": 1000})]
+        agent._process_tool_calls(read, make_response(read))
+
+        assert tool_results(agent)[1].startswith(big_report(500)[200:1200])
+
+    def test_results_kept_whole_without_policy(self, make_agent):
+        agent = make_agent([big_report])
+        calls = [ToolCall(id="call_1", name="big_report", arguments={"rows": 500})]
+
+        agent._process_tool_calls(calls, make_response(calls))
+
+        assert tool_results(agent) == [big_report(500)]
+        assert READ_RESULT_SLICE not in agent.tools
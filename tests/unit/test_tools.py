@@ -5,12 +5,13 @@ This module contains tests for the core tool functionality of LiteAgent,
 including the BaseTool and InstanceMethodTool classes.
 """
 
+import asyncio
 import pytest
 import inspect
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from liteagent.tools import BaseTool, InstanceMethodTool, FunctionTool, TOOLS
+from liteagent.tools import BaseTool, InstanceMethodTool, FunctionTool, TOOLS, liteagent_tool
 
 class TestBaseTool:
     """Test the BaseTool class."""
@@ -149,6 +150,139 @@ class TestBaseTool:
         # Test with invalid arguments
         with pytest.raises(Exception):
             tool.execute(a="not_a_number", b=3)
+    
+    def test_base_tool_compiled_validation(self):
+        """Test that simple signatures validate straight into kwargs without the schema model."""
+        def summarize(query: str, limit: int, tags: List[str], options: Dict[str, Any]) -> Dict:
+            """Summarize things."""
+            return {"query": query, "limit": limit, "tags": tags, "options": options}
+        
+        tool = BaseTool(summarize)
+        
+        result = tool.execute(query="q", limit="3", tags=["a"], options={"nested": [1, 2]}, extra="ignored")
+        assert result == {"query": "q", "limit": 3, "tags": ["a"], "options": {"nested": [1, 2]}}
+        assert tool._validator is not None
+        with pytest.raises(ValidationError):
+            tool.execute(query="q", limit="many", tags=[], options={})
+        with pytest.raises(ValidationError):
+            tool.execute(query="q", limit=1, tags=[])
+    
+    def test_base_tool_nested_models_use_model_path(self):
+        """Test that nested models keep the model_dump path, so functions still get dicts."""
+        class Point(BaseModel):
+            x: int
+            y: int
+        
+        def move(point: Point, steps: Optional[List[Point]]) -> Any:
+            """Move a point."""
+            return point, steps
+        
+        tool = BaseTool(move)
+        
+        point, steps = tool.execute(point={"x": "1", "y": 2}, steps=[{"x": 0, "y": 0}])
+        assert tool._validator is None
+        assert point == {"x": 1, "y": 2}
+        assert steps == [{"x": 0, "y": 0}]
+
+
+    def test_async_tool_execute(self):
+        """Test that async tools are awaited by execute and aexecute."""
+        async def fetch(key: str) -> str:
+            """Fetch a key."""
+            await asyncio.sleep(0)
+            return f"fetched {key}"
+        
+        class Client:
+            async def get(self, key: str) -> str:
+                """Get a key."""
+                return f"got {key}"
+        
+        client = Client()
+        tool = FunctionTool(fetch)
+        method_tool = InstanceMethodTool(client.get, client)
+        
+        assert tool.is_async and method_tool.is_async
+        assert tool.execute(key="a") == "fetched a"
+        assert method_tool.execute(key="b") == "got b"
+        assert asyncio.run(method_tool.aexecute(key="c")) == "got c"
+
+    def test_execute_batch(self):
+        """Test that batch results are scattered back to their argument sets."""
+        def double_all(calls):
+            return [call["x"] * 2 for call in calls]
+        
+        def double(x: int) -> int:
+            """Double a number."""
+            return x * 2
+        
+        tool = FunctionTool(double, batch=double_all)
+        
+        results = tool.execute_batch([{"x": "1"}, {"x": "many"}, {"x": 3}])
+        assert results[0] == 2 and results[2] == 6
+        assert isinstance(results[1], ValidationError)
+        with pytest.raises(ValueError, match="no batch implementation"):
+            FunctionTool(double).execute_batch([{"x": 1}])
+        with pytest.raises(ValueError, match="returned 1 results for 2 calls"):
+            FunctionTool(double, batch=lambda calls: [0]).execute_batch([{"x": 1}, {"x": 2}])
+
+
+class TestLazySchemas:
+    """Test lazy schema generation and the schema cache."""
+    
+    def test_schema_built_on_first_use(self):
+        """Test that creating a tool doesn't build its schema."""
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            return key
+        
+        tool = FunctionTool(lookup)
+        
+        assert tool._schema is None and tool._description is None
+        assert tool.schema.__name__ == "lookupSchema"
+        assert tool.description == "Look up a key."
+    
+    def test_equivalent_tools_share_schema(self):
+        """Test that tools for the same function, name and description share one schema."""
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            return key
+        
+        class Store:
+            def get(self, key: str) -> str:
+                """Get a key."""
+                return key
+        
+        first, second = Store(), Store()
+        
+        assert FunctionTool(lookup).schema is FunctionTool(lookup).schema
+        assert FunctionTool(lookup, name="find").schema is not FunctionTool(lookup).schema
+        assert InstanceMethodTool(first.get, first).schema is InstanceMethodTool(second.get, second).schema
+    
+    def test_function_definitions_are_copies(self):
+        """Test that callers can't change the shared JSON schema through a definition."""
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            return key
+        
+        definition = FunctionTool(lookup).to_dict()
+        definition["parameters"]["properties"].clear()
+        
+        assert "key" in FunctionTool(lookup).to_dict()["parameters"]["properties"]
+    
+    def test_registry_entries_are_lazy(self):
+        """Test that decorated functions are registered without building their schema."""
+        def registered_lookup(key: str) -> str:
+            """Look up a key."""
+            return key
+        registered_lookup.__qualname__ = "registered_lookup"  # As if defined at module level
+        
+        liteagent_tool(registered_lookup)
+        entry = TOOLS.pop("registered_lookup")
+        
+        assert entry["tool"]._schema is None
+        assert entry["function"] is registered_lookup
+        assert set(entry) == {"schema", "function", "tool"}
+        assert "key" in entry["schema"].model_fields
 
 
 class TestInstanceMethodTool:
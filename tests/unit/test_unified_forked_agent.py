@@ -16,6 +16,9 @@ from liteagent.unified_forked_agent import (
 from liteagent.agent_registry import AgentCapability
 from liteagent.blackboard import Blackboard
 from liteagent.multi_agent_coordinator import MultiAgentCoordinator
+from liteagent.providers import ToolCall
+
+from .conftest import RecordingRateLimiter, ScriptedProvider, tool_response
 
 
 class TestSessionType:
@@ -88,6 +91,15 @@ class TestUnifiedForkedMemory:
         assert len(forked_memory.messages) == 5  # Original 4 + 1 prefill
         assert forked_memory.messages[-1]["content"] == "You are now a security expert."
     
+    def test_forked_memory_keeps_token_budget(self, parent_memory):
+        """Test that a fork windows the history like its parent."""
+        parent_memory.token_budget = 20
+        forked_memory = UnifiedForkedMemory(parent_memory)
+        
+        assert forked_memory.token_budget == 20
+        assert len(forked_memory.get_messages()) < len(forked_memory.messages)
+        assert forked_memory.get_messages() == parent_memory.get_messages()
+    
     def test_fork_point_messages(self, parent_memory):
         """Test getting messages at different points."""
         forked_memory = UnifiedForkedMemory(parent_memory, session_type=SessionType.CACHED)
@@ -115,6 +127,74 @@ class TestUnifiedForkedMemory:
         forked_memory2 = UnifiedForkedMemory(parent_memory, session_type=SessionType.CACHED)
         cache_key2 = forked_memory2.get_cache_key()
         assert cache_key == cache_key2
+    
+    def test_forks_share_parent_messages(self, parent_memory):
+        """Test that forks reuse the parent's message dicts instead of copying them."""
+        forks = [UnifiedForkedMemory(parent_memory) for _ in range(3)]
+        
+        for fork in forks:
+            assert fork.messages[1] is parent_memory.messages[1]
+            assert fork.token_count == parent_memory.token_count
+        
+        forks[0].add_user_message("Only in the first fork")
+        assert len(forks[0].messages) == 5
+        assert len(forks[1].messages) == 4
+    
+    def test_parent_changes_do_not_leak_into_forks(self, parent_memory):
+        """Test copy-on-write when the parent rewrites its history after forking."""
+        original = list(parent_memory.messages)
+        forked_memory = UnifiedForkedMemory(parent_memory)
+        
+        parent_memory.add_assistant_message("Parent keeps talking")
+        parent_memory.pin_message(1)
+        parent_memory.update_system_prompt("New prompt")
+        
+        assert forked_memory.messages == original
+        assert forked_memory.get_fork_point_messages() == original
+        assert "pinned" not in forked_memory.messages[1]
+    
+    def test_fork_changes_do_not_leak_into_parent(self, parent_memory):
+        """Test copy-on-write when the fork changes the shared prefix."""
+        original = list(parent_memory.messages)
+        forked_memory = UnifiedForkedMemory(parent_memory)
+        forked_memory.add_user_message("After the fork")
+        
+        forked_memory.pin_message(1)
+        forked_memory.update_system_prompt("Fork prompt")
+        
+        assert parent_memory.messages == original
+        assert forked_memory.messages[0]["content"] == "Fork prompt"
+        assert forked_memory.messages[1]["pinned"] is True
+        assert forked_memory.get_fork_point_messages() == original
+        assert forked_memory.get_post_fork_messages() == [{"role": "user", "content": "After the fork"}]
+        assert forked_memory.token_count == forked_memory.count_tokens(list(forked_memory.messages))
+    
+    def test_nested_forks(self, parent_memory):
+        """Test forking a fork shares both levels of history."""
+        child = UnifiedForkedMemory(parent_memory)
+        child.add_assistant_message("Child answer")
+        grandchild = UnifiedForkedMemory(child)
+        grandchild.add_user_message("Grandchild question")
+        child.add_user_message("Child continues")
+        
+        assert grandchild.get_fork_point_messages() == list(parent_memory.messages) + [
+            {"role": "assistant", "content": "Child answer"}]
+        assert grandchild.messages[-1]["content"] == "Grandchild question"
+        assert grandchild.get_messages()[1] == parent_memory.get_messages()[1]
+    
+    def test_fork_time_independent_of_history_length(self):
+        """Test that forking does not copy the parent history."""
+        from liteagent.memory import ConversationMemory
+        memory = ConversationMemory("System prompt")
+        for i in range(20000):
+            memory.add_user_message(f"message {i}")
+        
+        start = time.perf_counter()
+        forks = [UnifiedForkedMemory(memory) for _ in range(20)]
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 0.5
+        assert all(len(fork.messages) == 20001 for fork in forks)
 
 
 class TestUnifiedForkedAgent:
@@ -390,44 +470,27 @@ class TestForkEvent:
 class TestRateLimitingIntegration:
     """Test rate limiting integration."""
     
-    @pytest.fixture
-    def agent_with_rate_limiting(self):
-        """Create agent with rate limiting enabled."""
-        with patch('liteagent.unified_forked_agent.get_rate_limiter') as mock_get_limiter:
-            mock_limiter = MagicMock()
-            mock_limiter.wait_if_needed.return_value = 0.5  # 500ms wait
-            mock_limiter.consume_tokens.return_value = None
-            mock_get_limiter.return_value = mock_limiter
-            
-            with patch('liteagent.unified_forked_agent.create_model_interface'):
-                agent = UnifiedForkedAgent(
-                    model="gpt-4",
-                    name="RateLimitedAgent",
-                    system_prompt="Test agent",
-                    enable_rate_limiting=True
-                )
-                agent.rate_limiter = mock_limiter
-                return agent, mock_limiter
-    
-    def test_rate_limiting_during_response_generation(self, agent_with_rate_limiting):
-        """Test rate limiting during response generation."""
-        agent, mock_limiter = agent_with_rate_limiting
-        
-        # Mock the parent method
-        agent._generate_response_with_tools = MagicMock(return_value="Test response")
-        
-        messages = [{"role": "user", "content": "Hello"}]
-        
-        with patch('time.sleep') as mock_sleep:
-            response = agent._generate_response_with_rate_limiting(messages)
-        
-        # Should have waited for rate limits
-        mock_limiter.wait_if_needed.assert_called_once()
-        
-        # Should have consumed tokens
-        mock_limiter.consume_tokens.assert_called_once()
+    def test_each_model_call_waits_and_consumes_once(self):
+        """Test that every model call is throttled once, under the agent's tier."""
+        agent = UnifiedForkedAgent(
+            model="mock-model",
+            name="RateLimitedAgent",
+            provider="mock",
+            system_prompt="Test agent",
+            tier="tier-2",
+            enable_rate_limiting=True
+        )
+        agent.model_interface.provider = ScriptedProvider([
+            tool_response(ToolCall(id="call_1", name="unknown_tool", arguments={})),
+            "Test response"
+        ])
+        agent.rate_limiter = RecordingRateLimiter()
+        
+        response = agent._generate_response_with_rate_limiting(agent.memory.get_messages())
         
         assert response == "Test response"
+        assert [wait[:3] for wait in agent.rate_limiter.waits] == [("scripted", "scripted-model", "tier-2")] * 2
+        assert [used[:3] for used in agent.rate_limiter.consumed] == [("scripted", "scripted-model", "tier-2")] * 2
 
 
 class TestBackwardCompatibility: